@@ -0,0 +1,53 @@
+"""
+Dashboard counters for Learnova LMS
+Totals shown on the admin overview live in one OverviewCounters row that is
+adjusted with atomic F() updates as courses, users, enrollments and
+categories are created or deleted. rebuild_counters() recounts exactly.
+"""
+from django.db.models import F
+from .models import OverviewCounters
+
+COUNTERS_PK = 1
+
+# User.role -> counter column
+ROLE_COUNTERS = {
+    'STUDENT': 'total_students',
+    'INSTRUCTOR': 'total_instructors',
+}
+
+
+def count_totals():
+    """Exact totals, straight from the source tables."""
+    from apps.courses.models import Category, Course
+    from apps.enrollments.models import Enrollment
+    from apps.users.models import User
+
+    return {
+        'total_courses': Course.objects.count(),
+        'total_students': User.objects.filter(role=User.Role.STUDENT).count(),
+        'total_instructors': User.objects.filter(role=User.Role.INSTRUCTOR).count(),
+        'total_enrollments': Enrollment.objects.count(),
+        'total_categories': Category.objects.count(),
+    }
+
+
+def rebuild_counters():
+    counters, _ = OverviewCounters.objects.update_or_create(pk=COUNTERS_PK, defaults=count_totals())
+    return counters
+
+
+def adjust_counters(**deltas):
+    """Apply deltas, e.g. adjust_counters(total_courses=1). Rebuilds if the row is missing."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    updated = OverviewCounters.objects.filter(pk=COUNTERS_PK).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+    if not updated:
+        rebuild_counters()
+
+
+def get_counters():
+    counters = OverviewCounters.objects.filter(pk=COUNTERS_PK).first()
+    return counters or rebuild_counters()
@@ -0,0 +1,31 @@
+"""
+Management command to compute pending reports outside the request cycle.
+Usage: python manage.py generate_reports [--report ID ...] [--force]
+"""
+from django.core.management.base import BaseCommand
+from apps.analytics.models import Report
+from apps.analytics.reports import generate_report
+
+
+class Command(BaseCommand):
+    help = "Generate snapshots for PENDING reports (or the given report ids)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--report', type=int, action='append', dest='reports', help="Report id (repeatable)")
+        parser.add_argument('--force', action='store_true', help="Recompute even if a fresh snapshot exists")
+
+    def handle(self, *args, **options):
+        reports = Report.objects.order_by('pk')
+        if options['reports']:
+            reports = reports.filter(pk__in=options['reports'])
+        else:
+            reports = reports.filter(status=Report.Status.PENDING)
+
+        for report in reports:
+            try:
+                snapshot = generate_report(report, force=options['force'])
+            except Exception as exc:
+                self.stderr.write(self.style.ERROR(f"  Report {report.pk} failed: {exc}"))
+                continue
+            self.stdout.write(f"  Report {report.pk} ({report.report_type}): snapshot {snapshot.pk}, {snapshot.row_count} rows")
+        self.stdout.write(self.style.SUCCESS("Report generation finished."))
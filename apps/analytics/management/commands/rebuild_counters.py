@@ -0,0 +1,19 @@
+"""
+Management command to reconcile the dashboard overview counters with the source tables.
+Usage: python manage.py rebuild_counters
+"""
+from django.core.management.base import BaseCommand
+from apps.analytics.counters import get_counters, rebuild_counters
+
+
+class Command(BaseCommand):
+    help = "Recount dashboard overview totals exactly and report any drift"
+
+    def handle(self, *args, **options):
+        before = get_counters()
+        after = rebuild_counters()
+        for field in ('total_courses', 'total_students', 'total_instructors', 'total_enrollments', 'total_categories'):
+            old, new = getattr(before, field), getattr(after, field)
+            drift = f" (was {old})" if old != new else ""
+            self.stdout.write(f"  {field}: {new}{drift}")
+        self.stdout.write(self.style.SUCCESS("Overview counters rebuilt."))
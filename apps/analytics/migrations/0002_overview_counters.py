@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:48
+
+from django.db import migrations, models
+
+
+def populate_counters(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    Category = apps.get_model('courses', 'Category')
+    Enrollment = apps.get_model('enrollments', 'Enrollment')
+    User = apps.get_model('users', 'User')
+    OverviewCounters = apps.get_model('analytics', 'OverviewCounters')
+    OverviewCounters.objects.update_or_create(pk=1, defaults={
+        'total_courses': Course.objects.count(),
+        'total_students': User.objects.filter(role='STUDENT').count(),
+        'total_instructors': User.objects.filter(role='INSTRUCTOR').count(),
+        'total_enrollments': Enrollment.objects.count(),
+        'total_categories': Category.objects.count(),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('courses', '0004_add_default_categories'),
+        ('enrollments', '0003_add_certificate'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OverviewCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_courses', models.BigIntegerField(default=0)),
+                ('total_students', models.BigIntegerField(default=0)),
+                ('total_instructors', models.BigIntegerField(default=0)),
+                ('total_enrollments', models.BigIntegerField(default=0)),
+                ('total_categories', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Overview counters',
+                'db_table': 'analytics_overview_counters',
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_overview_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('READY', 'Ready'), ('FAILED', 'Failed')], default='PENDING', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ReportSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report_type', models.CharField(choices=[('ENROLLMENT', 'Enrollment Report'), ('COMPLETION', 'Completion Rate'), ('REVENUE', 'Revenue Report'), ('PERFORMANCE', 'Student Performance')], max_length=20)),
+                ('params_hash', models.CharField(max_length=64)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('result', models.JSONField(default=dict)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'report_snapshots',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['report_type', 'params_hash', '-created_at'], name='report_snap_lookup_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='snapshot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reports', to='analytics.reportsnapshot'),
+        ),
+    ]
@@ -6,7 +6,7 @@ from django.db import models
 
 
 class Report(models.Model):
-    """Stored report configuration/snapshot."""
+    """Stored report configuration, linked to its latest computed snapshot."""
 
     class ReportType(models.TextChoices):
         ENROLLMENT = 'ENROLLMENT', 'Enrollment Report'
@@ -14,10 +14,60 @@ class Report(models.Model):
         REVENUE = 'REVENUE', 'Revenue Report'
         PERFORMANCE = 'PERFORMANCE', 'Student Performance'
 
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        RUNNING = 'RUNNING', 'Running'
+        READY = 'READY', 'Ready'
+        FAILED = 'FAILED', 'Failed'
+
     report_type = models.CharField(max_length=20, choices=ReportType.choices)
     title = models.CharField(max_length=255)
     params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    snapshot = models.ForeignKey('ReportSnapshot', on_delete=models.SET_NULL, null=True, blank=True, related_name='reports')
+    error = models.TextField(blank=True)
     generated_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = 'reports'
+
+
+class ReportSnapshot(models.Model):
+    """Immutable result of one report computation, shared by reports with identical params."""
+
+    report_type = models.CharField(max_length=20, choices=Report.ReportType.choices)
+    params_hash = models.CharField(max_length=64)
+    params = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(default=dict)
+    row_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'report_snapshots'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['report_type', 'params_hash', '-created_at'], name='report_snap_lookup_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Report snapshots are immutable.")
+        super().save(*args, **kwargs)
+
+
+class OverviewCounters(models.Model):
+    """
+    Single-row table of dashboard totals, kept current incrementally by
+    signals (see apps.analytics.counters) so the overview is one row read.
+    """
+
+    total_courses = models.BigIntegerField(default=0)
+    total_students = models.BigIntegerField(default=0)
+    total_instructors = models.BigIntegerField(default=0)
+    total_enrollments = models.BigIntegerField(default=0)
+    total_categories = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'analytics_overview_counters'
+        verbose_name_plural = 'Overview counters'
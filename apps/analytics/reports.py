@@ -0,0 +1,290 @@
+"""
+Report generation engine for Learnova LMS
+Each Report.ReportType has a generator that aggregates in SQL (GROUP BY
+course), walking the selected courses in fixed-size chunks so memory stays
+bounded however many courses exist. A finished result is stored as an
+immutable ReportSnapshot; reports with the same type and params reuse a
+snapshot while it is younger than REPORT_SNAPSHOT_MAX_AGE.
+
+Supported params (all optional):
+    course_ids      list of course ids
+    instructor_id   only courses taught by this instructor
+    category_id     only courses in this category
+    start, end      ISO dates bounding enrolled_at / started_at / submitted_at
+    unit_price      REVENUE only: price per enrollment (the course model has no price)
+"""
+import hashlib
+import json
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db.models import Avg, Count, Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from .models import Report, ReportSnapshot
+
+COURSE_CHUNK_SIZE = 500
+
+
+class ReportParamsError(ValueError):
+    """Raised for params a generator cannot interpret."""
+
+
+def params_hash(report_type, params):
+    raw = json.dumps({'type': report_type, 'params': params or {}}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _number(value):
+    return None if value is None else float(value)
+
+
+def _date_range(params, field):
+    """Q() bounding `field` by params start/end (inclusive dates)."""
+    q = Q()
+    for key, lookup in (('start', 'gte'), ('end', 'lt')):
+        raw = params.get(key)
+        if not raw:
+            continue
+        day = parse_date(str(raw))
+        if day is None:
+            raise ReportParamsError(f"{key} must be an ISO date (YYYY-MM-DD)")
+        if key == 'end':
+            day += timedelta(days=1)
+        q &= Q(**{f'{field}__date__{lookup}': day})
+    return q
+
+
+def _id(value, message):
+    """`value` as a primary key; ids may arrive as JSON numbers or numeric strings."""
+    if isinstance(value, bool):
+        raise ReportParamsError(message)
+    try:
+        return int(str(value))
+    except ValueError:
+        raise ReportParamsError(message) from None
+
+
+def course_chunks(params, chunk_size=COURSE_CHUNK_SIZE):
+    """Yield lists of (course id, title) for the courses selected by params."""
+    from apps.courses.models import Course
+
+    courses = Course.objects.order_by('pk')
+    if params.get('course_ids'):
+        message = "course_ids must be a list of integer ids"
+        if not isinstance(params['course_ids'], list):
+            raise ReportParamsError(message)
+        courses = courses.filter(pk__in=[_id(value, message) for value in params['course_ids']])
+    for key in ('instructor_id', 'category_id'):
+        if params.get(key):
+            courses = courses.filter(**{key: _id(params[key], f"{key} must be an integer id")})
+    chunk = []
+    for row in courses.values_list('pk', 'title').iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def enrollment_report(params):
+    from apps.enrollments.models import Enrollment
+
+    Status = Enrollment.Status
+    period = _date_range(params, 'enrolled_at')
+    rows = []
+    for chunk in course_chunks(params):
+        titles = dict(chunk)
+        stats = (
+            Enrollment.objects.filter(period, course_id__in=titles)
+            .values('course_id')
+            .annotate(
+                total=Count('id'),
+                active=Count('id', filter=Q(status=Status.ACTIVE)),
+                completed=Count('id', filter=Q(status=Status.COMPLETED)),
+                dropped=Count('id', filter=Q(status=Status.DROPPED)),
+            )
+            .order_by('course_id')
+        )
+        rows.extend({'course_id': s['course_id'], 'course_title': titles[s['course_id']], **{
+            k: s[k] for k in ('total', 'active', 'completed', 'dropped')
+        }} for s in stats)
+    return {
+        'columns': ['course_id', 'course_title', 'total', 'active', 'completed', 'dropped'],
+        'rows': rows,
+        'summary': {'total_enrollments': sum(r['total'] for r in rows)},
+    }
+
+
+def completion_report(params):
+    from apps.enrollments.models import Enrollment
+
+    period = _date_range(params, 'enrolled_at')
+    rows = []
+    for chunk in course_chunks(params):
+        titles = dict(chunk)
+        stats = (
+            Enrollment.objects.filter(period, course_id__in=titles)
+            .values('course_id')
+            .annotate(
+                enrolled=Count('id'),
+                completed=Count('id', filter=Q(status=Enrollment.Status.COMPLETED)),
+                avg_progress=Avg('progress_percent'),
+            )
+            .order_by('course_id')
+        )
+        for s in stats:
+            rows.append({
+                'course_id': s['course_id'],
+                'course_title': titles[s['course_id']],
+                'enrolled': s['enrolled'],
+                'completed': s['completed'],
+                'completion_rate': round(s['completed'] * 100 / s['enrolled'], 2) if s['enrolled'] else 0,
+                'avg_progress': round(_number(s['avg_progress']) or 0, 2),
+            })
+    enrolled = sum(r['enrolled'] for r in rows)
+    completed = sum(r['completed'] for r in rows)
+    return {
+        'columns': ['course_id', 'course_title', 'enrolled', 'completed', 'completion_rate', 'avg_progress'],
+        'rows': rows,
+        'summary': {
+            'enrolled': enrolled,
+            'completed': completed,
+            'completion_rate': round(completed * 100 / enrolled, 2) if enrolled else 0,
+        },
+    }
+
+
+def revenue_report(params):
+    """Enrollments per course per month multiplied by params['unit_price']."""
+    from apps.enrollments.models import Enrollment
+
+    try:
+        unit_price = Decimal(str(params.get('unit_price', 0)))
+    except InvalidOperation:
+        raise ReportParamsError("unit_price must be a number")
+    period = _date_range(params, 'enrolled_at')
+    rows = []
+    for chunk in course_chunks(params):
+        titles = dict(chunk)
+        stats = (
+            Enrollment.objects.filter(period, course_id__in=titles)
+            .annotate(month=TruncMonth('enrolled_at'))
+            .values('course_id', 'month')
+            .annotate(enrollments=Count('id'))
+            .order_by('course_id', 'month')
+        )
+        for s in stats:
+            rows.append({
+                'course_id': s['course_id'],
+                'course_title': titles[s['course_id']],
+                'month': s['month'].date().isoformat() if s['month'] else None,
+                'enrollments': s['enrollments'],
+                'revenue': float(unit_price * s['enrollments']),
+            })
+    return {
+        'columns': ['course_id', 'course_title', 'month', 'enrollments', 'revenue'],
+        'rows': rows,
+        'summary': {'unit_price': float(unit_price), 'revenue': round(sum(r['revenue'] for r in rows), 2)},
+    }
+
+
+def performance_report(params):
+    from apps.assessments.models import AssignmentSubmission, QuizAttempt
+
+    rows = []
+    for chunk in course_chunks(params):
+        titles = dict(chunk)
+        quizzes = {
+            s['quiz__course_id']: s
+            for s in QuizAttempt.objects.filter(
+                _date_range(params, 'started_at'), quiz__course_id__in=titles, submitted_at__isnull=False,
+            )
+            .values('quiz__course_id')
+            .annotate(attempts=Count('id'), avg_score=Avg('score'), passed=Count('id', filter=Q(passed=True)))
+            .order_by()
+        }
+        assignments = {
+            s['assignment__course_id']: s
+            for s in AssignmentSubmission.objects.filter(
+                _date_range(params, 'submitted_at'), assignment__course_id__in=titles,
+            )
+            .values('assignment__course_id')
+            .annotate(submissions=Count('id'), avg_grade=Avg('grade'))
+            .order_by()
+        }
+        for course_id, title in chunk:
+            q, a = quizzes.get(course_id), assignments.get(course_id)
+            if not q and not a:
+                continue
+            attempts = q['attempts'] if q else 0
+            rows.append({
+                'course_id': course_id,
+                'course_title': title,
+                'quiz_attempts': attempts,
+                'avg_quiz_score': round(_number(q['avg_score']) or 0, 2) if q else None,
+                'quiz_pass_rate': round(q['passed'] * 100 / attempts, 2) if attempts else None,
+                'submissions': a['submissions'] if a else 0,
+                'avg_assignment_grade': round(_number(a['avg_grade']), 2) if a and a['avg_grade'] is not None else None,
+            })
+    return {
+        'columns': [
+            'course_id', 'course_title', 'quiz_attempts', 'avg_quiz_score', 'quiz_pass_rate',
+            'submissions', 'avg_assignment_grade',
+        ],
+        'rows': rows,
+        'summary': {
+            'quiz_attempts': sum(r['quiz_attempts'] for r in rows),
+            'submissions': sum(r['submissions'] for r in rows),
+        },
+    }
+
+
+GENERATORS = {
+    Report.ReportType.ENROLLMENT: enrollment_report,
+    Report.ReportType.COMPLETION: completion_report,
+    Report.ReportType.REVENUE: revenue_report,
+    Report.ReportType.PERFORMANCE: performance_report,
+}
+
+
+def find_fresh_snapshot(report_type, params):
+    max_age = timedelta(seconds=settings.REPORT_SNAPSHOT_MAX_AGE)
+    return (
+        ReportSnapshot.objects.filter(
+            report_type=report_type,
+            params_hash=params_hash(report_type, params),
+            created_at__gte=timezone.now() - max_age,
+        )
+        .order_by('-created_at')
+        .first()
+    )
+
+
+def generate_report(report, force=False):
+    """
+    Compute (or reuse) the snapshot for a report and link it.
+    Returns the snapshot; on failure the report is marked FAILED and the error re-raised.
+    """
+    snapshot = None if force else find_fresh_snapshot(report.report_type, report.params)
+    if snapshot is None:
+        Report.objects.filter(pk=report.pk).update(status=Report.Status.RUNNING, error='')
+        try:
+            result = GENERATORS[report.report_type](report.params or {})
+        except Exception as exc:
+            Report.objects.filter(pk=report.pk).update(status=Report.Status.FAILED, error=str(exc))
+            report.status, report.error = Report.Status.FAILED, str(exc)
+            raise
+        snapshot = ReportSnapshot.objects.create(
+            report_type=report.report_type,
+            params_hash=params_hash(report.report_type, report.params),
+            params=report.params or {},
+            result=result,
+            row_count=len(result['rows']),
+        )
+    Report.objects.filter(pk=report.pk).update(status=Report.Status.READY, snapshot=snapshot, error='')
+    report.status, report.snapshot, report.error = Report.Status.READY, snapshot, ''
+    return snapshot
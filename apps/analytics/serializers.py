@@ -3,10 +3,17 @@ Analytics serializers for Learnova LMS
 """
 from rest_framework import serializers
 from apps.core.serializers import BaseModelSerializer
-from .models import Report
+from .models import Report, ReportSnapshot
 
 
 class ReportSerializer(BaseModelSerializer):
     class Meta:
         model = Report
-        fields = ['id', 'report_type', 'title', 'params', 'generated_at']
+        fields = ['id', 'report_type', 'title', 'params', 'status', 'snapshot', 'error', 'generated_at']
+        read_only_fields = ['status', 'snapshot', 'error']
+
+
+class ReportSnapshotSerializer(BaseModelSerializer):
+    class Meta:
+        model = ReportSnapshot
+        fields = ['id', 'report_type', 'params', 'result', 'row_count', 'created_at']
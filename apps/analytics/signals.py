@@ -0,0 +1,57 @@
+"""
+Analytics signal handlers for Learnova LMS
+Keep the overview counters current as rows are created and deleted.
+"""
+from django.conf import settings
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from apps.courses.models import Category, Course
+from apps.enrollments.models import Enrollment
+from .counters import ROLE_COUNTERS, adjust_counters
+
+MODEL_COUNTERS = {
+    Course: 'total_courses',
+    Category: 'total_categories',
+    Enrollment: 'total_enrollments',
+}
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Enrollment)
+def count_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_counters(**{MODEL_COUNTERS[sender]: 1})
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Enrollment)
+def count_deleted(sender, instance, **kwargs):
+    adjust_counters(**{MODEL_COUNTERS[sender]: -1})
+
+
+@receiver(post_init, sender=settings.AUTH_USER_MODEL)
+def remember_user_role(sender, instance, **kwargs):
+    # Snapshot without touching a possibly deferred field.
+    instance._counted_role = instance.__dict__.get('role')
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def count_user_saved(sender, instance, created, **kwargs):
+    previous = None if created else instance._counted_role
+    # previous is None for an existing row only when role was deferred on load: the old role is unknown.
+    if (created or previous is not None) and previous != instance.role:
+        deltas = {}
+        if previous in ROLE_COUNTERS:
+            deltas[ROLE_COUNTERS[previous]] = -1
+        if instance.role in ROLE_COUNTERS:
+            deltas[ROLE_COUNTERS[instance.role]] = deltas.get(ROLE_COUNTERS[instance.role], 0) + 1
+        adjust_counters(**deltas)
+    instance._counted_role = instance.role
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def count_user_deleted(sender, instance, **kwargs):
+    if instance._counted_role in ROLE_COUNTERS:
+        adjust_counters(**{ROLE_COUNTERS[instance._counted_role]: -1})
@@ -0,0 +1,26 @@
+"""
+Background jobs of the analytics app (see apps.core.jobs)
+"""
+from apps.core.jobs import JobError, task
+from .models import Report
+
+
+@task('analytics.generate_report', queue='reports')
+def generate_report_job(report_id, force=False):
+    from .reports import ReportParamsError, generate_report
+
+    report = Report.objects.get(pk=report_id)
+    try:
+        snapshot = generate_report(report, force=force)
+    except ReportParamsError as exc:
+        # Bad params fail the same way on every attempt.
+        raise JobError(str(exc))
+    return {'report': report.pk, 'snapshot': snapshot.pk, 'rows': snapshot.row_count}
+
+
+@task('analytics.rebuild_counters')
+def rebuild_counters_job():
+    from .counters import rebuild_counters
+
+    counters = rebuild_counters()
+    return {'total_courses': counters.total_courses, 'total_enrollments': counters.total_enrollments}
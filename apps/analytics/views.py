@@ -1,9 +1,11 @@
-from rest_framework import viewsets
+from rest_framework import serializers, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from apps.core.export import get_export_format, invalid_format_response, streaming_export
 from .models import Report
-from .serializers import ReportSerializer
+from .serializers import ReportSerializer, ReportSnapshotSerializer
+from .counters import get_counters
 
 
 class ReportViewSet(viewsets.ModelViewSet):
@@ -11,6 +13,60 @@ class ReportViewSet(viewsets.ModelViewSet):
     serializer_class = ReportSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
 
+    @action(detail=True, methods=['post'])
+    def generate(self, request, pk=None):
+        """
+        Request a (re)computation. A fresh snapshot with identical params is linked
+        immediately; otherwise the report is marked PENDING and a background job is
+        queued (poll GET /api/v1/jobs/<job>/ or this report's status).
+        POST { "force": true } skips snapshot reuse.
+        """
+        from .reports import find_fresh_snapshot
+        from .tasks import generate_report_job
+        report = self.get_object()
+        try:
+            # bool() would read the form value "false" as true
+            force = serializers.BooleanField().to_internal_value(request.data.get('force', False))
+        except serializers.ValidationError:
+            return Response({'error': 'force must be a boolean'}, status=status.HTTP_400_BAD_REQUEST)
+        snapshot = None if force else find_fresh_snapshot(report.report_type, report.params)
+        if snapshot is not None:
+            Report.objects.filter(pk=report.pk).update(status=Report.Status.READY, snapshot=snapshot, error='')
+            report.refresh_from_db()
+            return Response(ReportSerializer(report).data)
+        Report.objects.filter(pk=report.pk).update(status=Report.Status.PENDING, error='')
+        job = generate_report_job.enqueue(user=request.user, report_id=report.pk, force=force)
+        report.refresh_from_db()
+        return Response({**ReportSerializer(report).data, 'job': job.pk}, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=['get'])
+    def result(self, request, pk=None):
+        """Latest computed snapshot of the report."""
+        report = self.get_object()
+        if report.snapshot_id is None:
+            return Response(
+                {'error': 'Report has not been generated yet', 'status': report.status},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(ReportSnapshotSerializer(report.snapshot).data)
+
+    @action(detail=True, methods=['get'])
+    def export(self, request, pk=None):
+        """Latest snapshot rows as CSV (default) or NDJSON. ?export_format=csv|ndjson"""
+        export_format = get_export_format(request)
+        if export_format is None:
+            return invalid_format_response()
+        report = self.get_object()
+        if report.snapshot_id is None:
+            return Response(
+                {'error': 'Report has not been generated yet', 'status': report.status},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        result = report.snapshot.result
+        columns = result['columns']
+        rows = ([row.get(column) for column in columns] for row in result['rows'])
+        return streaming_export(columns, rows, export_format, f"report-{report.pk}-{report.snapshot_id}")
+
 
 class DashboardViewSet(viewsets.ViewSet):
     """Analytics dashboard endpoints."""
@@ -18,23 +74,33 @@ class DashboardViewSet(viewsets.ViewSet):
 
     @action(detail=False, methods=['get'])
     def overview(self, request):
-        """Admin dashboard overview metrics."""
-        from apps.courses.models import Course
-        from apps.enrollments.models import Enrollment
-        from apps.users.models import User
-
-        from apps.courses.models import Category
+        """Admin dashboard overview metrics (single-row read of the maintained counters)."""
+        counters = get_counters()
         return Response({
-            'total_courses': Course.objects.count(),
-            'total_students': User.objects.filter(role='STUDENT').count(),
-            'total_instructors': User.objects.filter(role='INSTRUCTOR').count(),
-            'total_enrollments': Enrollment.objects.count(),
-            'total_categories': Category.objects.count(),
+            'total_courses': counters.total_courses,
+            'total_students': counters.total_students,
+            'total_instructors': counters.total_instructors,
+            'total_enrollments': counters.total_enrollments,
+            'total_categories': counters.total_categories,
         })
 
+    INSTRUCTOR_STUDENT_ORDERING = {
+        'progress_percent': ('progress_percent',),
+        'enrolled_at': ('enrolled_at',),
+        'status': ('status',),
+        'student_name': ('student__first_name', 'student__last_name'),
+        'course_title': ('course__title',),
+    }
+
     @action(detail=False, methods=['get'], url_path='instructor/students')
     def instructor_students(self, request):
-        """Instructor: Students in my courses. ?course_id=1 to filter by course."""
+        """
+        Instructor: Students in my courses (paginated).
+        Filters: ?course_id=1 &status=ACTIVE,COMPLETED &min_progress=0 &max_progress=100
+        Sorting: ?ordering=-progress_percent (progress_percent, enrolled_at, status, student_name, course_title)
+        """
+        from decimal import Decimal, InvalidOperation
+        from rest_framework.settings import api_settings
         from apps.enrollments.models import Enrollment
         from apps.users.serializers import UserSerializer
 
@@ -42,10 +108,37 @@ class DashboardViewSet(viewsets.ViewSet):
             return Response({'error': 'Instructors only'}, status=403)
         qs = Enrollment.objects.filter(
             course__instructor=request.user
-        ).select_related('student', 'course')
-        course_id = request.query_params.get('course_id')
+        ).select_related('student__profile', 'course')
+        params = request.query_params
+        course_id = params.get('course_id')
         if course_id:
-            qs = qs.filter(course_id=course_id)
+            try:
+                qs = qs.filter(course_id=int(course_id))
+            except ValueError:
+                return Response({'error': 'course_id must be an integer'}, status=400)
+        statuses = [s for s in params.get('status', '').upper().split(',') if s]
+        if statuses:
+            invalid = set(statuses) - set(Enrollment.Status.values)
+            if invalid:
+                return Response({'error': f"Invalid status: {', '.join(sorted(invalid))}"}, status=400)
+            qs = qs.filter(status__in=statuses)
+        for param, lookup in (('min_progress', 'progress_percent__gte'), ('max_progress', 'progress_percent__lte')):
+            value = params.get(param)
+            if value:
+                try:
+                    qs = qs.filter(**{lookup: Decimal(value)})
+                except InvalidOperation:
+                    return Response({'error': f'{param} must be a number'}, status=400)
+
+        ordering = params.get('ordering', '-enrolled_at')
+        fields = self.INSTRUCTOR_STUDENT_ORDERING.get(ordering.lstrip('-'))
+        if fields is None:
+            return Response({'error': f'Invalid ordering: {ordering}'}, status=400)
+        direction = '-' if ordering.startswith('-') else ''
+        qs = qs.order_by(*(f'{direction}{field}' for field in fields), f'{direction}id')
+
+        paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+        page = paginator.paginate_queryset(qs, request, view=self)
         data = [
             {
                 'student': UserSerializer(e.student).data,
@@ -55,6 +148,6 @@ class DashboardViewSet(viewsets.ViewSet):
                 'status': e.status,
                 'enrolled_at': e.enrolled_at,
             }
-            for e in qs
+            for e in page
         ]
-        return Response(data)
+        return paginator.get_paginated_response(data)
@@ -0,0 +1,79 @@
+"""
+Compact answer storage for quiz attempts
+An attempt's answers are stored as one small binary blob instead of a row per
+selected option: the ids of the selected options, sorted and written as
+unsigned LEB128 varints of the difference to the previous id. Options of one
+question have neighbouring ids, so a 100-question quiz with single-choice
+answers still packs into ~100 bytes.
+
+The blob names options by id, not by position, so it survives questions or
+options being added, removed or reordered after submission: decoding groups
+the ids by the quiz's current questions and drops options that no longer exist.
+
+Format 1 (per-question bitmasks of option positions) is converted to this
+format by migration 0008 and is no longer read.
+"""
+
+FORMAT_VERSION = 2
+
+
+def _write_varint(value, out):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varints(data, offset):
+    value = shift = 0
+    for byte in data[offset:]:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            yield value
+            value = shift = 0
+    if shift:
+        raise ValueError("Truncated answer blob.")
+
+
+def encode_answers(option_ids):
+    """Pack the selected option ids into the compact binary representation."""
+    out = bytearray([FORMAT_VERSION])
+    previous = 0
+    for option_id in sorted(set(option_ids)):
+        _write_varint(option_id - previous, out)
+        previous = option_id
+    return bytes(out)
+
+
+def decode_option_ids(blob):
+    """Unpack a blob into the set of selected option ids."""
+    data = bytes(blob or b'')
+    if not data:
+        return set()
+    if data[0] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported answer blob format {data[0]}.")
+    option_ids = set()
+    current = 0
+    for delta in _read_varints(data, 1):
+        current += delta
+        option_ids.add(current)
+    return option_ids
+
+
+def decode_answers(layout, blob):
+    """
+    Rebuild {question_id: set(selected option ids)} from a blob and the quiz's current
+    layout (iterable of (question_id, option_ids)); options no longer in the quiz are dropped.
+    """
+    chosen = decode_option_ids(blob)
+    selected = {}
+    for question_id, option_ids in layout:
+        picked = chosen.intersection(option_ids)
+        if picked:
+            selected[question_id] = picked
+    return selected
@@ -0,0 +1,176 @@
+"""
+Quiz grading engine for Learnova LMS
+A quiz's answer key (question order, points, option ids and correct option set
+per question) is built in two queries and cached per quiz until a Question or
+QuestionOption of that quiz changes. Grading a submission against the key is
+pure Python, so it costs the same number of queries for 5 or 500 questions.
+"""
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from apps.core.cache import bump_version, versioned_key
+from apps.core.exceptions import InvalidAnswerError, NotEnrolledError, QuizAttemptClosedError, QuizAttemptLimitError
+from .answers import encode_answers
+
+ANSWER_KEY_NAMESPACE = 'quiz-answer-key'
+# Bumped when any quiz's questions or options change (ETag of the quiz list)
+QUESTIONS_NAMESPACE = 'quiz-questions'
+ANSWER_KEY_CACHE_TIMEOUT = 60 * 60 * 24
+# Network slack allowed on top of a quiz's time limit before a submission is refused.
+SUBMISSION_GRACE = timedelta(seconds=30)
+
+
+class AnswerKey:
+    """
+    Immutable, cacheable answer key of one quiz.
+    `questions` is a tuple of (question_id, points, option_ids, correct_option_ids)
+    in quiz order; option_ids keep the option order within the question.
+    Questions without options (short answer) cannot be auto-graded and are
+    left out of the graded total.
+    """
+
+    def __init__(self, quiz_id, questions):
+        self.quiz_id = quiz_id
+        self.questions = tuple(questions)
+        self.option_question = {
+            option_id: question_id
+            for question_id, _, option_ids, _ in self.questions
+            for option_id in option_ids
+        }
+        self.total_points = sum(points for _, points, option_ids, _ in self.questions if option_ids)
+
+    @property
+    def layout(self):
+        """(question_id, option_ids) pairs in quiz order, as used by decode_answers."""
+        return [(question_id, option_ids) for question_id, _, option_ids, _ in self.questions]
+
+    def group_selection(self, option_ids):
+        """Map selected option ids to {question_id: set(option_ids)}."""
+        selected = {}
+        for option_id in option_ids:
+            question_id = self.option_question.get(option_id)
+            if question_id is None:
+                raise InvalidAnswerError(f"Option {option_id} does not belong to this quiz.", field='option_ids')
+            selected.setdefault(question_id, set()).add(option_id)
+        return selected
+
+    def earned_points(self, selected):
+        """Points for a grouped selection; a question scores only if its option set matches exactly."""
+        return sum(
+            points
+            for question_id, points, option_ids, correct in self.questions
+            if option_ids and selected.get(question_id, set()) == correct
+        )
+
+    def score(self, earned):
+        """Percentage score (2 decimal places) for a number of earned points."""
+        if not self.total_points:
+            return Decimal('0.00')
+        return (Decimal(earned) * 100 / Decimal(self.total_points)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+    def grade(self, option_ids):
+        """Grade a flat list of selected option ids. Returns (score_percent, selection by question)."""
+        selected = self.group_selection(option_ids)
+        return self.score(self.earned_points(selected)), selected
+
+
+def build_answer_key(quiz_id):
+    """Load the answer key of a quiz in two queries."""
+    from .models import Question, QuestionOption
+
+    questions = list(
+        Question.objects.filter(quiz_id=quiz_id).order_by('order', 'id').values_list('id', 'points')
+    )
+    options = {}
+    correct = {}
+    rows = (
+        QuestionOption.objects.filter(question__quiz_id=quiz_id)
+        .order_by('order', 'id')
+        .values_list('id', 'question_id', 'is_correct')
+    )
+    for option_id, question_id, is_correct in rows:
+        options.setdefault(question_id, []).append(option_id)
+        if is_correct:
+            correct.setdefault(question_id, set()).add(option_id)
+    return AnswerKey(quiz_id, [
+        (question_id, points, tuple(options.get(question_id, ())), frozenset(correct.get(question_id, ())))
+        for question_id, points in questions
+    ])
+
+
+def get_answer_key(quiz_id):
+    """Return the cached answer key of a quiz, building it on a miss."""
+    key = versioned_key(ANSWER_KEY_NAMESPACE, 'key', scope=quiz_id)
+    answer_key = cache.get(key)
+    if answer_key is None:
+        answer_key = build_answer_key(quiz_id)
+        cache.set(key, answer_key, ANSWER_KEY_CACHE_TIMEOUT)
+    return answer_key
+
+
+def invalidate_answer_key(quiz_id):
+    if quiz_id is not None:
+        bump_version(ANSWER_KEY_NAMESPACE, scope=quiz_id)
+    bump_version(QUESTIONS_NAMESPACE)
+
+
+def check_can_start_attempt(student, quiz):
+    """Enforce max_attempts with one COUNT served by the (student, quiz, started_at) index."""
+    from .models import QuizAttempt
+
+    used = QuizAttempt.objects.filter(student=student, quiz=quiz).count()
+    if used >= quiz.max_attempts:
+        raise QuizAttemptLimitError(f"Maximum of {quiz.max_attempts} attempts reached for this quiz.")
+
+
+def start_attempt(student, quiz):
+    """
+    Open a new attempt. The student's enrollment row is locked while the attempts are
+    counted and the new one inserted, so concurrent starts cannot exceed max_attempts.
+    """
+    from apps.enrollments.models import Enrollment
+    from .models import QuizAttempt
+
+    with transaction.atomic():
+        enrollment = (
+            Enrollment.objects.select_for_update()
+            .filter(student=student, course_id=quiz.course_id)
+            .exclude(status=Enrollment.Status.DROPPED)
+            .first()
+        )
+        if enrollment is None:
+            raise NotEnrolledError("You are not enrolled in this quiz's course.")
+        check_can_start_attempt(student, quiz)
+        return QuizAttempt.objects.create(student=student, quiz=quiz)
+
+
+def submit_attempt(attempt, option_ids):
+    """
+    Grade an open attempt and store score/passed/submitted_at (plus the packed
+    answers, for review and regrading) in one conditional
+    UPDATE, so a double submit can never grade the same attempt twice.
+    `attempt.quiz` should be loaded (select_related) by the caller.
+    """
+    from .models import QuizAttempt
+
+    quiz = attempt.quiz
+    now = timezone.now()
+    if attempt.submitted_at is not None:
+        raise QuizAttemptClosedError("This attempt has already been submitted.")
+    if quiz.time_limit_minutes and now > attempt.started_at + timedelta(minutes=quiz.time_limit_minutes) + SUBMISSION_GRACE:
+        raise QuizAttemptClosedError("The time limit for this attempt has passed.")
+
+    answer_key = get_answer_key(quiz.pk)
+    score, selected = answer_key.grade(option_ids)
+    passed = score >= quiz.passing_score
+    answers = encode_answers(option_id for chosen in selected.values() for option_id in chosen)
+    updated = QuizAttempt.objects.filter(pk=attempt.pk, submitted_at__isnull=True).update(
+        score=score, passed=passed, submitted_at=now, answers=answers,
+    )
+    if not updated:
+        raise QuizAttemptClosedError("This attempt has already been submitted.")
+    attempt.score, attempt.passed, attempt.submitted_at, attempt.answers = score, passed, now, answers
+    return attempt
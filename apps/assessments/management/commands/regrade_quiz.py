@@ -0,0 +1,33 @@
+"""
+Management command to regrade every submitted attempt of a quiz after its answer key changed.
+Usage: python manage.py regrade_quiz <quiz_id> [--chunk-size 2000] [--restart]
+"""
+from django.core.management.base import BaseCommand, CommandError
+from apps.assessments.models import Quiz, QuizRegrade
+from apps.assessments.regrade import DEFAULT_CHUNK_SIZE, regrade_quiz
+
+
+class Command(BaseCommand):
+    help = "Recompute score/passed for all attempts of a quiz (chunked, resumable)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('quiz_id', type=int)
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--restart', action='store_true', help="Supersede an unfinished run instead of resuming it")
+
+    def handle(self, *args, **options):
+        try:
+            quiz = Quiz.objects.get(pk=options['quiz_id'])
+        except Quiz.DoesNotExist:
+            raise CommandError(f"Quiz {options['quiz_id']} does not exist")
+
+        def report(run):
+            self.stdout.write(f"  {run.processed}/{run.total} attempts processed, {run.changed} changed (last id {run.last_attempt_id})")
+
+        self.stdout.write(f"Regrading quiz {quiz.pk}: {quiz.title}")
+        run = regrade_quiz(quiz, chunk_size=options['chunk_size'], restart=options['restart'], progress=report)
+        if run.status == QuizRegrade.Status.SUPERSEDED:
+            raise CommandError(f"Regrade run {run.pk} was superseded by a newer run after {run.processed} attempts.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Regrade complete: {run.processed} processed, {run.changed} changed, {run.skipped} skipped (no stored answers)."
+        ))
@@ -0,0 +1,102 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:05
+"""
+Rewrites QuizAttempt.answers from format 1 (per-question bitmasks of option
+positions) to format 2 (delta-encoded selected option ids). The codecs are
+copied here so the migration keeps working when apps.assessments.answers changes.
+"""
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def _write_varint(value, out):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varints(data):
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            yield value
+            value = shift = 0
+
+
+def _v1_to_v2(layout, data):
+    option_ids = set()
+    for (_, options), mask in zip(layout, _read_varints(data[1:])):
+        option_ids.update(option_id for position, option_id in enumerate(options) if mask >> position & 1)
+    out = bytearray([2])
+    previous = 0
+    for option_id in sorted(option_ids):
+        _write_varint(option_id - previous, out)
+        previous = option_id
+    return bytes(out)
+
+
+def _v2_to_v1(layout, data):
+    chosen = set()
+    current = 0
+    for delta in _read_varints(data[1:]):
+        current += delta
+        chosen.add(current)
+    out = bytearray([1])
+    for _, options in layout:
+        _write_varint(sum(1 << position for position, option_id in enumerate(options) if option_id in chosen), out)
+    return bytes(out)
+
+
+def _convert(apps, source_version, convert):
+    Question = apps.get_model('assessments', 'Question')
+    QuestionOption = apps.get_model('assessments', 'QuestionOption')
+    QuizAttempt = apps.get_model('assessments', 'QuizAttempt')
+    quiz_ids = QuizAttempt.objects.exclude(answers=b'').values_list('quiz_id', flat=True).distinct()
+    for quiz_id in list(quiz_ids):
+        options = {}
+        for question_id, option_id in (
+            QuestionOption.objects.filter(question__quiz_id=quiz_id)
+            .order_by('order', 'id').values_list('question_id', 'id')
+        ):
+            options.setdefault(question_id, []).append(option_id)
+        layout = [
+            (question_id, options.get(question_id, []))
+            for question_id in Question.objects.filter(quiz_id=quiz_id).order_by('order', 'id').values_list('id', flat=True)
+        ]
+        changed = []
+        for attempt in QuizAttempt.objects.filter(quiz_id=quiz_id).only('id', 'answers').iterator(chunk_size=BATCH_SIZE):
+            data = bytes(attempt.answers or b'')
+            if data and data[0] == source_version:
+                attempt.answers = convert(layout, data)
+                changed.append(attempt)
+            if len(changed) >= BATCH_SIZE:
+                QuizAttempt.objects.bulk_update(changed, ['answers'])
+                changed = []
+        if changed:
+            QuizAttempt.objects.bulk_update(changed, ['answers'])
+
+
+def forwards(apps, schema_editor):
+    _convert(apps, 1, _v1_to_v2)
+
+
+def backwards(apps, schema_editor):
+    _convert(apps, 2, _v2_to_v1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0007_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0008_answers_option_ids'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='quizregrade',
+            name='status',
+            field=models.CharField(choices=[('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('SUPERSEDED', 'Superseded')], default='RUNNING', max_length=20),
+        ),
+    ]
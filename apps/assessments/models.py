@@ -45,6 +45,9 @@ class Question(models.Model):
     class Meta:
         db_table = 'quiz_questions'
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['quiz', 'order'], name='question_quiz_order_idx'),
+        ]
 
 
 class QuestionOption(models.Model):
@@ -67,12 +70,45 @@ class QuizAttempt(models.Model):
     quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='attempts')
     score = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
     passed = models.BooleanField(null=True, blank=True)
+    # Packed selected option ids, see apps.assessments.answers
+    answers = models.BinaryField(null=True, blank=True, editable=False)
     started_at = models.DateTimeField(auto_now_add=True)
     submitted_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = 'quiz_attempts'
         ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['student', 'quiz', 'started_at'], name='quiz_att_student_quiz_idx'),
+            models.Index(fields=['student', '-started_at'], name='quiz_att_student_recent_idx'),
+        ]
+
+
+class QuizRegrade(models.Model):
+    """Progress of a regrade run over all attempts of a quiz (resumable)."""
+
+    class Status(models.TextChoices):
+        RUNNING = 'RUNNING', 'Running'
+        COMPLETED = 'COMPLETED', 'Completed'
+        # Replaced by a newer run (restart or changed key); its job stops at the next chunk
+        SUPERSEDED = 'SUPERSEDED', 'Superseded'
+
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='regrades')
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.RUNNING)
+    key_fingerprint = models.CharField(max_length=64)
+    last_attempt_id = models.BigIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    changed = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'quiz_regrades'
+        ordering = ['-created_at']
 
 
 class Assignment(models.Model):
@@ -89,6 +125,11 @@ class Assignment(models.Model):
 
     class Meta:
         db_table = 'assignments'
+        ordering = ['due_date']
+        indexes = [
+            models.Index(fields=['due_date'], name='assignment_due_idx'),
+            models.Index(fields=['course', 'due_date'], name='assignment_course_due_idx'),
+        ]
 
     def __str__(self):
         return f"{self.course.title} - {self.title}"
@@ -108,4 +149,8 @@ class AssignmentSubmission(models.Model):
 
     class Meta:
         db_table = 'assignment_submissions'
+        indexes = [
+            models.Index(fields=['student', '-submitted_at'], name='submission_student_recent_idx'),
+            models.Index(fields=['-submitted_at', '-id'], name='submission_recent_idx'),
+        ]
         unique_together = ['assignment', 'student']
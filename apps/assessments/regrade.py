@@ -0,0 +1,167 @@
+"""
+Quiz regrade pipeline for Learnova LMS
+Recomputes score/passed of every submitted attempt of a quiz after its answer
+key changed. Attempts are streamed in primary-key chunks, each chunk is scored
+in one pass against the current answer key and written back with bulk_update
+in its own short transaction. Stored answers name options by id, so questions
+or options added, removed or reordered since submission are scored correctly:
+a removed option no longer counts as selected, a new question as unanswered.
+A QuizRegrade row records the last attempt id written, so an interrupted run
+resumes where it stopped. A run is never deleted while its job may still be
+working on it: a restart or a changed key marks it SUPERSEDED, and its job
+stops before writing the next chunk.
+
+Saving or deleting a question or option in a way that can change scores
+(see apps.assessments.signals) queues a regrade job for the quiz once the
+transaction commits: one per quiz, and none while one is already queued.
+"""
+import hashlib
+import threading
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .answers import decode_option_ids
+from .grading import build_answer_key
+from .models import QuizAttempt, QuizRegrade
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Quiz ids whose answer key changed in the current transaction, per thread (see schedule_regrade)
+_pending = threading.local()
+
+
+def key_fingerprint(answer_key, passing_score):
+    raw = repr((answer_key.questions, str(passing_score))).encode('utf-8')
+    return hashlib.sha256(raw).hexdigest()
+
+
+class ScoringPlan:
+    """Answer key plus an option -> question index, so a chunk is scored without queries."""
+
+    def __init__(self, answer_key, passing_score):
+        self.answer_key = answer_key
+        self.passing_score = passing_score
+        self.option_question = answer_key.option_question
+
+    def score_chunk(self, rows):
+        """rows: iterable of (pk, answers blob). Yields (pk, score, passed)."""
+        option_question = self.option_question
+        for pk, blob in rows:
+            selected = {}
+            for option_id in decode_option_ids(blob):
+                question_id = option_question.get(option_id)
+                if question_id is not None:
+                    selected.setdefault(question_id, set()).add(option_id)
+            score = self.answer_key.score(self.answer_key.earned_points(selected))
+            yield pk, score, score >= self.passing_score
+
+
+def schedule_regrade(quiz_id):
+    """Queue a regrade of the quiz once the transaction commits."""
+    if quiz_id is None:
+        return
+    if not hasattr(_pending, 'quiz_ids'):
+        _pending.quiz_ids = set()
+    _pending.quiz_ids.add(quiz_id)
+    # One callback per call; the first to run handles every pending quiz, the rest find none.
+    transaction.on_commit(_enqueue_pending_regrades)
+
+
+def _enqueue_pending_regrades():
+    from apps.core.models import Job
+    from .tasks import regrade_quiz_job
+
+    quiz_ids = getattr(_pending, 'quiz_ids', None)
+    if not quiz_ids:
+        return
+    _pending.quiz_ids = set()
+    graded = (
+        QuizAttempt.objects.filter(quiz_id__in=quiz_ids, submitted_at__isnull=False)
+        .order_by().values_list('quiz_id', flat=True).distinct()
+    )
+    for quiz_id in graded:
+        # A queued job builds the answer key when it starts, so it covers this change too.
+        queued = Job.objects.filter(task=regrade_quiz_job.name, status=Job.Status.QUEUED, kwargs__quiz_id=quiz_id)
+        if not queued.exists():
+            regrade_quiz_job.enqueue(quiz_id=quiz_id)
+
+
+def supersede_running(quiz):
+    """Mark the quiz's open run as replaced; its job notices and stops at the next chunk."""
+    return QuizRegrade.objects.filter(quiz=quiz, status=QuizRegrade.Status.RUNNING).update(
+        status=QuizRegrade.Status.SUPERSEDED, finished_at=timezone.now(),
+    )
+
+
+def start_or_resume(quiz, restart=False):
+    """Return the run to continue: the open run for the current key, or a new one."""
+    answer_key = build_answer_key(quiz.pk)
+    fingerprint = key_fingerprint(answer_key, quiz.passing_score)
+    run = QuizRegrade.objects.filter(quiz=quiz, status=QuizRegrade.Status.RUNNING).first()
+    if run and (restart or run.key_fingerprint != fingerprint):
+        # The key changed again since this run started: earlier chunks are stale too.
+        supersede_running(quiz)
+        run = None
+    if run is None:
+        total = QuizAttempt.objects.filter(quiz=quiz, submitted_at__isnull=False).count()
+        run = QuizRegrade.objects.create(quiz=quiz, key_fingerprint=fingerprint, total=total)
+    return run, answer_key
+
+
+def regrade_quiz(quiz, chunk_size=DEFAULT_CHUNK_SIZE, restart=False, progress=None):
+    """
+    Regrade all submitted attempts of `quiz`. `progress(run)` is called after
+    every committed chunk. Returns the finished QuizRegrade, or the run marked
+    SUPERSEDED if another run replaced it meanwhile.
+    """
+    run, answer_key = start_or_resume(quiz, restart=restart)
+    plan = ScoringPlan(answer_key, quiz.passing_score)
+    attempts = QuizAttempt.objects.filter(quiz=quiz, submitted_at__isnull=False).order_by('pk')
+
+    while True:
+        rows = list(
+            attempts.filter(pk__gt=run.last_attempt_id)
+            .values_list('pk', 'answers', 'score', 'passed')[:chunk_size]
+            .iterator(chunk_size=chunk_size)
+        )
+        if not rows:
+            break
+        current = {pk: (score, passed) for pk, _, score, passed in rows}
+        scorable = [(pk, blob) for pk, blob, _, _ in rows if blob]
+        updates = [
+            QuizAttempt(pk=pk, score=score, passed=passed)
+            for pk, score, passed in plan.score_chunk(scorable)
+            if current[pk] != (score, passed)
+        ]
+        skipped = len(rows) - len(scorable)
+        with transaction.atomic():
+            # Advancing the run first locks its row, so a concurrent supersede waits for this chunk.
+            if not _open_run(run).update(
+                last_attempt_id=rows[-1][0], processed=F('processed') + len(rows),
+                changed=F('changed') + len(updates), skipped=F('skipped') + skipped, updated_at=timezone.now(),
+            ):
+                return _superseded(run)
+            if updates:
+                QuizAttempt.objects.bulk_update(updates, ['score', 'passed'])
+        run.last_attempt_id = rows[-1][0]
+        run.processed += len(rows)
+        run.changed += len(updates)
+        run.skipped += skipped
+        if progress:
+            progress(run)
+
+    run.finished_at = timezone.now()
+    if not _open_run(run).update(status=QuizRegrade.Status.COMPLETED, finished_at=run.finished_at, updated_at=run.finished_at):
+        return _superseded(run)
+    run.status = QuizRegrade.Status.COMPLETED
+    return run
+
+
+def _open_run(run):
+    return QuizRegrade.objects.filter(pk=run.pk, status=QuizRegrade.Status.RUNNING)
+
+
+def _superseded(run):
+    run.refresh_from_db()
+    return run
@@ -2,7 +2,8 @@
 Assessment serializers for Learnova LMS
 """
 from rest_framework import serializers
-from apps.core.serializers import BaseModelSerializer
+from apps.core.models import Upload
+from apps.core.serializers import BaseModelSerializer, UploadAttachMixin
 from .models import Quiz, Question, QuestionOption, QuizAttempt, Assignment, AssignmentSubmission
 
 
@@ -11,6 +12,15 @@ class QuestionOptionSerializer(BaseModelSerializer):
         model = QuestionOption
         fields = ['id', 'option_text', 'is_correct', 'order']
 
+    def get_fields(self):
+        fields = super().get_fields()
+        # The answer key is for course staff; students would simply submit it.
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if not (getattr(user, 'is_instructor', False) or getattr(user, 'is_admin', False)):
+            fields.pop('is_correct')
+        return fields
+
 
 class QuestionSerializer(BaseModelSerializer):
     options = QuestionOptionSerializer(many=True, read_only=True)
@@ -32,6 +42,19 @@ class QuizAttemptSerializer(BaseModelSerializer):
     class Meta:
         model = QuizAttempt
         fields = ['id', 'student', 'quiz', 'score', 'passed', 'started_at', 'submitted_at']
+        # Scores are computed server-side by the grading engine, never posted by clients.
+        read_only_fields = ['student', 'score', 'passed', 'started_at', 'submitted_at']
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.instance is not None:
+            # An attempt stays on the quiz it was started for; its count limits that quiz only.
+            fields['quiz'].read_only = True
+        return fields
+
+
+class QuizSubmissionSerializer(serializers.Serializer):
+    option_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=True)
 
 
 class AssignmentSerializer(BaseModelSerializer):
@@ -40,7 +63,12 @@ class AssignmentSerializer(BaseModelSerializer):
         fields = ['id', 'course', 'title', 'description', 'due_date', 'max_points', 'created_at', 'updated_at']
 
 
-class AssignmentSubmissionSerializer(BaseModelSerializer):
+class AssignmentSubmissionSerializer(UploadAttachMixin, BaseModelSerializer):
+    # A finalized chunked upload (POST /api/v1/uploads/) used as the submission file
+    upload_id = serializers.UUIDField(write_only=True, required=False)
+    upload_field = 'file'
+    upload_purpose = Upload.Purpose.SUBMISSION
+
     class Meta:
         model = AssignmentSubmission
-        fields = ['id', 'assignment', 'student', 'file', 'text_submission', 'grade', 'feedback', 'submitted_at', 'graded_at']
+        fields = ['id', 'assignment', 'student', 'file', 'upload_id', 'text_submission', 'grade', 'feedback', 'submitted_at', 'graded_at']
@@ -0,0 +1,77 @@
+"""
+Assessment signal handlers for Learnova LMS
+Invalidate cached quiz answer keys when questions or options change, and
+queue a regrade of the quiz's attempts when the change can alter scores:
+questions added, removed or re-weighted, options added, removed or with
+their correctness flipped.
+"""
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from .models import Question, QuestionOption
+from .grading import invalidate_answer_key
+from .regrade import schedule_regrade
+
+
+def _quiz_id_of_question(question_id):
+    return Question.objects.filter(pk=question_id).values_list('quiz_id', flat=True).first()
+
+
+@receiver(post_init, sender=Question)
+def remember_question_key_state(sender, instance, **kwargs):
+    instance._key_state = (instance.__dict__.get('quiz_id'), instance.__dict__.get('points'))
+
+
+@receiver(post_save, sender=Question)
+def invalidate_key_on_question_save(sender, instance, created, **kwargs):
+    invalidate_answer_key(instance.quiz_id)
+    old_quiz_id, old_points = (None, None) if created else instance._key_state
+    if created or (old_quiz_id, old_points) != (instance.quiz_id, instance.points):
+        schedule_regrade(instance.quiz_id)
+        if old_quiz_id not in (None, instance.quiz_id):
+            invalidate_answer_key(old_quiz_id)
+            schedule_regrade(old_quiz_id)
+    instance._key_state = (instance.quiz_id, instance.points)
+
+
+@receiver(post_delete, sender=Question)
+def invalidate_key_on_question_delete(sender, instance, **kwargs):
+    invalidate_answer_key(instance.quiz_id)
+    schedule_regrade(instance.quiz_id)
+
+
+@receiver(post_init, sender=QuestionOption)
+def remember_option_key_state(sender, instance, **kwargs):
+    instance._key_state = (instance.__dict__.get('question_id'), instance.__dict__.get('is_correct'))
+
+
+def _option_quiz_id(instance):
+    if QuestionOption.question.is_cached(instance):
+        return instance.question.quiz_id
+    return _quiz_id_of_question(instance.question_id)
+
+
+@receiver(post_save, sender=QuestionOption)
+def invalidate_key_on_option_save(sender, instance, created, **kwargs):
+    quiz_id = _option_quiz_id(instance)
+    invalidate_answer_key(quiz_id)
+    old_question_id, was_correct = (None, None) if created else instance._key_state
+    if created:
+        # A new wrong option cannot have been selected by any stored attempt.
+        changed = instance.is_correct
+    else:
+        changed = (old_question_id, was_correct) != (instance.question_id, instance.is_correct)
+    if changed:
+        schedule_regrade(quiz_id)
+        if old_question_id not in (None, instance.question_id):
+            old_quiz_id = _quiz_id_of_question(old_question_id)
+            if old_quiz_id != quiz_id:
+                invalidate_answer_key(old_quiz_id)
+                schedule_regrade(old_quiz_id)
+    instance._key_state = (instance.question_id, instance.is_correct)
+
+
+@receiver(post_delete, sender=QuestionOption)
+def invalidate_key_on_option_delete(sender, instance, **kwargs):
+    quiz_id = _option_quiz_id(instance)
+    invalidate_answer_key(quiz_id)
+    schedule_regrade(quiz_id)
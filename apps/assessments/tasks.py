@@ -0,0 +1,15 @@
+"""
+Background jobs of the assessments app (see apps.core.jobs)
+"""
+from apps.core.jobs import task
+from .models import Quiz
+
+
+@task('assessments.regrade_quiz', queue='regrade')
+def regrade_quiz_job(quiz_id):
+    # A retried job resumes the interrupted run from its last committed chunk; a job whose
+    # run was superseded (restart, changed key) stops early and succeeds.
+    from .regrade import regrade_quiz
+
+    run = regrade_quiz(Quiz.objects.get(pk=quiz_id))
+    return {'regrade': run.pk, 'status': run.status, 'processed': run.processed, 'changed': run.changed, 'skipped': run.skipped}
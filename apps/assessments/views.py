@@ -1,19 +1,173 @@
-from rest_framework import viewsets
+from django.db.models import Prefetch
+from rest_framework import serializers, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from .models import Quiz, Question, QuizAttempt, Assignment, AssignmentSubmission
-from .serializers import QuizSerializer, QuizAttemptSerializer, AssignmentSerializer, AssignmentSubmissionSerializer
+from apps.core.cache import get_version
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.exceptions import LearnovaValidationError, NotEnrolledError
+from apps.core.export import ExportMixin
+from apps.core.media import download_name, serve_file
+from apps.core.membership import get_membership
+from apps.core.pagination import KeysetPagination
+from apps.core.permissions import IsInstructorOrAdmin
+from apps.core.serializers import JobSerializer
+from .models import Quiz, Question, QuestionOption, QuizAttempt, Assignment, AssignmentSubmission
+from .serializers import (
+    QuizSerializer,
+    QuizAttemptSerializer,
+    QuizSubmissionSerializer,
+    AssignmentSerializer,
+    AssignmentSubmissionSerializer,
+)
+from .answers import decode_answers
+from .grading import ANSWER_KEY_NAMESPACE, QUESTIONS_NAMESPACE, start_attempt, submit_attempt
 
 
-class QuizViewSet(viewsets.ModelViewSet):
+class QuizViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Quiz.objects.all()
     serializer_class = QuizSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_etag_versions(self, obj=None):
+        # Questions and options have no updated_at; their signals bump these versions.
+        if obj is None:
+            return (get_version(QUESTIONS_NAMESPACE),)
+        return (get_version(ANSWER_KEY_NAMESPACE, scope=obj.pk),)
 
-class QuizAttemptViewSet(viewsets.ModelViewSet):
-    queryset = QuizAttempt.objects.all()
+    @action(detail=True, methods=['post'])
+    def regrade(self, request, pk=None):
+        """
+        Queue a regrade of all submitted attempts (course instructor or Admin).
+        POST { "restart": true } supersedes an unfinished run instead of resuming it.
+        """
+        from .regrade import supersede_running
+        from .tasks import regrade_quiz_job
+        quiz = self.get_object()
+        if not (request.user.is_admin or quiz.course.instructor_id == request.user.pk):
+            return Response({'error': 'Only the course instructor can regrade this quiz'}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            restart = serializers.BooleanField().to_internal_value(request.data.get('restart', False))
+        except serializers.ValidationError:
+            return Response({'error': 'restart must be a boolean'}, status=status.HTTP_400_BAD_REQUEST)
+        if restart:
+            supersede_running(quiz)
+        job = regrade_quiz_job.enqueue(user=request.user, quiz_id=quiz.pk)
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class QuizAttemptViewSet(ExportMixin, viewsets.ModelViewSet):
     serializer_class = QuizAttemptSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = '-started_at'
+    export_filename = 'quiz-attempts'
+    export_course_lookup = 'quiz__course_id'
+    export_fields = (
+        ('id', 'id'),
+        ('student_id', 'student_id'),
+        ('student_email', 'student__email'),
+        ('course_id', 'quiz__course_id'),
+        ('quiz_id', 'quiz_id'),
+        ('quiz_title', 'quiz__title'),
+        ('score', 'score'),
+        ('passed', 'passed'),
+        ('started_at', 'started_at'),
+        ('submitted_at', 'submitted_at'),
+    )
+
+    def get_queryset(self):
+        qs = QuizAttempt.objects.select_related('quiz')
+        if getattr(self.request.user, 'is_student', False):
+            return qs.filter(student=self.request.user)
+        if getattr(self.request.user, 'is_instructor', False):
+            return qs.filter(quiz__course__instructor=self.request.user)
+        return qs
+
+    def get_permissions(self):
+        # Attempts are created by starting and changed only by submitting and grading;
+        # editing or deleting one (which would reset max_attempts) is left to staff.
+        if self.action in ('update', 'partial_update', 'destroy'):
+            return [IsAuthenticated(), IsInstructorOrAdmin()]
+        return super().get_permissions()
+
+    def create(self, request, *args, **kwargs):
+        """Student starts an attempt. POST { "quiz": 1 }"""
+        if not request.user.is_student:
+            return Response({'error': 'Only students can attempt quizzes'}, status=status.HTTP_403_FORBIDDEN)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        quiz = serializer.validated_data['quiz']
+        if not quiz.is_published:
+            return Response({'error': 'Quiz not found or not published'}, status=status.HTTP_404_NOT_FOUND)
+        if not get_membership(request).is_enrolled(quiz.course_id, active_only=True):
+            return Response({'error': "You are not enrolled in this quiz's course"}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            serializer.instance = start_attempt(request.user, quiz)
+        except NotEnrolledError as exc:
+            return Response({'error': exc.message}, status=status.HTTP_403_FORBIDDEN)
+        except LearnovaValidationError as exc:
+            return Response({'error': exc.message}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def submit(self, request, pk=None):
+        """Submit and grade an attempt. POST { "option_ids": [3, 7, 12] }"""
+        attempt = self.get_object()
+        if attempt.student_id != request.user.pk:
+            return Response({'error': 'Not your attempt'}, status=status.HTTP_403_FORBIDDEN)
+        serializer = QuizSubmissionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            submit_attempt(attempt, serializer.validated_data['option_ids'])
+        except LearnovaValidationError as exc:
+            return Response({'error': exc.message}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(QuizAttemptSerializer(attempt).data)
+
+    @action(detail=True, methods=['get'])
+    def review(self, request, pk=None):
+        """
+        Answered quiz: every question with its options, marking the selected ones.
+        Correct options are marked for staff, and for a student once they have
+        submitted all max_attempts, so a review cannot feed a later attempt.
+        """
+        attempt = self.get_object()
+        if attempt.submitted_at is None:
+            return Response({'error': 'Attempt not submitted yet'}, status=status.HTTP_400_BAD_REQUEST)
+        reveal = not request.user.is_student or QuizAttempt.objects.filter(
+            student_id=attempt.student_id, quiz_id=attempt.quiz_id, submitted_at__isnull=False,
+        ).count() >= attempt.quiz.max_attempts
+        questions = list(
+            Question.objects.filter(quiz_id=attempt.quiz_id)
+            .order_by('order', 'id')
+            .prefetch_related(Prefetch('options', queryset=QuestionOption.objects.order_by('order', 'id')))
+        )
+        layout = [(q.id, [o.id for o in q.options.all()]) for q in questions]
+        selected = decode_answers(layout, attempt.answers)
+        data = []
+        for question in questions:
+            chosen = selected.get(question.id, set())
+            options = []
+            for o in question.options.all():
+                option = {'id': o.id, 'option_text': o.option_text, 'order': o.order, 'selected': o.id in chosen}
+                if reveal:
+                    option['is_correct'] = o.is_correct
+                options.append(option)
+            entry = {
+                'id': question.id,
+                'question_text': question.question_text,
+                'question_type': question.question_type,
+                'points': question.points,
+                'options': options,
+            }
+            if reveal:
+                entry['correct'] = bool(options) and chosen == {o['id'] for o in options if o['is_correct']}
+            data.append(entry)
+        return Response({
+            'attempt': QuizAttemptSerializer(attempt).data,
+            'answers_revealed': reveal,
+            'questions': data,
+        })
 
 
 class AssignmentViewSet(viewsets.ModelViewSet):
@@ -25,11 +179,43 @@ class AssignmentViewSet(viewsets.ModelViewSet):
         if getattr(self.request.user, 'is_instructor', False):
             return qs.filter(course__instructor=self.request.user)
         if getattr(self.request.user, 'is_student', False):
-            return qs.filter(course__enrollments__student=self.request.user).distinct()
+            return qs.filter(course_id__in=get_membership(self.request).course_ids)
         return qs
 
 
-class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
-    queryset = AssignmentSubmission.objects.all()
+class AssignmentSubmissionViewSet(ExportMixin, viewsets.ModelViewSet):
     serializer_class = AssignmentSubmissionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = '-submitted_at'
+    export_filename = 'assignment-submissions'
+    export_course_lookup = 'assignment__course_id'
+    export_fields = (
+        ('id', 'id'),
+        ('student_id', 'student_id'),
+        ('student_email', 'student__email'),
+        ('course_id', 'assignment__course_id'),
+        ('assignment_id', 'assignment_id'),
+        ('assignment_title', 'assignment__title'),
+        ('grade', 'grade'),
+        ('file', 'file'),
+        ('submitted_at', 'submitted_at'),
+        ('graded_at', 'graded_at'),
+    )
+
+    def get_queryset(self):
+        qs = AssignmentSubmission.objects.all()
+        if getattr(self.request.user, 'is_student', False):
+            return qs.filter(student=self.request.user)
+        if getattr(self.request.user, 'is_instructor', False):
+            return qs.filter(assignment__course__instructor=self.request.user)
+        return qs
+
+    @action(detail=True, methods=['get'])
+    def file(self, request, pk=None):
+        """Stream the submitted file to its student, the course instructor or an admin."""
+        submission = self.get_object()
+        if not submission.file:
+            return Response({'error': 'Submission has no file'}, status=status.HTTP_404_NOT_FOUND)
+        name = submission.file.name
+        return serve_file(request, name, download_name(name, f"submission-{submission.pk}"), as_attachment=True)
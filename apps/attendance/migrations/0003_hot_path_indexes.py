@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_initial'),
+        ('courses', '0007_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='livesession',
+            options={'ordering': ['session_date']},
+        ),
+        migrations.AddIndex(
+            model_name='livesession',
+            index=models.Index(fields=['session_date'], name='live_session_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livesession',
+            index=models.Index(fields=['course', 'session_date'], name='live_session_course_date_idx'),
+        ),
+    ]
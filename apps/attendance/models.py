@@ -19,6 +19,11 @@ class LiveSession(models.Model):
 
     class Meta:
         db_table = 'live_sessions'
+        ordering = ['session_date']
+        indexes = [
+            models.Index(fields=['session_date'], name='live_session_date_idx'),
+            models.Index(fields=['course', 'session_date'], name='live_session_course_date_idx'),
+        ]
 
 
 class Attendance(models.Model):
@@ -1,5 +1,8 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from apps.core.export import ExportMixin
+from apps.core.membership import get_membership
+from apps.core.pagination import KeysetPagination
 from .models import LiveSession, Attendance
 from .serializers import LiveSessionSerializer, AttendanceSerializer
 
@@ -13,11 +16,33 @@ class LiveSessionViewSet(viewsets.ModelViewSet):
         if getattr(self.request.user, 'is_instructor', False):
             return qs.filter(course__instructor=self.request.user)
         if getattr(self.request.user, 'is_student', False):
-            return qs.filter(course__enrollments__student=self.request.user).distinct()
+            return qs.filter(course_id__in=get_membership(self.request).course_ids)
         return qs
 
 
-class AttendanceViewSet(viewsets.ModelViewSet):
-    queryset = Attendance.objects.all()
+class AttendanceViewSet(ExportMixin, viewsets.ModelViewSet):
     serializer_class = AttendanceSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = '-id'
+    export_filename = 'attendance'
+    export_course_lookup = 'session__course_id'
+    export_fields = (
+        ('id', 'id'),
+        ('student_id', 'student_id'),
+        ('student_email', 'student__email'),
+        ('course_id', 'session__course_id'),
+        ('session_id', 'session_id'),
+        ('session_title', 'session__title'),
+        ('session_date', 'session__session_date'),
+        ('status', 'status'),
+        ('notes', 'notes'),
+    )
+
+    def get_queryset(self):
+        qs = Attendance.objects.all()
+        if getattr(self.request.user, 'is_student', False):
+            return qs.filter(student=self.request.user)
+        if getattr(self.request.user, 'is_instructor', False):
+            return qs.filter(session__course__instructor=self.request.user)
+        return qs
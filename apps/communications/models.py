@@ -26,3 +26,8 @@ class Announcement(models.Model):
     class Meta:
         db_table = 'announcements'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['scope', '-created_at'], name='announcement_scope_idx'),
+            models.Index(fields=['course', '-created_at'], name='announcement_course_idx'),
+            models.Index(fields=['-created_at', '-id'], name='announcement_recent_idx'),
+        ]
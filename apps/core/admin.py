@@ -0,0 +1,21 @@
+from django.contrib import admin
+from .models import Job, StoredBlob, Upload
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['task', 'queue', 'status', 'attempts', 'run_at', 'created_at', 'finished_at']
+    list_filter = ['status', 'queue', 'task']
+
+
+@admin.register(Upload)
+class UploadAdmin(admin.ModelAdmin):
+    list_display = ['filename', 'owner', 'purpose', 'status', 'received', 'size', 'updated_at']
+    list_filter = ['status', 'purpose']
+
+
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'size', 'refcount', 'created_at', 'last_saved_at']
+    search_fields = ['sha256', 'name']
+    readonly_fields = ['sha256', 'name', 'size', 'refcount', 'created_at', 'last_saved_at']
@@ -0,0 +1,52 @@
+"""
+Learnova LMS - Versioned Cache Helpers
+Cache entries are stored under a version number; bumping the version
+invalidates every entry of a namespace without having to find and delete them.
+"""
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY_PREFIX = 'learnova:version'
+
+
+def _initial_version():
+    # Seeded from the clock so a version key that was evicted never restarts at a
+    # number whose entries may still be sitting in the cache.
+    return int(time.time() * 1000)
+
+
+def _version_key(namespace, scope=None):
+    if scope is None:
+        return f"{VERSION_KEY_PREFIX}:{namespace}"
+    return f"{VERSION_KEY_PREFIX}:{namespace}:{scope}"
+
+
+def get_version(namespace, scope=None):
+    """Return the current version for a namespace (optionally per scope, e.g. a course id)."""
+    key = _version_key(namespace, scope)
+    version = cache.get(key)
+    if version is None:
+        initial = _initial_version()
+        cache.add(key, initial, timeout=None)
+        version = cache.get(key, initial)
+    return version
+
+
+def bump_version(namespace, scope=None):
+    """Invalidate all entries stored under the current version of a namespace."""
+    key = _version_key(namespace, scope)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key missing (never read or evicted): start a fresh version sequence.
+        cache.add(key, _initial_version(), timeout=None)
+        return cache.incr(key)
+
+
+def versioned_key(namespace, *parts, scope=None):
+    """Build a cache key that embeds the namespace's current version."""
+    version = get_version(namespace, scope)
+    suffix = ':'.join(str(p) for p in parts)
+    base = f"learnova:{namespace}" if scope is None else f"learnova:{namespace}:{scope}"
+    return f"{base}:v{version}:{suffix}" if suffix else f"{base}:v{version}"
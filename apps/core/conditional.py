@@ -0,0 +1,94 @@
+"""
+Learnova LMS - Conditional GET for Read Endpoints
+ConditionalGetMixin gives a viewset's list and retrieve actions an ETag (and,
+where it is reliable, Last-Modified) computed from the rows before anything
+is serialized, and answers If-None-Match / If-Modified-Since with 304:
+
+- list: count and max(updated_at) of the filtered queryset, plus the same
+  aggregates over `etag_related` lookups, in one aggregate query
+- retrieve: the object's updated_at, plus the `etag_related` aggregates
+- get_etag_versions(): stored versions (apps.core.cache) for content that has
+  no updated_at of its own, e.g. quiz questions or the cached course outline
+
+The ETag also covers the user and the renderer, since both change the body.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    # Related lookups whose rows appear in the representation (e.g. 'lessons' for a module)
+    etag_related = ()
+
+    def get_etag_versions(self, obj=None):
+        """Stored versions that also change the representation (obj is None for lists)."""
+        return ()
+
+    def _related_aggregates(self):
+        aggregates = {}
+        for lookup in self.etag_related:
+            aggregates[f'{lookup}_count'] = Count(lookup, distinct=True)
+            aggregates[f'{lookup}_latest'] = Max(f'{lookup}__updated_at')
+        return aggregates
+
+    def get_list_fingerprint(self):
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        return sorted(queryset.aggregate(
+            count=Count('pk', distinct=True), latest=Max('updated_at'), **self._related_aggregates(),
+        ).items())
+
+    def get_object_fingerprint(self, obj):
+        fingerprint = [obj.pk, obj.updated_at]
+        if self.etag_related:
+            related = type(obj)._default_manager.filter(pk=obj.pk).aggregate(**self._related_aggregates())
+            fingerprint.extend(sorted(related.items()))
+        return fingerprint
+
+    def make_etag(self, fingerprint, versions):
+        user = self.request.user
+        audience = (user.pk, getattr(user, 'role', '')) if user.is_authenticated else None
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        raw = repr((fingerprint, tuple(versions), audience, getattr(renderer, 'format', '')))
+        return f'"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+    def conditional_response(self, request, etag, last_modified, build):
+        """304/412 if the client's validators match, else `build()` with the validators attached."""
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is None:
+            response = build()
+            if response.status_code != 200:
+                return response
+        else:
+            response = not_modified
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'no-cache'
+        patch_vary_headers(response, ['Accept', 'Authorization'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        etag = self.make_etag(self.get_list_fingerprint(), self.get_etag_versions())
+        # Deletions do not move max(updated_at), so lists only carry the ETag.
+        return self.conditional_response(
+            request, etag, None, lambda: self.build_list_response(request, *args, **kwargs),
+        )
+
+    def build_list_response(self, request, *args, **kwargs):
+        """The full list response; override to add response caching below the ETag check."""
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        obj = self.get_object()
+        versions = self.get_etag_versions(obj)
+        etag = self.make_etag(self.get_object_fingerprint(obj), versions)
+        last_modified = None
+        if not self.etag_related and not versions and obj.updated_at:
+            last_modified = int(obj.updated_at.timestamp())
+        return self.conditional_response(
+            request, etag, last_modified, lambda: Response(self.get_serializer(obj).data),
+        )
@@ -51,7 +51,39 @@ class QuizAttemptLimitError(LearnovaValidationError):
     pass
 
 
+class NotEnrolledError(LearnovaValidationError):
+    """Raised when a student acts on a course they are not actively enrolled in."""
+
+    pass
+
+
 class CourseNotPublishedError(LearnovaValidationError):
     """Raised when accessing unpublished course."""
 
     pass
+
+
+class QuizAttemptClosedError(LearnovaValidationError):
+    """Raised when submitting an attempt that is already submitted or past its time limit."""
+
+    pass
+
+
+class InvalidAnswerError(LearnovaValidationError):
+    """Raised when a quiz submission references options outside the quiz."""
+
+    pass
+
+
+class UploadError(LearnovaValidationError):
+    """Raised when a chunked upload request cannot be applied."""
+
+    pass
+
+
+class UploadOffsetError(UploadError):
+    """Raised when a chunk does not start at the upload's current offset."""
+
+    def __init__(self, message, offset):
+        self.offset = offset
+        super().__init__(message, field='offset')
@@ -0,0 +1,137 @@
+"""
+Learnova LMS - Streaming Exports
+Full dumps are streamed as CSV or NDJSON straight from a values_list() query
+walked with iterator(), so memory stays flat however many rows are exported
+and the header line is sent before the query has even run.
+"""
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+EXPORT_FORMAT_PARAM = 'export_format'
+EXPORT_CHUNK_SIZE = 2000
+# Rows joined into one write; keeps per-row generator overhead out of large exports.
+EXPORT_BATCH_ROWS = 500
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the csv writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def csv_lines(columns, rows, batch_rows=EXPORT_BATCH_ROWS):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    batch = []
+    for row in rows:
+        batch.append(writer.writerow([_csv_cell(value) for value in row]))
+        if len(batch) >= batch_rows:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def ndjson_lines(columns, rows, batch_rows=EXPORT_BATCH_ROWS):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    batch = []
+    for row in rows:
+        record = {
+            column: str(value) if isinstance(value, Decimal) else value
+            for column, value in zip(columns, row)
+        }
+        batch.append(encoder.encode(record) + '\n')
+        if len(batch) >= batch_rows:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def streaming_export(columns, rows, export_format, filename):
+    """
+    StreamingHttpResponse for `rows` (an iterable of sequences aligned with
+    `columns`). `filename` is given without extension.
+    """
+    lines = csv_lines if export_format == 'csv' else ndjson_lines
+    response = StreamingHttpResponse(lines(columns, rows), content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    response['Cache-Control'] = 'no-store'
+    # Let nginx pass chunks through as they are produced instead of buffering the whole dump.
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def get_export_format(request):
+    """Requested export format, or None if it is not supported."""
+    export_format = request.query_params.get(EXPORT_FORMAT_PARAM, 'csv').lower()
+    return export_format if export_format in EXPORT_FORMATS else None
+
+
+def invalid_format_response():
+    return Response(
+        {'error': f"{EXPORT_FORMAT_PARAM} must be one of: {', '.join(EXPORT_FORMATS)}"},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+class ExportMixin:
+    """
+    Adds GET <list>/export/?export_format=csv|ndjson&course=ID to a viewset.
+    Rows come from the viewset's own filter_queryset(get_queryset()), so an
+    export sees exactly what the list endpoint would for the same user.
+
+    export_fields: (column, lookup) pairs passed to values_list()
+    export_course_lookup: lookup used by the optional ?course= filter
+    """
+
+    export_fields = ()
+    export_course_lookup = None
+    export_filename = 'export'
+    export_chunk_size = EXPORT_CHUNK_SIZE
+
+    def get_export_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream every row visible to the caller as CSV (default) or NDJSON."""
+        export_format = get_export_format(request)
+        if export_format is None:
+            return invalid_format_response()
+        qs = self.get_export_queryset()
+        course_id = request.query_params.get('course')
+        if course_id and self.export_course_lookup:
+            if not course_id.isdigit():
+                return Response({'error': 'course must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+            qs = qs.filter(**{self.export_course_lookup: course_id})
+        columns = [column for column, _ in self.export_fields]
+        rows = (
+            qs.order_by('pk')
+            .values_list(*[lookup for _, lookup in self.export_fields])
+            .iterator(chunk_size=self.export_chunk_size)
+        )
+        filename = f"{self.export_filename}-{timezone.localdate().isoformat()}"
+        return streaming_export(columns, rows, export_format, filename)
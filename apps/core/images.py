@@ -0,0 +1,157 @@
+"""
+Learnova LMS - Image Derivatives
+Uploaded images (course thumbnails, avatars) are kept as uploaded, and fixed
+size variants in JPEG and WebP are generated from them off the request path
+by the core.image_derivatives job. The variants are recorded in a JSON field
+next to the source:
+
+    {"source": "courses/photo.jpg",
+     "variants": {"card": {"width": 400, "height": 225,
+                           "jpeg": "derivatives/courses/photo-card.jpg",
+                           "webp": "derivatives/courses/photo-card.webp"}}}
+
+"source" is the file name the variants were built from, so they are only
+rebuilt when a different file is uploaded.
+"""
+import posixpath
+from io import BytesIO
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+DERIVATIVES_DIR = 'derivatives'
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+
+# model label -> (image field, derivatives JSON field, {variant: (width, height)}, hook called with the pk after an update)
+# update() sends no post_save, so the hook does the cache eviction the save signals would have done.
+IMAGE_DERIVATIVES = {
+    'courses.Course': (
+        'thumbnail', 'thumbnail_derivatives',
+        {'card': (400, 225), 'banner': (1280, 720)},
+        'apps.courses.catalog.invalidate_course_images',
+    ),
+    'users.User': (
+        'avatar', 'avatar_derivatives',
+        {'small': (64, 64), 'medium': (256, 256)},
+        'apps.users.authentication.forget_user',
+    ),
+}
+
+
+def _open_rgb(field_file, largest):
+    from PIL import Image, ImageOps
+
+    field_file.open('rb')
+    try:
+        image = Image.open(field_file)
+        # JPEG sources are decoded at the smallest scale still larger than every
+        # variant (square, because EXIF rotation may swap width and height).
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.load()
+        return image
+    finally:
+        field_file.close()
+
+
+def build_derivatives(field_file, sizes):
+    """Render every variant of `sizes` from an image file; returns the derivatives record."""
+    from PIL import Image, ImageOps
+
+    largest = max(max(size) for size in sizes.values())
+    source = _open_rgb(field_file, largest)
+    stem = posixpath.splitext(field_file.name)[0]
+    variants = {}
+    for variant, size in sizes.items():
+        resized = ImageOps.fit(source, size, Image.Resampling.LANCZOS)
+        entry = {'width': size[0], 'height': size[1]}
+        for key, image_format, extension, options in (
+            ('jpeg', 'JPEG', 'jpg', {'quality': JPEG_QUALITY, 'optimize': True, 'progressive': True}),
+            ('webp', 'WEBP', 'webp', {'quality': WEBP_QUALITY, 'method': 4}),
+        ):
+            out = BytesIO()
+            resized.save(out, format=image_format, **options)
+            name = f"{DERIVATIVES_DIR}/{stem}-{variant}.{extension}"
+            entry[key] = default_storage.save(name, ContentFile(out.getvalue()))
+        variants[variant] = entry
+    return {'source': field_file.name, 'variants': variants}
+
+
+def derivative_names(derivatives):
+    """Stored file names of every variant in a derivatives record."""
+    return [
+        entry[key]
+        for entry in (derivatives or {}).get('variants', {}).values()
+        for key in ('jpeg', 'webp') if entry.get(key)
+    ]
+
+
+def rename_derivatives(derivatives, rename):
+    """Copy of a derivatives record with the source and variant names passed through `rename(name)`."""
+    if not derivatives:
+        return derivatives
+    renamed = {'source': rename(derivatives['source']) if derivatives.get('source') else '', 'variants': {}}
+    for variant, entry in derivatives.get('variants', {}).items():
+        renamed['variants'][variant] = {
+            key: rename(value) if key in ('jpeg', 'webp') and value else value for key, value in entry.items()
+        }
+    return renamed
+
+
+def delete_derivatives(derivatives):
+    for name in derivative_names(derivatives):
+        default_storage.delete(name)
+
+
+def refresh_derivatives(model_label, pk, force=False):
+    """
+    Bring the derivatives of one row in line with its current image.
+    Returns True if the stored derivatives changed.
+    """
+    field, derivatives_field, sizes, hook = IMAGE_DERIVATIVES[model_label]
+    model = apps.get_model(model_label)
+    row = model.objects.filter(pk=pk).values_list(field, derivatives_field).first()
+    if row is None:
+        return False
+    source, current = row[0] or '', row[1] or {}
+    if source == current.get('source', '') and not force:
+        return False
+
+    derivatives = {}
+    if source:
+        derivatives = build_derivatives(getattr(model.objects.only(field).get(pk=pk), field), sizes)
+    # Only write if the image is still the one we rendered; a newer upload has its own job queued.
+    same_source = Q(**{field: source}) if source else Q(**{field: ''}) | Q(**{f'{field}__isnull': True})
+    changes = {derivatives_field: derivatives}
+    if any(f.name == 'updated_at' for f in model._meta.concrete_fields):
+        changes['updated_at'] = timezone.now()  # update() skips auto_now; ETags follow updated_at
+    if not model.objects.filter(same_source, pk=pk).update(**changes):
+        delete_derivatives(derivatives)
+        return False
+    delete_derivatives(current)
+    if hook:
+        import_string(hook)(pk)
+    return True
+
+
+def derivative_urls(derivatives, request=None):
+    """{variant: {"width", "height", "jpeg": url, "webp": url}} for API responses."""
+    urls = {}
+    for variant, entry in (derivatives or {}).get('variants', {}).items():
+        urls[variant] = {'width': entry['width'], 'height': entry['height']}
+        for key in ('jpeg', 'webp'):
+            url = default_storage.url(entry[key])
+            urls[variant][key] = request.build_absolute_uri(url) if request is not None else url
+    return urls
@@ -0,0 +1,230 @@
+"""
+Learnova LMS - Background Jobs
+A broker-less job queue on the `jobs` table. Work is registered with @task,
+enqueued from request code and executed by `manage.py run_worker`, so nothing
+heavier than a few queries has to run inside a request.
+
+Workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED where the database
+supports it (PostgreSQL), so any number of workers can poll the same queue
+without blocking each other. On SQLite, where writes are serialized anyway,
+each candidate is claimed with a conditional UPDATE instead.
+
+Settings:
+    JOB_QUEUES        {queue: max jobs running at once across all workers}; the cap
+                      is checked when claiming, so racing workers may briefly exceed it
+    JOB_SCHEDULES     {name: {'task', 'interval' (seconds), 'kwargs', 'queue'}}
+    JOB_RETRY_DELAY   first retry delay in seconds, doubled per attempt
+    JOB_RETRY_MAX_DELAY
+    JOB_LEASE_TIMEOUT seconds without a heartbeat before a RUNNING job is requeued
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE = 'default'
+
+_registry = {}
+# {schedule name: last interval slot enqueued by this process}
+_schedule_slots = {}
+
+
+class JobError(Exception):
+    """Raise from a task to fail its job immediately, without further retries."""
+
+
+class Task:
+    """A registered job function; call .enqueue(**kwargs) to run it in the background."""
+
+    def __init__(self, func, name, queue, max_attempts):
+        self.func = func
+        self.name = name
+        self.queue = queue
+        self.max_attempts = max_attempts
+
+    def __call__(self, **kwargs):
+        return self.func(**kwargs)
+
+    def enqueue(self, *, user=None, run_at=None, unique_key=None, **kwargs):
+        return enqueue(
+            self.name, kwargs, queue=self.queue, max_attempts=self.max_attempts,
+            user=user, run_at=run_at, unique_key=unique_key,
+        )
+
+
+def task(name, queue=DEFAULT_QUEUE, max_attempts=3):
+    """Register a function as a job. kwargs and the return value must be JSON-serializable."""
+    def decorator(func):
+        registered = Task(func, name, queue, max_attempts)
+        _registry[name] = registered
+        return registered
+    return decorator
+
+
+def get_task(name):
+    if name not in _registry:
+        autodiscover_modules('tasks')
+    return _registry[name]
+
+
+def enqueue(task_name, kwargs=None, queue=DEFAULT_QUEUE, max_attempts=3, user=None, run_at=None, unique_key=None):
+    """
+    Create a queued job. With `unique_key`, a second enqueue of the same key
+    returns the existing job instead of creating a duplicate.
+    """
+    fields = {
+        'task': task_name,
+        'kwargs': kwargs or {},
+        'queue': queue,
+        'max_attempts': max_attempts,
+        'created_by': user if user is not None and user.is_authenticated else None,
+        'run_at': run_at or timezone.now(),
+    }
+    if unique_key is None:
+        return Job.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return Job.objects.create(unique_key=unique_key, **fields)
+    except IntegrityError:
+        return Job.objects.get(unique_key=unique_key)
+
+
+def queue_limit(queue):
+    return getattr(settings, 'JOB_QUEUES', {}).get(queue)
+
+
+def claim_jobs(queue, limit, worker_id):
+    """Atomically move up to `limit` due jobs of `queue` to RUNNING and return them."""
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    claimed_fields = {
+        'status': Job.Status.RUNNING,
+        'locked_by': worker_id,
+        'locked_at': now,
+        'started_at': now,
+        'attempts': F('attempts') + 1,
+    }
+    cap = queue_limit(queue)
+    if cap is not None:
+        limit = min(limit, cap - Job.objects.filter(queue=queue, status=Job.Status.RUNNING).count())
+        if limit <= 0:
+            return []
+    due = Job.objects.filter(queue=queue, status=Job.Status.QUEUED, run_at__lte=now).order_by('run_at', 'pk')
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+            Job.objects.filter(pk__in=ids).update(**claimed_fields)
+    else:
+        # Autocommit UPDATEs: a read-then-write transaction on SQLite fails with
+        # "database is locked" instead of waiting when another worker is writing.
+        ids = [
+            pk for pk in due.values_list('pk', flat=True)[:limit]
+            if Job.objects.filter(pk=pk, status=Job.Status.QUEUED).update(**claimed_fields)
+        ]
+    return list(Job.objects.filter(pk__in=ids).order_by('run_at', 'pk'))
+
+
+def retry_delay(attempts):
+    base = getattr(settings, 'JOB_RETRY_DELAY', 30)
+    cap = getattr(settings, 'JOB_RETRY_MAX_DELAY', 3600)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), cap))
+
+
+def run_job(job_id):
+    """
+    Execute one claimed job and record its outcome. Runs in a worker thread or
+    child process, so it only takes the job id and loads everything itself.
+    Returns the final status.
+    """
+    close_old_connections()
+    try:
+        job = Job.objects.get(pk=job_id)
+        try:
+            result = get_task(job.task)(**job.kwargs)
+        except Exception as exc:
+            error = traceback.format_exc()
+            logger.warning("Job %s (%s) failed on attempt %s", job.pk, job.task, job.attempts)
+            now = timezone.now()
+            if job.attempts < job.max_attempts and not isinstance(exc, JobError):
+                fields = {'status': Job.Status.QUEUED, 'run_at': now + retry_delay(job.attempts)}
+            else:
+                fields = {'status': Job.Status.FAILED, 'finished_at': now}
+            Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING).update(
+                error=error, locked_by='', locked_at=None, **fields
+            )
+            return fields['status']
+        Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING).update(
+            status=Job.Status.SUCCEEDED, result=result, error='',
+            locked_by='', locked_at=None, finished_at=timezone.now(),
+        )
+        return Job.Status.SUCCEEDED
+    finally:
+        close_old_connections()
+
+
+def heartbeat(job_ids):
+    """Refresh the lease of jobs that are still running in this worker."""
+    if job_ids:
+        Job.objects.filter(pk__in=job_ids, status=Job.Status.RUNNING).update(locked_at=timezone.now())
+
+
+def requeue_stale_jobs():
+    """
+    Put RUNNING jobs whose worker stopped sending heartbeats back in the queue.
+    A lost run counts as an attempt, so a job that has used all of its attempts
+    (one that keeps killing its worker, say) is marked FAILED instead.
+    Returns the number of jobs requeued.
+    """
+    lease = timedelta(seconds=getattr(settings, 'JOB_LEASE_TIMEOUT', 300))
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=now - lease)
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.Status.FAILED, error='Worker stopped sending heartbeats on the last attempt.',
+        locked_by='', locked_at=None, finished_at=now,
+    )
+    if failed:
+        logger.warning("Marked %s stale jobs as failed after their last attempt", failed)
+    return stale.filter(attempts__lt=F('max_attempts')).update(
+        status=Job.Status.QUEUED, locked_by='', locked_at=None, run_at=now,
+    )
+
+
+def enqueue_due_schedules(now=None):
+    """
+    Enqueue one job per JOB_SCHEDULES entry and interval slot. The slot is part
+    of the job's unique_key, so several workers running this concurrently still
+    enqueue each periodic run once. The worker calls this on every poll, so the
+    last slot enqueued per schedule is remembered in-process and the key is
+    looked up before inserting: a slot costs one query per worker, not a
+    failed INSERT per poll. Returns the jobs of slots seen for the first time.
+    """
+    now = now or timezone.now()
+    jobs = []
+    for name, schedule in getattr(settings, 'JOB_SCHEDULES', {}).items():
+        interval = int(schedule['interval'])
+        slot = int(now.timestamp()) // interval
+        if _schedule_slots.get(name) == slot:
+            continue
+        unique_key = f"schedule:{name}:{slot}"
+        job = Job.objects.filter(unique_key=unique_key).first()
+        if job is None:
+            registered = get_task(schedule['task'])
+            job = enqueue(
+                registered.name,
+                schedule.get('kwargs'),
+                queue=schedule.get('queue', registered.queue),
+                max_attempts=registered.max_attempts,
+                unique_key=unique_key,
+            )
+        _schedule_slots[name] = slot
+        jobs.append(job)
+    return jobs
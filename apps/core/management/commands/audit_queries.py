@@ -0,0 +1,62 @@
+"""
+Management command that EXPLAINs every viewset's list query and the queries of its other read
+actions (and sync) per role, and flags full table scans. It fails when a scan is found, or when a
+role or query could not be audited, unless --no-fail / --allow-skip is given.
+Usage: python manage.py audit_queries [--analyze] [--min-rows N] [--json PATH] [--no-fail] [--allow-skip]
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from apps.core.query_audit import analyze_tables, audit_queries
+
+
+class Command(BaseCommand):
+    help = "Capture EXPLAIN plans of the API queries and flag sequential scans"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyze', action='store_true', help="Run ANALYZE first so the planner has statistics")
+        parser.add_argument('--min-rows', type=int, default=1000, help="Ignore scans of tables smaller than this (default 1000)")
+        parser.add_argument('--json', help="Also write the queries, plans and findings to this file")
+        parser.add_argument('--no-fail', action='store_true', help="Exit successfully even if scans were found")
+        parser.add_argument('--allow-skip', action='store_true',
+                            help="Exit successfully even if a role has no user or a query could not be audited")
+
+    def handle(self, *args, **options):
+        if options['analyze']:
+            analyze_tables()
+        results = audit_queries(min_rows=options['min_rows'])
+        flagged = [result for result in results if result.scans]
+        skipped = [result for result in results if result.error]
+
+        self.stdout.write(f"Auditing API queries on {connection.vendor}...")
+        for result in results:
+            if result.error:
+                self.stdout.write(self.style.WARNING(f"  {result.label}: skipped ({result.error})"))
+            elif result.scans:
+                self.stdout.write(self.style.WARNING(f"  {result.label}: sequential scan of {', '.join(result.scans)}"))
+            else:
+                self.stdout.write(f"  {result.label}: ok")
+            if result.plan and (result.scans or options['verbosity'] >= 2):
+                for line in result.plan.splitlines():
+                    self.stdout.write(f"      {line}")
+            if result.sql and options['verbosity'] >= 3:
+                self.stdout.write(f"      {result.sql}")
+
+        if options['json']:
+            with open(options['json'], 'w') as f:
+                json.dump({
+                    'vendor': connection.vendor,
+                    'min_rows': options['min_rows'],
+                    'queries': [vars(result) for result in results],
+                }, f, indent=2)
+
+        if flagged and not options['no_fail']:
+            raise CommandError(f"{len(flagged)} of {len(results)} queries scan large tables.")
+        if skipped and not options['allow_skip']:
+            raise CommandError(f"{len(skipped)} roles or queries could not be audited (pass --allow-skip to accept).")
+        summary = f"Query audit finished: {len(results)} queries, {len(flagged)} with scans"
+        if skipped:
+            self.stdout.write(self.style.WARNING(f"{summary}, {len(skipped)} skipped (not audited)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{summary}."))
@@ -0,0 +1,40 @@
+"""
+Management command to generate missing or stale image derivatives (course thumbnails, avatars).
+Usage: python manage.py backfill_image_derivatives [--model courses.Course] [--force] [--enqueue]
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from apps.core.images import IMAGE_DERIVATIVES, refresh_derivatives
+from apps.core.tasks import image_derivatives_job
+
+
+class Command(BaseCommand):
+    help = "Render derivatives for every image whose variants are missing or were built from another file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', dest='models', choices=sorted(IMAGE_DERIVATIVES),
+                            help="Limit to a model (repeatable)")
+        parser.add_argument('--force', action='store_true', help="Rebuild even up-to-date derivatives")
+        parser.add_argument('--enqueue', action='store_true', help="Queue background jobs instead of rendering here")
+
+    def handle(self, *args, **options):
+        for label in options['models'] or sorted(IMAGE_DERIVATIVES):
+            field, derivatives_field, _, _ = IMAGE_DERIVATIVES[label]
+            model = apps.get_model(label)
+            rows = model.objects.order_by('pk').values_list('pk', field, derivatives_field)
+            stale = [
+                pk for pk, source, derivatives in rows.iterator(chunk_size=2000)
+                if options['force'] or (source or '') != (derivatives or {}).get('source', '')
+            ]
+            changed = 0
+            for pk in stale:
+                if options['enqueue']:
+                    image_derivatives_job.enqueue(model=label, pk=pk, force=options['force'])
+                    continue
+                try:
+                    changed += refresh_derivatives(label, pk, force=options['force'])
+                except (OSError, ValueError) as exc:
+                    self.stderr.write(self.style.ERROR(f"  {label} {pk}: {exc}"))
+            action = 'queued' if options['enqueue'] else f'{changed} updated'
+            self.stdout.write(f"  {label}: {len(stale)} stale, {action}")
+        self.stdout.write(self.style.SUCCESS("Image derivatives backfill finished."))
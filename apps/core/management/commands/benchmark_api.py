@@ -0,0 +1,78 @@
+"""
+Management command that benchmarks every API endpoint against a seeded test database.
+Usage: python manage.py benchmark_api [--students N] [--courses N] [--iterations N] [--only TEXT]
+                                      [--output PATH] [--baseline PATH] [--threshold 0.25] [--update-baseline] [--no-fail]
+
+Seeds a throwaway test database (your data is not touched), runs the scenarios in
+benchmarks/scenarios.py through APIClient and writes p50/p95/p99 latency, queries
+per request and peak memory to --output. The run is compared with the committed
+baseline (benchmarks/baseline.json): more queries, or p50 latency / peak memory
+worse by more than --threshold, fail the command.
+"""
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from benchmarks.runner import DEFAULT_BASELINE, baseline_mismatch, compare, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = "Benchmark the API endpoints (latency, queries, memory) and compare with the baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=2000, help="Students to seed (default 2000)")
+        parser.add_argument('--courses', type=int, default=100, help="Courses to seed (default 100)")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--workers', type=int, default=1, help="seed_data generator processes")
+        parser.add_argument('--iterations', type=int, default=30, help="Timed requests per scenario (default 30)")
+        parser.add_argument('--warmup', type=int, default=3, help="Untimed requests per scenario first (default 3)")
+        parser.add_argument('--only', help="Run only scenarios whose label contains this text")
+        parser.add_argument('--output', default='benchmark-results.json', help="Results file (default benchmark-results.json)")
+        parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline to compare with")
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help="Allowed relative increase of p50 latency and peak memory (default 0.25)")
+        parser.add_argument('--update-baseline', action='store_true', help="Write the results to --baseline instead of comparing")
+        parser.add_argument('--no-fail', action='store_true', help="Exit successfully even if regressions were found")
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1 or options['warmup'] < 1:
+            raise CommandError("--iterations and --warmup must be at least 1.")
+        scale = {'students': options['students'], 'courses': options['courses'], 'seed': options['seed']}
+        results = run_benchmarks(
+            scale, iterations=options['iterations'], warmup=options['warmup'], workers=options['workers'],
+            only=options['only'], log=self.stdout.write,
+        )
+        with open(options['output'], 'w') as f:
+            json.dump(results, f, indent=2)
+        self.stdout.write(f"Results written to {options['output']}")
+        for route in results['uncovered_routes']:
+            self.stdout.write(self.style.WARNING(f"  Route without a scenario: {route}"))
+
+        if options['update_baseline']:
+            if options['only']:
+                raise CommandError("Refusing to write a baseline from a partial run (--only).")
+            with open(options['baseline'], 'w') as f:
+                json.dump(results, f, indent=2)
+                f.write('\n')
+            self.stdout.write(self.style.SUCCESS(f"Baseline updated: {options['baseline']}"))
+            return
+
+        if not os.path.exists(options['baseline']):
+            raise CommandError(f"No baseline at {options['baseline']}; create one with --update-baseline.")
+        with open(options['baseline']) as f:
+            baseline = json.load(f)
+        mismatch = baseline_mismatch(results, baseline)
+        if mismatch:
+            raise CommandError(f"Cannot compare: {mismatch}. Rerun with the baseline's options or --update-baseline.")
+
+        regressions, improvements = compare(results, baseline, options['threshold'])
+        for message in improvements:
+            self.stdout.write(self.style.SUCCESS(f"  Improved: {message}"))
+        for message in regressions:
+            self.stdout.write(self.style.ERROR(f"  Regressed: {message}"))
+        if regressions and not options['no_fail']:
+            raise CommandError(f"{len(regressions)} regressions against {options['baseline']}.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Benchmark finished: {len(results['scenarios'])} scenarios, {len(regressions)} regressions, "
+            f"{len(improvements)} improvements."
+        ))
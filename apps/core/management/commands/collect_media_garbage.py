@@ -0,0 +1,25 @@
+"""
+Management command that deletes content-addressed media blobs no row references any more.
+Usage: python manage.py collect_media_garbage [--grace SECONDS] [--dry-run]
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.storage import collect_garbage, content_addressed_storage
+
+
+class Command(BaseCommand):
+    help = "Recount media blob references and remove unreferenced blobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace', type=int, help="Keep blobs saved within this many seconds (default MEDIA_GC_GRACE)")
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be removed")
+
+    def handle(self, *args, **options):
+        if content_addressed_storage() is None:
+            raise CommandError("The default storage is not content-addressed (set MEDIA_STORAGE=cas).")
+        grace = timedelta(seconds=options['grace']) if options['grace'] is not None else None
+        removed, freed = collect_garbage(grace=grace, dry_run=options['dry_run'])
+        verb = 'would be removed' if options['dry_run'] else 'removed'
+        self.stdout.write(f"  {removed} blobs {verb} ({freed / 1024 ** 2:.1f} MB)")
+        self.stdout.write(self.style.SUCCESS("Media garbage collection finished."))
@@ -0,0 +1,22 @@
+"""
+Management command that folds media saved before MEDIA_STORAGE=cas into the content-addressed store.
+Usage: python manage.py migrate_media_to_store [--keep-originals]
+"""
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.storage import migrate_legacy_files
+
+
+class Command(BaseCommand):
+    help = "Store every existing media file once under its content hash and repoint the rows that use it"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-originals', action='store_true',
+                            help="Leave the old files in place (delete them yourself once verified)")
+
+    def handle(self, *args, **options):
+        try:
+            migrated, duplicates, missing = migrate_legacy_files(options['keep_originals'], log=self.stdout.write)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(f"  {migrated} files migrated, {duplicates} were duplicates, {missing} missing")
+        self.stdout.write(self.style.SUCCESS("Media migrated to the content-addressed store."))
@@ -0,0 +1,95 @@
+"""
+Management command that runs background jobs from the jobs table.
+Usage: python manage.py run_worker [--queue NAME ...] [--concurrency 4] [--pool thread|process] [--once]
+"""
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import autodiscover_modules
+from apps.core.jobs import DEFAULT_QUEUE, claim_jobs, enqueue_due_schedules, heartbeat, requeue_stale_jobs
+from apps.core.worker import execute, setup_process
+
+
+class Command(BaseCommand):
+    help = "Claim and execute queued background jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queue', action='append', dest='queues', help="Queue to serve (repeatable; default: all configured)")
+        parser.add_argument('--concurrency', type=int, default=4, help="Jobs run at once by this worker")
+        parser.add_argument('--pool', choices=['thread', 'process'], default='thread',
+                            help="thread for I/O-bound jobs, process for CPU-bound ones")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Seconds between polls when idle")
+        parser.add_argument('--once', action='store_true', help="Exit once no due jobs are left")
+        parser.add_argument('--no-schedules', action='store_true', help="Do not enqueue JOB_SCHEDULES entries")
+
+    def handle(self, *args, **options):
+        autodiscover_modules('tasks')
+        queues = options['queues'] or sorted({DEFAULT_QUEUE, *getattr(settings, 'JOB_QUEUES', {})})
+        concurrency = max(1, options['concurrency'])
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        if options['pool'] == 'process':
+            executor = ProcessPoolExecutor(
+                concurrency, mp_context=multiprocessing.get_context('spawn'), initializer=setup_process,
+            )
+        else:
+            executor = ThreadPoolExecutor(concurrency, thread_name_prefix='job')
+
+        self.stopping = False
+
+        def stop(signum, frame):
+            self.stdout.write("Stopping after running jobs finish...")
+            self.stopping = True
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+
+        self.stdout.write(f"Worker {worker_id}: {options['pool']} pool x{concurrency}, queues {', '.join(queues)}")
+        running = {}  # future -> job
+        next_queue = 0
+        try:
+            while True:
+                for future in [f for f in running if f.done()]:
+                    job = running.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as exc:
+                        # Only reachable if the pool itself broke (e.g. a child process was killed);
+                        # the job's lease expires and it is requeued.
+                        outcome = f"lost ({exc})"
+                    self.stdout.write(f"  Job {job.pk} {job.task}: {outcome}")
+
+                if self.stopping:
+                    if not running:
+                        break
+                    wait(running, timeout=options['poll_interval'])
+                    continue
+
+                heartbeat([job.pk for job in running.values()])
+                requeue_stale_jobs()
+                if not options['no_schedules']:
+                    enqueue_due_schedules()
+
+                claimed = 0
+                # Rotate the starting queue so a busy queue cannot starve the others.
+                for offset in range(len(queues)):
+                    queue = queues[(next_queue + offset) % len(queues)]
+                    for job in claim_jobs(queue, concurrency - len(running), worker_id):
+                        running[executor.submit(execute, job.pk)] = job
+                        claimed += 1
+                next_queue = (next_queue + 1) % len(queues)
+
+                if options['once'] and not running and not claimed:
+                    break
+                if running:
+                    wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                elif not claimed:
+                    time.sleep(options['poll_interval'])
+        finally:
+            executor.shutdown(wait=True)
+        self.stdout.write(self.style.SUCCESS("Worker stopped."))
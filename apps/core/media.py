@@ -0,0 +1,162 @@
+"""
+Learnova LMS - Protected Media Serving
+Serves stored files from views that have already checked access (lesson
+content for enrolled students, submission files for their owner):
+
+- strong ETag and Last-Modified, answered with 304 / 412 for conditional requests
+- single byte ranges (Range / If-Range) so video players can seek, 416 when unsatisfiable
+- FileResponse over the open file, so WSGI servers with sendfile (gunicorn) copy
+  the bytes in the kernel; ranges are bounded readers over the same descriptor
+- MEDIA_ACCEL_REDIRECT='nginx' (X-Accel-Redirect under MEDIA_ACCEL_PREFIX) or
+  'sendfile' (X-Sendfile with the absolute path) hands the transfer to the front proxy
+"""
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.encoding import iri_to_uri
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+BLOCK_SIZE = 64 * 1024
+
+
+class FileRange:
+    """File-like view of bytes [start, start + length) of an open file; keeps fileno() for sendfile."""
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def file_etag(name, stat):
+    """Content hash for content-addressed blobs, otherwise size and mtime of the file."""
+    from .storage import is_blob_name
+
+    if is_blob_name(name):
+        return f'"{posixpath.basename(name).split(".")[0]}"'
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def download_name(name, stem):
+    """Name offered to clients: the stored basename, or `stem` + extension for hash-named blobs."""
+    from .storage import is_blob_name
+
+    if is_blob_name(name):
+        return stem + posixpath.splitext(name)[1]
+    return posixpath.basename(name)
+
+
+def parse_range(header, size):
+    """(start, end) inclusive for a single `bytes=` range, None to serve everything, or False if unsatisfiable."""
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None  # malformed or multiple ranges: a full 200 response is allowed
+    first, last = match.groups()
+    if first == '':
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def if_range_matches(request, etag, mtime):
+    value = request.headers.get('If-Range')
+    if not value:
+        return True
+    if value.startswith('"') or value.startswith('W/'):
+        return value == etag  # strong comparison: weak tags never match
+    modified = parse_http_date_safe(value)
+    return modified is not None and int(mtime) <= modified
+
+
+def serve_file(request, name, filename=None, as_attachment=False):
+    """
+    Response for the stored file `name`, honouring conditional and range requests.
+    `filename` is the name offered to the client (defaults to the stored basename).
+    """
+    if not name:
+        raise Http404("No file.")
+    try:
+        path = default_storage.path(name)
+        stat = os.stat(path)
+    except (NotImplementedError, FileNotFoundError, ValueError):
+        raise Http404("File not found.")
+
+    filename = filename or posixpath.basename(name)
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    etag = file_etag(name, stat)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': 'private, max-age=0, must-revalidate',
+    }
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if conditional is not None:
+        for header in ('ETag', 'Last-Modified', 'Cache-Control'):
+            conditional.headers[header] = headers[header]
+        return conditional
+
+    accel = getattr(settings, 'MEDIA_ACCEL_REDIRECT', '')
+    if accel:
+        # The proxy serves ranges itself; only the access decision was ours.
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+        if accel == 'nginx':
+            response['X-Accel-Redirect'] = iri_to_uri(settings.MEDIA_ACCEL_PREFIX.rstrip('/') + '/' + name)
+        else:
+            response['X-Sendfile'] = path
+        return response
+
+    size = stat.st_size
+    byte_range = None
+    if request.headers.get('Range') and if_range_matches(request, etag, stat.st_mtime):
+        byte_range = parse_range(request.headers['Range'], size)
+        if byte_range is False:
+            headers['Content-Range'] = f'bytes */{size}'
+            return HttpResponse(status=416, headers=headers)
+
+    file = open(path, 'rb')
+    if byte_range is None:
+        response = FileResponse(
+            file, content_type=content_type, headers=headers, filename=filename, as_attachment=as_attachment,
+        )
+        response.block_size = BLOCK_SIZE
+        return response
+    start, end = byte_range
+    response = FileResponse(
+        FileRange(file, start, end - start + 1), status=206, content_type=content_type, headers=headers,
+        filename=filename, as_attachment=as_attachment,
+    )
+    response.block_size = BLOCK_SIZE
+    response['Content-Length'] = str(end - start + 1)
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
@@ -0,0 +1,59 @@
+"""
+Learnova LMS - Enrollment Membership
+The ids of the courses a user is enrolled in, loaded once per request and
+cached across requests under a per-user version that the Enrollment signals
+bump. Permissions and student querysets filter with a plain
+`course_id IN (...)` instead of joining enrollments and de-duplicating.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from .cache import bump_version, versioned_key
+
+MEMBERSHIP_NAMESPACE = 'enrollment-membership'
+MEMBERSHIP_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class Membership:
+    """Enrolled course ids of one user; `active_course_ids` leaves out dropped enrollments."""
+
+    def __init__(self, rows):
+        self.course_ids = frozenset(course_id for course_id, _ in rows)
+        self.active_course_ids = frozenset(course_id for course_id, dropped in rows if not dropped)
+
+    def is_enrolled(self, course_id, active_only=False):
+        return course_id in (self.active_course_ids if active_only else self.course_ids)
+
+
+def load_membership_rows(user_id):
+    from apps.enrollments.models import Enrollment
+
+    rows = Enrollment.objects.filter(student_id=user_id).values_list('course_id', 'status')
+    return [(course_id, status == Enrollment.Status.DROPPED) for course_id, status in rows]
+
+
+def get_membership(request):
+    """Membership of request.user, memoized on the request (empty for anonymous users)."""
+    membership = getattr(request, '_membership', None)
+    if membership is not None:
+        return membership
+    user = request.user
+    if not user.is_authenticated:
+        membership = Membership([])
+    else:
+        key = versioned_key(MEMBERSHIP_NAMESPACE, 'courses', scope=user.pk)
+        rows = cache.get(key)
+        if rows is None:
+            rows = load_membership_rows(user.pk)
+            cache.set(key, rows, MEMBERSHIP_CACHE_TIMEOUT)
+        membership = Membership(rows)
+    request._membership = membership
+    return membership
+
+
+def invalidate_membership(user_id):
+    """
+    Drop a user's cached membership once the transaction commits: bumping earlier
+    lets a concurrent request cache the pre-commit rows under the new version.
+    """
+    if user_id is not None:
+        transaction.on_commit(lambda: bump_version(MEMBERSHIP_NAMESPACE, scope=user_id))
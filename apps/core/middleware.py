@@ -0,0 +1,134 @@
+"""
+Learnova LMS - Query Instrumentation Middleware
+Counts the SQL a request runs through connection.execute_wrapper: number of
+queries, total database time and statements that repeat. For sampled requests
+(QUERY_SAMPLE_RATE) it
+
+- adds `Server-Timing: db;dur=<ms>;desc="<n> queries, <d> duplicates"`
+- logs one logfmt line per request (logger apps.core.middleware, INFO)
+- warns with the view and the call site in our code when one statement shape
+  runs more than QUERY_NPLUSONE_THRESHOLD times (an N+1)
+
+Per query it only times the call and counts the statement's shape: the SQL
+string, which Django already parameterizes, with IN lists of any length
+folded (normalized once per distinct string). The stack is walked once per
+offending shape.
+Rows fetched while a streaming response is being sent are not counted.
+"""
+import logging
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack
+from functools import lru_cache
+
+import django
+import rest_framework
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# IN (%s, %s, ...) lists of any length are one statement shape
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+LIBRARY_DIRS = tuple(os.path.dirname(module.__file__) + os.sep for module in (django, rest_framework))
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql):
+    return IN_LIST_RE.sub('IN (...)', sql)
+
+
+def call_site():
+    """'path:line in function' of the innermost frame outside Django, DRF and this module."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename != __file__ and not filename.startswith(LIBRARY_DIRS) and 'site-packages' not in filename:
+            path = os.path.relpath(filename, settings.BASE_DIR)
+            return f"{path}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+class QueryRecorder:
+    """execute_wrapper that tallies one request's queries."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.count = 0
+        self.duration = 0.0
+        # {normalized statement: executions}, {normalized statement: call site}
+        self.statements = Counter()
+        self.call_sites = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            shape = normalize_sql(sql)
+            self.statements[shape] += 1
+            if self.statements[shape] == self.threshold + 1:
+                self.call_sites[shape] = call_site()
+
+    def shapes(self):
+        """{normalized statement: executions}"""
+        return Counter(self.statements)
+
+
+class QueryInstrumentationMiddleware:
+    """Per-request query counts, Server-Timing and N+1 warnings; see the module docstring."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.QUERY_SAMPLE_RATE
+        self.threshold = settings.QUERY_NPLUSONE_THRESHOLD
+
+    def __call__(self, request):
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = QueryRecorder(self.threshold)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        shapes = recorder.shapes()
+        duplicates = sum(count - 1 for count in shapes.values() if count > 1)
+        duration_ms = recorder.duration * 1000
+        response['Server-Timing'] = f'db;dur={duration_ms:.1f};desc="{recorder.count} queries, {duplicates} duplicates"'
+
+        view = self.view_name(request)
+        logger.info(
+            'method=%s path=%s view=%s status=%s db_queries=%d db_time_ms=%.1f db_duplicates=%d',
+            request.method, request.path, view, response.status_code, recorder.count, duration_ms, duplicates,
+            extra={
+                'view': view, 'db_queries': recorder.count, 'db_time_ms': round(duration_ms, 1),
+                'db_duplicates': duplicates,
+            },
+        )
+        for sql, site in recorder.call_sites.items():
+            count = shapes[sql]
+            logger.warning(
+                'Possible N+1: view=%s call_site="%s" executions=%d sql="%s"',
+                view, site, count, sql[:300],
+                extra={'view': view, 'call_site': site, 'executions': count, 'sql': sql},
+            )
+        return response
+
+    @staticmethod
+    def view_name(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return '-'
+        func = match.func
+        view = getattr(func, 'cls', None) or getattr(func, 'view_class', None) or func
+        name = f"{view.__module__}.{view.__qualname__}"
+        return f"{name}:{match.url_name}" if match.url_name else name
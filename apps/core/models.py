@@ -0,0 +1,111 @@
+"""
+Core models for Learnova LMS
+Background jobs, chunked uploads, content-addressed media blobs
+"""
+import uuid
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """One unit of background work, claimed and run by `manage.py run_worker`."""
+
+    class Status(models.TextChoices):
+        QUEUED = 'QUEUED', 'Queued'
+        RUNNING = 'RUNNING', 'Running'
+        SUCCEEDED = 'SUCCEEDED', 'Succeeded'
+        FAILED = 'FAILED', 'Failed'
+        CANCELLED = 'CANCELLED', 'Cancelled'
+
+    queue = models.CharField(max_length=50, default='default')
+    task = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    # Set for periodic runs and other jobs that must be enqueued at most once
+    unique_key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    # Refreshed by the worker while the job runs; a stale lock means the worker died
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['queue', 'status', 'run_at'], name='job_claim_idx'),
+            models.Index(fields=['status', 'locked_at'], name='job_lease_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
+
+
+class Upload(models.Model):
+    """A chunked, resumable upload; see apps.core.uploads for the protocol."""
+
+    class Purpose(models.TextChoices):
+        SUBMISSION = 'SUBMISSION', 'Assignment submission'
+        LESSON = 'LESSON', 'Lesson content'
+
+    class Status(models.TextChoices):
+        UPLOADING = 'UPLOADING', 'Uploading'
+        COMPLETE = 'COMPLETE', 'Complete'
+        ATTACHED = 'ATTACHED', 'Attached'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='uploads')
+    purpose = models.CharField(max_length=20, choices=Purpose.choices)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    # Optional client-supplied digest, verified on finalize
+    expected_sha256 = models.CharField(max_length=64, blank=True)
+    sha256 = models.CharField(max_length=64, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.UPLOADING)
+    # Storage name once finalized
+    file = models.FileField(blank=True, max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'uploads'
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='upload_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+class StoredBlob(models.Model):
+    """One file of the content-addressed media store (apps.core.storage), shared by every row that references it."""
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    # Saves minus deletes since the last recount; -1 while the garbage collector removes the blob
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Last save of this content; blobs saved within the GC grace period are never collected
+    last_saved_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'stored_blobs'
+        indexes = [
+            models.Index(fields=['refcount', 'last_saved_at'], name='blob_gc_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} (refs: {self.refcount})"
@@ -0,0 +1,142 @@
+"""
+Learnova LMS - Keyset (cursor) Pagination
+Pages are addressed by an opaque cursor holding the ordering value and id of
+the row at the page boundary, so fetching page 500 is a single indexed range
+scan just like page 1: no COUNT(*) and no OFFSET.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination on one model field plus an `id` tie-breaker.
+    The ordering is taken from the view's `keyset_ordering` (e.g. '-created_at',
+    'order'), falling back to the first entry of the model's Meta.ordering, then '-id'.
+    Response: { "next": url, "previous": url, "results": [...] }
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field_name, self.descending = self.get_ordering(queryset, view)
+        self.field = queryset.model._meta.get_field(self.field_name)
+
+        cursor = self.decode_cursor(request)
+        backwards = bool(cursor and cursor.get('r'))
+        # Walking backwards we scan in the opposite direction and flip the rows afterwards.
+        scan_descending = self.descending != backwards
+        prefix = '-' if scan_descending else ''
+        queryset = queryset.order_by(f'{prefix}{self.field_name}', f'{prefix}pk')
+        if cursor:
+            queryset = queryset.filter(self.position_filter(cursor, scan_descending))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if backwards:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.page = rows
+        return rows
+
+    def get_ordering(self, queryset, view):
+        ordering = getattr(view, 'keyset_ordering', None)
+        if not ordering:
+            model_ordering = queryset.model._meta.ordering
+            ordering = model_ordering[0] if model_ordering else '-id'
+        descending = ordering.startswith('-')
+        field_name = ordering.lstrip('-')
+        if field_name == 'pk':
+            field_name = 'id'
+        return field_name, descending
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def position_filter(self, cursor, descending):
+        """Rows strictly after the cursor position in the scan direction."""
+        op = 'lt' if descending else 'gt'
+        if self.field_name == 'id':
+            return Q(**{f'pk__{op}': cursor['id']})
+        return Q(**{f'{self.field_name}__{op}': cursor['value']}) | Q(
+            **{self.field_name: cursor['value'], f'pk__{op}': cursor['id']}
+        )
+
+    # Cursor encoding
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            cursor = {'id': int(raw['i']), 'r': bool(raw.get('r'))}
+            if self.field_name != 'id':
+                cursor['value'] = self.field.to_python(raw['v'])
+        except (TypeError, ValueError, KeyError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, row, reverse):
+        raw = {'i': row.pk}
+        if self.field_name != 'id':
+            raw['v'] = self.field.value_to_string(row)
+        if reverse:
+            raw['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(raw, separators=(',', ':')).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -2,6 +2,7 @@
 Learnova LMS - Common Permission Classes
 """
 from rest_framework import permissions
+from .membership import get_membership
 
 
 class IsAdminUser(permissions.BasePermission):
@@ -48,8 +49,8 @@ class IsEnrolledStudent(permissions.BasePermission):
     """User must be enrolled in the course."""
 
     def has_object_permission(self, request, view, obj):
-        course = getattr(obj, 'course', obj) if hasattr(obj, 'course') else obj
-        return request.user.enrollments.filter(course=course).exists()
+        course_id = obj.course_id if hasattr(obj, 'course_id') else obj.pk
+        return get_membership(request).is_enrolled(course_id)
 
 
 class ReadOnly(permissions.BasePermission):
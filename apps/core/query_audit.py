@@ -0,0 +1,321 @@
+"""
+Learnova LMS - Query Plan Audit
+Captures the EXPLAIN plan of the canonical queries of every routed viewset the
+way each role would run them (anonymous, student, instructor, admin) and flags
+full table scans of tables large enough for a scan to matter:
+
+- SQLite: `SCAN <table>` without an index (EXPLAIN QUERY PLAN)
+- PostgreSQL: `Seq Scan on <table>`
+
+The list query is built from the viewset (filtered, ordered, one page). Every
+other read action (retrieve, my_courses, the dashboards, exports, ...) and the
+write actions with a sample body in ACTION_BODIES (sync) are run through the
+view inside a rolled-back transaction, with caches disabled, and each SELECT,
+UPDATE and DELETE they execute is explained. Detail actions use the first row
+of the role's list.
+
+A scan of an unfiltered query ordered by primary key only is not flagged: it
+walks the table in key order and either stops after one page (lists) or is
+meant to read every row (exports). Roles
+with no user in the database cannot be audited and are reported as skipped.
+
+Run it against a seeded database (python manage.py seed_data) after ANALYZE,
+since planners pick scans for small or unanalyzed tables:
+
+    python manage.py audit_queries --analyze
+"""
+import re
+from dataclasses import dataclass, field
+
+from django.apps import apps
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (?:TABLE )?"?(\w+)"?(?: AS \w+)?\s*$'),
+    'postgresql': re.compile(r'\bSeq Scan on "?(\w+)"?'),
+}
+# Write actions are single-row writes by primary key, except these: action -> sample body for a user
+ACTION_BODIES = {
+    ('LessonProgressViewSet', 'sync'): lambda user: {'items': [
+        {'lesson': lesson_id, 'completed': True} for lesson_id in _enrolled_lesson_ids(user)
+    ]},
+}
+AUDITED_STATEMENTS = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+NO_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+KEY_ORDER_SCAN = re.compile(r'^SELECT .+? FROM "(\w+)"(?:(?! WHERE ).)*? ORDER BY "\1"\."id"(?: ASC| DESC)?(?: LIMIT \d+)?$', re.S)
+
+
+@dataclass
+class AuditResult:
+    label: str
+    sql: str = ''
+    plan: str = ''
+    scans: list = field(default_factory=list)
+    error: str = ''
+
+
+def routed_viewsets():
+    """ViewSet classes with a list route, in URLconf order."""
+    seen = []
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns)
+            elif isinstance(pattern, URLPattern):
+                cls = getattr(pattern.callback, 'cls', None)
+                actions = getattr(pattern.callback, 'actions', None) or {}
+                if cls is not None and actions.get('get') == 'list' and cls not in seen:
+                    seen.append(cls)
+
+    walk(get_resolver().url_patterns)
+    return seen
+
+
+def routed_actions():
+    """
+    (viewset class, method, action, detail) of every routed action other than list
+    that the audit runs: reads, and writes with an entry in ACTION_BODIES.
+    """
+    seen = []
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns)
+            elif isinstance(pattern, URLPattern):
+                cls = getattr(pattern.callback, 'cls', None)
+                detail = '(?P<pk>' in str(pattern.pattern)
+                for method, action in (getattr(pattern.callback, 'actions', None) or {}).items():
+                    route = (cls, method, action, detail)
+                    readable = method == 'get' and action != 'list'
+                    if cls is not None and route not in seen and (readable or (cls.__name__, action) in ACTION_BODIES):
+                        seen.append(route)
+
+    walk(get_resolver().url_patterns)
+    return seen
+
+
+def _enrolled_lesson_ids(user, limit=20):
+    from apps.courses.models import Lesson
+
+    return list(
+        Lesson.objects.filter(module__course__enrollments__student=user)
+        .order_by('pk').values_list('pk', flat=True)[:limit]
+    )
+
+
+def audit_users():
+    """
+    (label, user) for each role, preferring users that actually have data to scope by;
+    user is None for a role no active user has.
+    """
+    from apps.users.models import User
+
+    users = [('anonymous', AnonymousUser())]
+    active = User.objects.filter(is_active=True).order_by('pk')
+    candidates = {
+        User.Role.STUDENT: active.filter(role=User.Role.STUDENT, enrollments__isnull=False),
+        User.Role.INSTRUCTOR: active.filter(role=User.Role.INSTRUCTOR, courses_created__isnull=False),
+        User.Role.ADMIN: active.filter(role=User.Role.ADMIN),
+    }
+    for role, queryset in candidates.items():
+        users.append((role.lower(), queryset.first() or active.filter(role=role).first()))
+    return users
+
+
+def list_queryset(viewset_class, user):
+    """
+    The queryset the viewset's list action would fetch for `user`: filtered, ordered and
+    sliced to a page. None if `user` may not list it.
+    """
+    from .pagination import KeysetPagination
+
+    request = Request(APIRequestFactory().get('/'))
+    request.user = user
+    view = viewset_class(action_map={'get': 'list'}, action='list', request=request, args=(), kwargs={}, format_kwarg=None)
+    try:
+        view.check_permissions(request)
+    except APIException:
+        return None
+    queryset = view.filter_queryset(view.get_queryset())
+    paginator = view.paginator
+    page_size = getattr(paginator, 'page_size', None) or 20
+    if isinstance(paginator, KeysetPagination):
+        field_name, descending = paginator.get_ordering(queryset, view)
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(f'{prefix}{field_name}', f'{prefix}pk')
+    return queryset[:page_size]
+
+
+def ordered_by_pk(queryset):
+    """True if `queryset` is ordered by its primary key alone, in either direction."""
+    ordering = queryset.query.order_by or queryset.query.get_meta().ordering
+    pk = queryset.model._meta.pk
+    names = {'pk', pk.name, pk.attname}
+    return bool(ordering) and all(isinstance(item, str) and item.lstrip('-') in names for item in ordering)
+
+
+def first_pk(viewset_class, user):
+    """Primary key of the first row `user` sees in the viewset's list, or None."""
+    try:
+        queryset = list_queryset(viewset_class, user)
+    except Exception:
+        return None
+    if queryset is None:
+        return None
+    return next(iter(queryset.values_list('pk', flat=True)[:1]), None)
+
+
+def action_statements(viewset_class, method, action, user, kwargs, data=None):
+    """(sql, params) of the statements one request to the action executes; its writes are rolled back."""
+    factory = APIRequestFactory()
+    request = factory.get('/') if data is None else getattr(factory, method)('/', data, format='json')
+    if user.is_authenticated:
+        force_authenticate(request, user=user)
+    view = viewset_class.as_view({method: action})
+    statements = []
+
+    def record(execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith(AUDITED_STATEMENTS):
+            statements.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with (
+        override_settings(CACHES=NO_CACHES, ALLOWED_HOSTS=['testserver']),
+        transaction.atomic(),
+        connection.execute_wrapper(record),
+    ):
+        try:
+            response = view(request, **kwargs)
+            if getattr(response, 'streaming', False):
+                for _ in response.streaming_content:
+                    pass
+        finally:
+            transaction.set_rollback(True)
+    return statements
+
+
+def explain_statement(sql, params):
+    """EXPLAIN output of a raw statement, one plan row per line (as QuerySet.explain formats it)."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+        return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+
+def key_order_table(sql):
+    """The table an unfiltered statement walks in primary key order (a page or an export), or None."""
+    match = KEY_ORDER_SCAN.match(sql)
+    return match.group(1) if match else None
+
+
+def find_scans(plan, table_rows, min_rows):
+    """Tables fully scanned by `plan` that hold at least `min_rows` rows."""
+    pattern = SCAN_PATTERNS.get(connection.vendor)
+    if pattern is None:
+        return []
+    scans = []
+    for line in plan.splitlines():
+        match = pattern.search(line.strip())
+        if match and 'USING' not in line:
+            table = match.group(1)
+            if table_rows(table) >= min_rows and table not in scans:
+                scans.append(table)
+    return scans
+
+
+def analyze_tables():
+    """Refresh planner statistics so the plans match what production would choose."""
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def audit_queries(min_rows=1000):
+    """AuditResult for every (viewset action, role), de-duplicated by SQL."""
+    tables = {model._meta.db_table: model for model in apps.get_models()}
+    row_counts = {}
+
+    def table_rows(table):
+        if table not in row_counts:
+            model = tables.get(table)
+            row_counts[table] = model._base_manager.count() if model is not None else 0
+        return row_counts[table]
+
+    results = []
+    seen_sql = set()
+    users = []
+    for role, user in audit_users():
+        if user is None:
+            results.append(AuditResult(f"every action as {role}", error=f"no active {role} user in the database"))
+        else:
+            users.append((role, user))
+    for viewset_class in routed_viewsets():
+        name = viewset_label(viewset_class)
+        for role, user in users:
+            label = f"{name} list as {role}"
+            try:
+                queryset = list_queryset(viewset_class, user)
+                if queryset is None:
+                    continue
+                sql = str(queryset.query)
+            except Exception as exc:  # a get_queryset that needs more than a plain list request
+                results.append(AuditResult(label, error=f"{type(exc).__name__}: {exc}"))
+                continue
+            if sql in seen_sql:
+                continue
+            seen_sql.add(sql)
+            plan = queryset.explain()
+            result = AuditResult(label, sql=sql, plan=plan)
+            # Without a filter, and ordered by nothing or the primary key, the scan stops after one page.
+            if queryset.query.where or (queryset.ordered and not ordered_by_pk(queryset)):
+                result.scans = find_scans(plan, table_rows, min_rows)
+            results.append(result)
+
+    for viewset_class, method, action, detail in routed_actions():
+        name = viewset_label(viewset_class)
+        for role, user in users:
+            label = f"{name} {action} as {role}"
+            kwargs = {}
+            if detail:
+                pk = first_pk(viewset_class, user)
+                if pk is None:
+                    continue  # nothing this role can open
+                kwargs['pk'] = pk
+            body = ACTION_BODIES.get((viewset_class.__name__, action))
+            if body and not user.is_authenticated:
+                continue  # writes need a user to build the sample body for
+            try:
+                statements = action_statements(
+                    viewset_class, method, action, user, kwargs, data=body(user) if body else None,
+                )
+            except Exception as exc:
+                results.append(AuditResult(label, error=f"{type(exc).__name__}: {exc}"))
+                continue
+            result = AuditResult(label)
+            sqls, plans = [], []
+            for sql, params in statements:
+                if sql in seen_sql:
+                    continue
+                seen_sql.add(sql)
+                plan = explain_statement(sql, params)
+                sqls.append(sql)
+                plans.append(plan)
+                walked = key_order_table(sql)
+                result.scans += [
+                    table for table in find_scans(plan, table_rows, min_rows)
+                    if table != walked and table not in result.scans
+                ]
+            if sqls:
+                result.sql, result.plan = ';\n'.join(sqls), '\n'.join(plans)
+                results.append(result)
+    return results
+
+
+def viewset_label(viewset_class):
+    return f"{viewset_class.__module__.split('.')[1]}.{viewset_class.__name__}"
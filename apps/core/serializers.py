@@ -2,6 +2,7 @@
 Learnova LMS - Base Serializers & Common Serializer Utilities
 """
 from rest_framework import serializers
+from .models import Job, Upload
 
 
 class BaseModelSerializer(serializers.ModelSerializer):
@@ -91,3 +92,84 @@ class PaginatedResponseSerializer(serializers.Serializer):
     next = serializers.URLField(allow_null=True)
     previous = serializers.URLField(allow_null=True)
     results = serializers.ListField()
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Read-only status of a background job."""
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'queue', 'task', 'kwargs', 'status', 'attempts', 'max_attempts',
+            'result', 'error', 'run_at', 'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
+
+
+class ImageDerivativesField(serializers.ReadOnlyField):
+    """
+    URLs of the pre-rendered variants of an image (see apps.core.images).
+    Usage: thumbnail_variants = ImageDerivativesField(source='thumbnail_derivatives')
+    """
+
+    def to_representation(self, value):
+        from .images import derivative_urls
+        return derivative_urls(value, self.context.get('request'))
+
+
+class UploadSerializer(serializers.ModelSerializer):
+    """Start (POST) or inspect a chunked upload; the bytes are sent with PUT (see apps.core.uploads)."""
+
+    sha256 = serializers.CharField(source='expected_sha256', required=False, allow_blank=True, max_length=64)
+
+    class Meta:
+        model = Upload
+        fields = ['id', 'filename', 'size', 'purpose', 'sha256', 'received', 'status', 'file', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'received', 'status', 'file', 'created_at', 'updated_at']
+
+
+class UploadAttachMixin:
+    """
+    Lets a serializer take a finalized chunked upload in place of a multipart file.
+    Declare `upload_id = serializers.UUIDField(write_only=True, required=False)` and set:
+        upload_field    model FileField the upload is attached to
+        upload_purpose  Upload.Purpose the upload must have been started with
+    """
+
+    upload_field = 'file'
+    upload_purpose = None
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        upload_id = attrs.get('upload_id')
+        if upload_id is None:
+            return attrs
+        if attrs.get(self.upload_field):
+            raise serializers.ValidationError({'upload_id': f"Send either {self.upload_field} or upload_id, not both."})
+        request = self.context.get('request')
+        if not Upload.objects.filter(
+            pk=upload_id, owner_id=getattr(request.user, 'pk', None),
+            purpose=self.upload_purpose, status=Upload.Status.COMPLETE,
+        ).exists():
+            raise serializers.ValidationError({'upload_id': "No finalized upload with this id."})
+        return attrs
+
+    def _attach_upload(self, validated_data):
+        upload_id = validated_data.pop('upload_id', None)
+        if upload_id is not None:
+            from .exceptions import UploadError
+            from .uploads import claim_upload
+
+            try:
+                validated_data[self.upload_field] = claim_upload(
+                    upload_id, self.context['request'].user, self.upload_purpose,
+                )
+            except UploadError as exc:
+                raise serializers.ValidationError({'upload_id': exc.message})
+        return validated_data
+
+    def create(self, validated_data):
+        return super().create(self._attach_upload(validated_data))
+
+    def update(self, instance, validated_data):
+        return super().update(instance, self._attach_upload(validated_data))
@@ -0,0 +1,302 @@
+"""
+Learnova LMS - Content-Addressed Media Storage
+A FileSystemStorage that keeps each distinct file once, named after its
+SHA-256 (blobs/ab/cd/abcd...ef.pdf). Saving content that is already stored
+only hashes it and returns the existing name, so the same PDF attached to
+fifty lessons or resubmitted by a whole class occupies the disk once.
+
+Every blob has a StoredBlob row whose refcount is raised by each save and
+lowered by each delete(). Rows that drop a file without deleting it (a
+deleted lesson, for instance) are caught by the garbage collector, which
+recounts the references from the file fields and image derivative records
+and removes blobs nothing points to any more:
+
+    python manage.py collect_media_garbage
+    python manage.py migrate_media_to_store     # fold files saved before the switch into the store
+
+Enabled with MEDIA_STORAGE=cas. Files saved earlier keep their names and are
+served as before until migrated.
+"""
+import hashlib
+import os
+import posixpath
+import tempfile
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage, default_storage, storages
+from django.db.models import Count, F, FileField
+from django.utils import timezone
+
+BLOB_DIR = 'blobs'
+READ_BUFFER_SIZE = 1024 * 1024
+# How often a save waits for the garbage collector to finish removing the same content
+GC_WAIT_ATTEMPTS = 50
+GC_WAIT_SECONDS = 0.1
+
+
+def blob_name(digest, extension):
+    return f"{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(BLOB_DIR + '/')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Stores each distinct content once under its hash; see the module docstring."""
+
+    def get_available_name(self, name, max_length=None):
+        # The stored name is derived from the content in _save, never from `name`.
+        return name
+
+    def _save(self, name, content):
+        extension = posixpath.splitext(name)[1].lower()[:16]
+        if hasattr(content, 'temporary_file_path'):
+            source, spooled = content.temporary_file_path(), False
+            digest, size = self._hash_path(source), os.path.getsize(source)
+        else:
+            source, digest, size = self._spool(content)
+            spooled = True
+
+        name = self._add_reference(digest, blob_name(digest, extension), size)
+        full_path = self.path(name)
+        try:
+            if os.path.exists(full_path):
+                return name  # duplicate content: nothing to write
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            if spooled:
+                os.replace(source, full_path)
+            else:
+                try:
+                    file_move_safe(source, full_path)
+                except FileExistsError:
+                    return name  # stored concurrently by another save of the same content
+            if self.file_permissions_mode is not None:
+                os.chmod(full_path, self.file_permissions_mode)
+        finally:
+            if spooled and os.path.exists(source):
+                os.remove(source)
+        return name
+
+    def _spool(self, content):
+        """Copy `content` to a temp file next to the blobs while hashing it; returns (path, digest, size)."""
+        spool_dir = self.path(f"{BLOB_DIR}/tmp")
+        os.makedirs(spool_dir, exist_ok=True)
+        hasher = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=spool_dir, delete=False) as spool:
+            try:
+                for chunk in content.chunks(READ_BUFFER_SIZE):
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    hasher.update(chunk)
+                    spool.write(chunk)
+                    size += len(chunk)
+            except BaseException:
+                spool.close()
+                os.remove(spool.name)
+                raise
+        return spool.name, hasher.hexdigest(), size
+
+    @staticmethod
+    def _hash_path(path):
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(READ_BUFFER_SIZE), b''):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _add_reference(digest, name, size):
+        """Count one more reference to `digest`, creating its row if needed; returns the blob's name."""
+        from .models import StoredBlob
+
+        for _ in range(GC_WAIT_ATTEMPTS):
+            StoredBlob.objects.bulk_create([StoredBlob(sha256=digest, name=name, size=size)], ignore_conflicts=True)
+            # refcount -1 marks a blob the garbage collector is deleting; wait for it to go and store it anew.
+            if StoredBlob.objects.filter(sha256=digest, refcount__gte=0).update(
+                refcount=F('refcount') + 1, last_saved_at=timezone.now(),
+            ):
+                return StoredBlob.objects.filter(sha256=digest).values_list('name', flat=True).get()
+            time.sleep(GC_WAIT_SECONDS)
+        raise OSError(f"Blob {digest} is still being garbage collected.")
+
+    def delete(self, name):
+        from .models import StoredBlob
+
+        if not is_blob_name(name):
+            return super().delete(name)
+        # Other rows may share the blob; the garbage collector removes it once nothing references it.
+        StoredBlob.objects.filter(name=name, refcount__gt=0).update(refcount=F('refcount') - 1)
+
+    def remove_blob(self, name):
+        """Delete the file itself, whatever references it (garbage collector and migration only)."""
+        super().delete(name)
+
+
+def content_addressed_storage():
+    """The default storage if it is content-addressed, else None."""
+    storage = storages['default']
+    return storage if isinstance(storage, ContentAddressedStorage) else None
+
+
+def file_fields():
+    """(model, field name) of every file field stored in the default storage."""
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, FileField) and field.storage is default_storage:
+                yield model, field.attname
+
+
+def count_references():
+    """{blob name: number of rows referencing it} across file fields and image derivative records."""
+    from .images import IMAGE_DERIVATIVES, derivative_names
+
+    counts = Counter()
+    for model, field in file_fields():
+        rows = (
+            model._default_manager.filter(**{f'{field}__startswith': BLOB_DIR + '/'})
+            .values_list(field).annotate(n=Count('pk')).order_by()
+        )
+        for name, n in rows.iterator():
+            counts[name] += n
+    for label, (_, derivatives_field, _, _) in IMAGE_DERIVATIVES.items():
+        records = apps.get_model(label)._default_manager.exclude(**{derivatives_field: {}})
+        for derivatives in records.values_list(derivatives_field, flat=True).iterator(chunk_size=2000):
+            counts.update(name for name in derivative_names(derivatives) if is_blob_name(name))
+    return counts
+
+
+def recount_references(cutoff=None):
+    """
+    Replace the refcounts of blobs last saved before `cutoff` (all blobs if None) with
+    the number of references actually stored. Returns the number of corrected rows.
+    """
+    from .models import StoredBlob
+
+    counts = count_references()
+    blobs = StoredBlob.objects.filter(refcount__gte=0)
+    if cutoff is not None:
+        blobs = blobs.filter(last_saved_at__lt=cutoff)
+    corrected = 0
+    for pk, name, refcount in blobs.values_list('pk', 'name', 'refcount').iterator(chunk_size=2000):
+        actual = counts.get(name, 0)
+        if actual != refcount:
+            # Conditional, so a save that raced the scan keeps its reference.
+            stale = StoredBlob.objects.filter(pk=pk, refcount=refcount, refcount__gte=0)
+            if cutoff is not None:
+                stale = stale.filter(last_saved_at__lt=cutoff)
+            corrected += stale.update(refcount=actual)
+    return corrected
+
+
+def collect_garbage(grace=None, dry_run=False):
+    """
+    Delete blobs no row references. Blobs saved within `grace` (MEDIA_GC_GRACE seconds
+    by default) are kept: their rows may not be committed yet. Also removes files under
+    blobs/ that have no StoredBlob row (saves whose transaction rolled back).
+    Returns (blobs removed, bytes freed).
+    """
+    from .models import StoredBlob
+
+    storage = content_addressed_storage()
+    if storage is None:
+        return 0, 0
+    grace = timedelta(seconds=settings.MEDIA_GC_GRACE) if grace is None else grace
+    cutoff = timezone.now() - grace
+    removed = freed = 0
+    if dry_run:
+        counts = count_references()
+        old = StoredBlob.objects.filter(last_saved_at__lt=cutoff, refcount__gte=0)
+        for name, size in old.values_list('name', 'size').iterator(chunk_size=2000):
+            if not counts.get(name):
+                removed, freed = removed + 1, freed + size
+    else:
+        recount_references(cutoff)
+    unreferenced = StoredBlob.objects.filter(refcount=0, last_saved_at__lt=cutoff) if not dry_run else StoredBlob.objects.none()
+    for pk, name, size in unreferenced.values_list('pk', 'name', 'size').iterator(chunk_size=2000):
+        if not StoredBlob.objects.filter(pk=pk, refcount=0, last_saved_at__lt=cutoff).update(refcount=-1):
+            continue  # saved again since the recount
+        storage.remove_blob(name)
+        StoredBlob.objects.filter(pk=pk).delete()
+        removed, freed = removed + 1, freed + size
+
+    known = set(StoredBlob.objects.values_list('name', flat=True))
+    root = storage.path(BLOB_DIR)
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            path = os.path.join(directory, filename)
+            name = posixpath.join(BLOB_DIR, os.path.relpath(path, root).replace(os.sep, '/'))
+            if name in known or os.path.getmtime(path) >= cutoff.timestamp():
+                continue
+            size = os.path.getsize(path)
+            if not dry_run:
+                os.remove(path)
+            removed, freed = removed + 1, freed + size
+    return removed, freed
+
+
+def migrate_legacy_files(keep_originals=False, log=None):
+    """
+    Move every file saved before the store was enabled into it and point the rows at the
+    blob names, then recount all references. Meant to run once, with writers stopped.
+    Returns (files migrated, files already stored as an identical blob, missing files).
+    """
+    from .images import IMAGE_DERIVATIVES, derivative_names, rename_derivatives
+    from .models import StoredBlob
+
+    storage = content_addressed_storage()
+    if storage is None:
+        raise ValueError("The default storage is not content-addressed (set MEDIA_STORAGE=cas).")
+    renamed = {}
+    missing = set()
+    known_digests = set(StoredBlob.objects.values_list('sha256', flat=True))
+
+    def to_blob(name):
+        if not name or is_blob_name(name) or name in missing:
+            return name
+        if name not in renamed:
+            if not storage.exists(name):
+                missing.add(name)
+                if log:
+                    log(f"  missing: {name}")
+                return name
+            with storage.open(name) as f:
+                renamed[name] = storage.save(name, f)
+        return renamed[name]
+
+    for model, field in file_fields():
+        names = (
+            model._default_manager.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+            .exclude(**{f'{field}__startswith': BLOB_DIR + '/'}).values_list(field, flat=True).distinct()
+        )
+        for name in list(names.iterator()):
+            new_name = to_blob(name)
+            if new_name != name:
+                model._default_manager.filter(**{field: name}).update(**{field: new_name})
+        if log:
+            log(f"  {model._meta.label}.{field}: done")
+
+    for label, (_, derivatives_field, _, _) in IMAGE_DERIVATIVES.items():
+        model = apps.get_model(label)
+        rows = model._default_manager.exclude(**{derivatives_field: {}}).values_list('pk', derivatives_field)
+        for pk, derivatives in list(rows.iterator(chunk_size=2000)):
+            names = [derivatives.get('source', '')] + derivative_names(derivatives)
+            if all(is_blob_name(name) or not name for name in names):
+                continue
+            model._default_manager.filter(pk=pk).update(**{derivatives_field: rename_derivatives(derivatives, to_blob)})
+
+    duplicates = 0
+    for old_name, new_name in renamed.items():
+        digest = posixpath.basename(new_name).split('.')[0]
+        duplicates += digest in known_digests
+        known_digests.add(digest)
+        if not keep_originals:
+            storage.remove_blob(old_name)
+    recount_references()
+    return len(renamed), duplicates, len(missing)
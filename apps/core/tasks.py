@@ -0,0 +1,26 @@
+"""
+Background jobs of the core app (see apps.core.jobs)
+"""
+from .jobs import task
+
+
+@task('core.image_derivatives', queue='images')
+def image_derivatives_job(model, pk, force=False):
+    from .images import refresh_derivatives
+
+    return {'changed': refresh_derivatives(model, pk, force=force)}
+
+
+@task('core.purge_stale_uploads')
+def purge_stale_uploads_job():
+    from .uploads import purge_stale_uploads
+
+    return {'purged': purge_stale_uploads()}
+
+
+@task('core.collect_media_garbage')
+def collect_media_garbage_job():
+    from .storage import collect_garbage
+
+    removed, freed = collect_garbage()
+    return {'removed': removed, 'freed': freed}
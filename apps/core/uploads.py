@@ -0,0 +1,235 @@
+"""
+Learnova LMS - Chunked, Resumable Uploads
+Large files (video lessons, project zips) are sent in pieces instead of one
+multipart POST:
+
+    POST   /api/v1/uploads/              {filename, size, purpose, sha256?} -> {id, received: 0}
+    PUT    /api/v1/uploads/<id>/         raw bytes, header Upload-Offset: <received>
+    GET    /api/v1/uploads/<id>/         -> {received, ...}   (resume after a dropped connection)
+    POST   /api/v1/uploads/<id>/finalize/
+    DELETE /api/v1/uploads/<id>/
+
+Chunks are streamed from the request into a temporary file, so a worker never
+holds more than one read buffer, and are copied into the upload's part file
+once their offset has been claimed. The SHA-256 is computed as the
+chunks arrive; if a chunk was handled by another process the digest is
+recomputed from disk at finalize. The finished file is moved into the
+storage directory of its purpose and can then be attached by passing the
+upload id to the submission or lesson serializer.
+"""
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+from .exceptions import UploadError, UploadOffsetError
+from .models import Upload
+
+READ_BUFFER_SIZE = 1024 * 1024
+# Storage directory per purpose (the upload_to of the field the file ends up in)
+PURPOSE_DIRS = {
+    Upload.Purpose.SUBMISSION: 'submissions',
+    Upload.Purpose.LESSON: 'lessons',
+}
+HASHER_CACHE_SIZE = 256
+
+# upload id -> (sha256 object, bytes hashed); per process, best effort
+_hashers = OrderedDict()
+_hashers_lock = threading.Lock()
+
+
+def temp_dir():
+    path = getattr(settings, 'UPLOAD_TEMP_DIR', None) or os.path.join(settings.MEDIA_ROOT, 'uploads-tmp')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def temp_path(upload):
+    return os.path.join(temp_dir(), f"{upload.pk}.part")
+
+
+def _take_hasher(upload_id, offset):
+    with _hashers_lock:
+        entry = _hashers.pop(upload_id, None)
+    if entry is not None and entry[1] == offset:
+        return entry[0]
+    if offset == 0:
+        return hashlib.sha256()
+    return None
+
+
+def _keep_hasher(upload_id, hasher, offset):
+    with _hashers_lock:
+        _hashers[upload_id] = (hasher, offset)
+        while len(_hashers) > HASHER_CACHE_SIZE:
+            _hashers.popitem(last=False)
+
+
+def start_upload(owner, filename, size, purpose, expected_sha256=''):
+    max_size = settings.UPLOAD_MAX_SIZE
+    if size > max_size:
+        raise UploadError(f"File size must not exceed {max_size} bytes.", field='size')
+    upload = Upload.objects.create(
+        owner=owner,
+        filename=get_valid_filename(os.path.basename(filename)) or 'upload',
+        size=size,
+        purpose=purpose,
+        expected_sha256=(expected_sha256 or '').lower(),
+    )
+    open(temp_path(upload), 'wb').close()
+    return upload
+
+
+def append_chunk(upload, offset, stream, length=None):
+    """
+    Append the bytes of `stream` at `offset`, which must equal upload.received.
+    `length` (the request's Content-Length) bounds the read when known.
+    Returns the new offset.
+    """
+    if upload.status != Upload.Status.UPLOADING:
+        raise UploadError("Upload is already finalized.")
+    if offset != upload.received:
+        raise UploadOffsetError(f"Expected offset {upload.received}.", offset=upload.received)
+    max_chunk = settings.UPLOAD_CHUNK_MAX_SIZE
+    if length is not None and length > max_chunk:
+        raise UploadError(f"Chunks must not exceed {max_chunk} bytes.")
+
+    remaining = upload.size - offset
+    hasher = _take_hasher(upload.pk, offset)
+    written = 0
+    # The chunk is staged in its own file and only copied into the part file once its
+    # offset is claimed, so a duplicated or racing request never touches claimed bytes.
+    chunk_path = f"{temp_path(upload)}.{offset}.{uuid.uuid4().hex}"
+    try:
+        with open(chunk_path, 'wb') as chunk:
+            while True:
+                to_read = READ_BUFFER_SIZE if length is None else min(READ_BUFFER_SIZE, length - written)
+                if to_read <= 0:
+                    break
+                data = stream.read(to_read)
+                if not data:
+                    break
+                written += len(data)
+                if written > remaining or written > max_chunk:
+                    raise UploadError("Chunk exceeds the declared upload size.")
+                chunk.write(data)
+                if hasher is not None:
+                    hasher.update(data)
+
+        new_offset = offset + written
+        # Conditional on the offset we started from, so a duplicated request cannot count its bytes twice.
+        claimed = Upload.objects.filter(pk=upload.pk, received=offset, status=Upload.Status.UPLOADING)
+        if not claimed.update(received=new_offset, updated_at=timezone.now()):
+            upload.refresh_from_db(fields=['received'])
+            raise UploadOffsetError(f"Expected offset {upload.received}.", offset=upload.received)
+        try:
+            _copy_into(chunk_path, temp_path(upload), offset)
+        except OSError:
+            # Give the offset back so the client can resend the chunk.
+            Upload.objects.filter(pk=upload.pk, received=new_offset).update(received=offset, updated_at=timezone.now())
+            raise
+    finally:
+        if os.path.exists(chunk_path):
+            os.remove(chunk_path)
+
+    if hasher is not None:
+        _keep_hasher(upload.pk, hasher, new_offset)
+    upload.received = new_offset
+    return new_offset
+
+
+def _copy_into(source, target, offset):
+    """Write the bytes of `source` into `target` starting at `offset`."""
+    with open(source, 'rb') as chunk, open(target, 'r+b') as part:
+        part.seek(offset)
+        for block in iter(lambda: chunk.read(READ_BUFFER_SIZE), b''):
+            part.write(block)
+
+
+def _file_sha256(path):
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as part:
+        for block in iter(lambda: part.read(READ_BUFFER_SIZE), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+class _PartFile(File):
+    """Exposes temporary_file_path() so FileSystemStorage moves the file instead of copying it."""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def finalize_upload(upload):
+    """Verify size and checksum and move the assembled file into storage."""
+    if upload.status != Upload.Status.UPLOADING:
+        raise UploadError("Upload is already finalized.")
+    if upload.received != upload.size:
+        raise UploadError(f"Upload incomplete: {upload.received} of {upload.size} bytes received.")
+
+    path = temp_path(upload)
+    if os.path.getsize(path) != upload.size:  # a worker died after claiming a chunk, before writing it out
+        raise UploadError("Upload data is incomplete; the upload must be restarted.")
+    hasher = _take_hasher(upload.pk, upload.size)
+    digest = hasher.hexdigest() if hasher is not None else _file_sha256(path)
+    if upload.expected_sha256 and digest != upload.expected_sha256:
+        raise UploadError("Checksum mismatch; the upload must be restarted.", field='sha256')
+
+    with open(path, 'rb') as part:
+        name = default_storage.save(f"{PURPOSE_DIRS[upload.purpose]}/{upload.filename}", _PartFile(part))
+    if os.path.exists(path):
+        os.remove(path)  # non-filesystem storages copy instead of moving
+    upload.sha256 = digest
+    upload.file.name = name
+    upload.status = Upload.Status.COMPLETE
+    upload.save(update_fields=['sha256', 'file', 'status', 'updated_at'])
+    return upload
+
+
+def abort_upload(upload):
+    with _hashers_lock:
+        _hashers.pop(upload.pk, None)
+    path = temp_path(upload)
+    if os.path.exists(path):
+        os.remove(path)
+    upload.delete()
+
+
+def claim_upload(upload_id, owner, purpose):
+    """
+    Mark a finalized upload as attached and return its storage name. Each upload
+    can be attached once. Raises UploadError if it is unknown, unfinished or not the owner's.
+    """
+    upload = Upload.objects.filter(pk=upload_id, owner=owner, purpose=purpose).first()
+    if upload is None:
+        raise UploadError("Upload not found.", field='upload_id')
+    if not Upload.objects.filter(pk=upload.pk, status=Upload.Status.COMPLETE).update(status=Upload.Status.ATTACHED):
+        raise UploadError("Upload is not finalized or was already used.", field='upload_id')
+    return upload.file.name
+
+
+def purge_stale_uploads(max_age=None):
+    """
+    Delete uploads idle for longer than UPLOAD_EXPIRY: unfinished ones with their partial
+    file, finalized but never attached ones with their stored file, and the rows of
+    attached ones (the file now belongs to the submission or lesson).
+    """
+    max_age = max_age or timedelta(seconds=settings.UPLOAD_EXPIRY)
+    stale = Upload.objects.filter(updated_at__lt=timezone.now() - max_age)
+    count = 0
+    for upload in stale.filter(status=Upload.Status.UPLOADING).iterator():
+        abort_upload(upload)
+        count += 1
+    for upload in stale.filter(status=Upload.Status.COMPLETE).iterator():
+        if Upload.objects.filter(pk=upload.pk, status=Upload.Status.COMPLETE).delete()[0]:
+            default_storage.delete(upload.file.name)
+            count += 1
+    return count + stale.filter(status=Upload.Status.ATTACHED).delete()[0]
@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import JobViewSet, UploadViewSet
+
+router = DefaultRouter()
+router.register('jobs', JobViewSet, basename='job')
+router.register('uploads', UploadViewSet, basename='upload')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
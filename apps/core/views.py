@@ -0,0 +1,109 @@
+from io import BytesIO
+
+from django.conf import settings
+from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import BaseParser
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from . import uploads
+from .exceptions import UploadError, UploadOffsetError
+from .models import Job, Upload
+from .serializers import JobSerializer, UploadSerializer
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Background job status - users poll the jobs they started, Admin sees all."""
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        if getattr(self.request.user, 'is_admin', False):
+            return Job.objects.all()
+        return Job.objects.filter(created_by=self.request.user)
+
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        """Cancel a job that has not started yet."""
+        job = self.get_object()
+        if not Job.objects.filter(pk=job.pk, status=Job.Status.QUEUED).update(status=Job.Status.CANCELLED):
+            return Response({'error': 'Only queued jobs can be cancelled'}, status=status.HTTP_400_BAD_REQUEST)
+        job.refresh_from_db()
+        return Response(JobSerializer(job).data)
+
+
+class ChunkParser(BaseParser):
+    """Accepts any body for upload chunks; the view streams request.stream itself."""
+    media_type = '*/*'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return {}
+
+
+class UploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.ListModelMixin,
+                    mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """
+    Chunked, resumable uploads (see apps.core.uploads).
+    PUT /uploads/<id>/ appends the raw request body at header Upload-Offset.
+    """
+    serializer_class = UploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Upload.objects.filter(owner=self.request.user)
+
+    def get_parsers(self):
+        if self.request is not None and self.request.method == 'PUT':
+            return [ChunkParser()]
+        return super().get_parsers()
+
+    def perform_create(self, serializer):
+        data = serializer.validated_data
+        serializer.instance = uploads.start_upload(
+            self.request.user, data['filename'], data['size'], data['purpose'], data.get('expected_sha256', ''),
+        )
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            self.perform_create(serializer)
+        except UploadError as exc:
+            return Response({'error': exc.message}, status=status.HTTP_400_BAD_REQUEST)
+        data = dict(serializer.data, chunk_size=settings.UPLOAD_CHUNK_MAX_SIZE)
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def update(self, request, *args, **kwargs):
+        """Append one chunk. PUT raw bytes with header Upload-Offset: <bytes received so far>."""
+        upload = self.get_object()
+        try:
+            offset = int(request.headers['Upload-Offset'])
+        except (KeyError, ValueError):
+            return Response({'error': 'Upload-Offset header is required'}, status=status.HTTP_400_BAD_REQUEST)
+        length = request.META.get('CONTENT_LENGTH')
+        try:
+            received = uploads.append_chunk(upload, offset, request.stream or BytesIO(), int(length) if length else None)
+        except UploadOffsetError as exc:
+            return Response(
+                {'error': exc.message, 'received': exc.offset},
+                status=status.HTTP_409_CONFLICT, headers={'Upload-Offset': str(exc.offset)},
+            )
+        except UploadError as exc:
+            return Response({'error': exc.message}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'id': str(upload.pk), 'received': received}, headers={'Upload-Offset': str(received)})
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        """Verify the assembled file and move it into storage; the id can then be attached once."""
+        upload = self.get_object()
+        try:
+            uploads.finalize_upload(upload)
+        except UploadError as exc:
+            return Response({'error': exc.message}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(UploadSerializer(upload).data)
+
+    def perform_destroy(self, instance):
+        if instance.status != Upload.Status.UPLOADING:
+            instance.delete()  # the stored file belongs to whatever it was attached to
+            return
+        uploads.abort_upload(instance)
@@ -0,0 +1,20 @@
+"""
+Learnova LMS - Job Worker Entry Points
+Functions handed to run_worker's process pool. Spawned children unpickle them
+before Django is set up, so this module must not import models at import time.
+"""
+
+
+def setup_process():
+    """Pool initializer: set Django up once per child and load the task modules."""
+    import django
+    from django.utils.module_loading import autodiscover_modules
+
+    django.setup()
+    autodiscover_modules('tasks')
+
+
+def execute(job_id):
+    from .jobs import run_job
+
+    return run_job(job_id)
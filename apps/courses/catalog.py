@@ -0,0 +1,46 @@
+"""
+Public course catalog cache for Learnova LMS
+Catalog list responses are cached per normalized query (filters + page) under
+a catalog version that is bumped whenever a Course or Category changes.
+"""
+import hashlib
+
+from apps.core.cache import bump_version, versioned_key
+
+CATALOG_NAMESPACE = 'course-catalog'
+
+
+def is_catalog_request(request):
+    """Anonymous visitors and students all see the same published-only catalog."""
+    user = request.user
+    return not user.is_authenticated or getattr(user, 'is_student', False)
+
+
+def normalize_query(query_params):
+    """Stable representation of the query string: sorted keys/values, blanks dropped."""
+    items = []
+    for key in sorted(query_params.keys()):
+        values = sorted(v for v in query_params.getlist(key) if v != '')
+        if values:
+            items.append(f"{key}={','.join(values)}")
+    return '&'.join(items)
+
+
+def catalog_cache_key(request):
+    """
+    Cache key for a catalog request. Compute it once, before querying, so a
+    version bump racing with the query never stores stale rows under the new version.
+    """
+    # The host is part of the key because paginated responses carry absolute URLs.
+    raw = f"{request.get_host()}|{request.path}|{normalize_query(request.query_params)}"
+    digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return versioned_key(CATALOG_NAMESPACE, 'list', digest)
+
+
+def invalidate_catalog():
+    bump_version(CATALOG_NAMESPACE)
+
+
+def invalidate_course_images(course_id):
+    """Image derivatives hook: catalog pages embed the thumbnail variants."""
+    invalidate_catalog()
@@ -1,16 +1,43 @@
 """
 Management command to seed categories, courses, and users (admin, instructors, students).
 Usage: python manage.py seed_data
+       python manage.py seed_data --students 200000 --courses 2000 [--progress-density 0.4] [--seed N] [--workers N]
+
+With --students / --courses it generates a synthetic dataset of that size instead
+(see apps/courses/synthetic.py): students log in as load<seed>_student<i> / student123,
+instructors as load<seed>_instructor<i> / instructor123, and one admin as
+load<seed>_admin / admin123.
 """
-from django.core.management.base import BaseCommand
+import os
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from apps.users.models import User, UserProfile
+from apps.courses.catalog import invalidate_catalog
 from apps.courses.models import Category, Course
+from apps.courses.synthetic import Scale, generate, primary_key_bases
 
 
 class Command(BaseCommand):
     help = "Create sample categories, courses, and users (admin, instructors, students)"
 
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, help="Generate this many students (scale mode)")
+        parser.add_argument('--courses', type=int, help="Generate this many courses (scale mode, default 100)")
+        parser.add_argument('--instructors', type=int, help="Instructors to spread the courses over (default courses / 5)")
+        parser.add_argument('--enrollments-per-student', type=int, default=5)
+        parser.add_argument('--progress-density', type=float, default=0.4,
+                            help="Share of an enrolled course's lessons with a progress row (default 0.4)")
+        parser.add_argument('--seed', type=int, default=0, help="Same seed and sizes give the same data")
+        parser.add_argument('--workers', type=int, help="Generator processes (default CPU count)")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per bulk_create / COPY batch")
+
     def handle(self, *args, **options):
+        if options['students'] is not None or options['courses'] is not None:
+            return self.seed_scale(options)
+
         self.stdout.write("Seeding data...")
 
         # Create admin
@@ -139,3 +166,47 @@ class Command(BaseCommand):
                 self.stdout.write(f"  Created course: {course.title}")
 
         self.stdout.write(self.style.SUCCESS("Seed data completed."))
+
+    def seed_scale(self, options):
+        from apps.analytics.counters import rebuild_counters
+        from apps.enrollments.models import Enrollment
+        from apps.enrollments.progress import recompute_lesson_totals, recompute_progress
+
+        courses = options['courses'] if options['courses'] is not None else 100
+        students = options['students'] if options['students'] is not None else 1000
+        if courses < 1 or students < 0 or not 0 <= options['progress_density'] <= 1:
+            raise CommandError("Need at least one course, a non-negative student count and a density in [0, 1].")
+        scale = Scale(
+            students=students,
+            courses=courses,
+            instructors=options['instructors'] or max(1, courses // 5),
+            enrollments_per_student=options['enrollments_per_student'],
+            progress_density=options['progress_density'],
+            seed=options['seed'],
+        )
+        if User.objects.filter(username__startswith=f"{scale.prefix}_").exists():
+            raise CommandError(f"Seed {scale.seed} was already loaded into this database; pass another --seed.")
+        # Hashing is deliberately slow: once per role, shared by every generated user.
+        scale.student_password = make_password('student123')
+        scale.instructor_password = make_password('instructor123')
+        scale.admin_password = make_password('admin123')
+
+        self.stdout.write(
+            f"Generating {scale.students} students, {scale.instructors} instructors and {scale.courses} courses..."
+        )
+        started = time.monotonic()
+        with transaction.atomic():
+            scale.bases = primary_key_bases()
+            counts = generate(
+                scale, workers=options['workers'] or os.cpu_count() or 1, batch_size=options['batch_size'],
+                log=self.stdout.write,
+            )
+            # Signals did not run for the bulk rows: rebuild the counters they maintain.
+            recompute_lesson_totals(Course.objects.filter(pk__gt=scale.bases['courses.Course']))
+            recompute_progress(Enrollment.objects.filter(pk__gt=scale.bases['enrollments.Enrollment']))
+            transaction.on_commit(invalidate_catalog)
+        rebuild_counters()
+
+        for label, count in counts.items():
+            self.stdout.write(f"  {label}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"Synthetic data loaded in {time.monotonic() - started:.1f}s."))
@@ -48,9 +48,12 @@ class Course(models.Model):
     audience = models.CharField(max_length=20, choices=Audience.choices, default=Audience.STUDENT)
     class_range = models.CharField(max_length=50, blank=True, help_text="e.g. LKG - 8, Class 3 - 12")
     thumbnail = models.ImageField(upload_to='courses/', blank=True, null=True)
+    # Resized variants of the thumbnail, see apps.core.images
+    thumbnail_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     duration_hours = models.PositiveIntegerField(default=0)
     level = models.CharField(max_length=50, default='Beginner')
     max_students = models.PositiveIntegerField(null=True, blank=True)
+    lesson_count = models.PositiveIntegerField(default=0, editable=False, help_text="Maintained by the progress engine")
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -58,6 +61,12 @@ class Course(models.Model):
     class Meta:
         db_table = 'courses'
         ordering = ['-created_at']
+        indexes = [
+            # Catalog (published courses, newest first) and the unfiltered staff list
+            models.Index(fields=['status', '-created_at'], name='course_status_created_idx'),
+            models.Index(fields=['-created_at'], name='course_created_idx'),
+            models.Index(fields=['instructor', 'status'], name='course_instructor_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -105,4 +114,7 @@ class Lesson(models.Model):
     class Meta:
         db_table = 'course_lessons'
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['module', 'order'], name='lesson_module_order_idx'),
+        ]
 
@@ -0,0 +1,44 @@
+"""
+Course outline engine for Learnova LMS
+Builds the module/lesson tree of a course in a fixed number of queries and
+caches the serialized tree per course, keyed by an outline version.
+"""
+from django.core.cache import cache
+from apps.core.cache import bump_version, versioned_key
+
+OUTLINE_NAMESPACE = 'course-outline'
+OUTLINE_CACHE_TIMEOUT = 60 * 60 * 24
+# Part of the cache key: bump when the serialized shape changes so outlines cached in the old shape are not served
+OUTLINE_FORMAT = 2
+
+
+def outline_cache_key(course_id):
+    return versioned_key(OUTLINE_NAMESPACE, 'tree', OUTLINE_FORMAT, scope=course_id)
+
+
+def build_course_outline(course_id):
+    """
+    Serialize every module of a course with its lessons.
+    Always two queries (modules + prefetched lessons), regardless of course size.
+    """
+    from .models import Module
+    from .serializers import ModuleSerializer
+
+    modules = Module.objects.filter(course_id=course_id).prefetch_related('lessons')
+    return [dict(module) for module in ModuleSerializer(modules, many=True).data]
+
+
+def get_course_outline(course_id):
+    """Return the cached outline for a course, building it on a miss."""
+    key = outline_cache_key(course_id)
+    outline = cache.get(key)
+    if outline is None:
+        outline = build_course_outline(course_id)
+        cache.set(key, outline, OUTLINE_CACHE_TIMEOUT)
+    return outline
+
+
+def invalidate_course_outline(course_id):
+    """Drop the cached outline of a course (called when a module/lesson changes)."""
+    if course_id is not None:
+        bump_version(OUTLINE_NAMESPACE, scope=course_id)
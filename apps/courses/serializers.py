@@ -3,8 +3,10 @@ Course serializers for Learnova LMS
 """
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from apps.core.serializers import BaseModelSerializer
+from apps.core.models import Upload
+from apps.core.serializers import BaseModelSerializer, ImageDerivativesField, UploadAttachMixin
 from .models import Category, Course, Module, Lesson
+from .outline import get_course_outline
 
 User = get_user_model()
 
@@ -15,10 +17,24 @@ class CategorySerializer(BaseModelSerializer):
         fields = ['id', 'name', 'slug', 'description', 'class_range', 'parent', 'created_at', 'updated_at']
 
 
-class LessonSerializer(BaseModelSerializer):
+class LessonSerializer(UploadAttachMixin, BaseModelSerializer):
+    # A finalized chunked upload (POST /api/v1/uploads/) used as the lesson's content file
+    upload_id = serializers.UUIDField(write_only=True, required=False)
+    upload_field = 'content_file'
+    upload_purpose = Upload.Purpose.LESSON
+    # The file itself is only served by the access-checked lessons/<id>/content/ action;
+    # the outline is public, so it must not carry the storage path.
+    has_content_file = serializers.SerializerMethodField()
+
     class Meta:
         model = Lesson
-        fields = ['id', 'title', 'content_type', 'content_url', 'duration_minutes', 'order', 'created_at', 'updated_at']
+        fields = [
+            'id', 'title', 'content_type', 'content_url', 'has_content_file', 'upload_id',
+            'duration_minutes', 'order', 'created_at', 'updated_at',
+        ]
+
+    def get_has_content_file(self, obj):
+        return bool(obj.content_file)
 
 
 class ModuleSerializer(BaseModelSerializer):
@@ -30,9 +46,10 @@ class ModuleSerializer(BaseModelSerializer):
 
 
 class CourseSerializer(BaseModelSerializer):
-    modules = ModuleSerializer(many=True, read_only=True)
+    modules = serializers.SerializerMethodField()
     category_name = serializers.CharField(source='category.name', read_only=True)
     instructor_name = serializers.CharField(source='instructor.get_full_name', read_only=True)
+    thumbnail_variants = ImageDerivativesField(source='thumbnail_derivatives')
     instructor = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(),
         required=False,
@@ -44,16 +61,20 @@ class CourseSerializer(BaseModelSerializer):
         fields = [
             'id', 'title', 'slug', 'description', 'category', 'category_name',
             'instructor', 'instructor_name', 'status', 'audience', 'class_range',
-            'thumbnail', 'duration_hours', 'level', 'max_students',
+            'thumbnail', 'thumbnail_variants', 'duration_hours', 'level', 'max_students',
             'modules', 'created_at', 'updated_at'
         ]
 
+    def get_modules(self, obj):
+        """Module/lesson tree, served from the course outline cache."""
+        return get_course_outline(obj.pk)
 
 
 class CourseListSerializer(BaseModelSerializer):
     category_name = serializers.CharField(source='category.name', read_only=True)
     instructor_name = serializers.CharField(source='instructor.get_full_name', read_only=True)
+    thumbnail_variants = ImageDerivativesField(source='thumbnail_derivatives')
 
     class Meta:
         model = Course
-        fields = ['id', 'title', 'slug', 'category_name', 'instructor_name', 'status', 'audience', 'class_range', 'thumbnail', 'duration_hours', 'level']
+        fields = ['id', 'title', 'slug', 'category_name', 'instructor_name', 'status', 'audience', 'class_range', 'thumbnail', 'thumbnail_variants', 'duration_hours', 'level']
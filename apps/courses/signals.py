@@ -0,0 +1,91 @@
+"""
+Course signal handlers for Learnova LMS
+Keep the cached catalog and course outlines in sync with writes.
+"""
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from apps.core.tasks import image_derivatives_job
+from apps.users.models import User
+from .models import Category, Course, Module, Lesson
+from .catalog import invalidate_catalog
+from .outline import invalidate_course_outline
+
+
+def _course_id_for_module(module_id):
+    return Module.objects.filter(pk=module_id).values_list('course_id', flat=True).first()
+
+
+@receiver(post_init, sender=Module)
+def remember_module_course(sender, instance, **kwargs):
+    # Snapshot the loaded course so a module moved to another course invalidates both.
+    instance._outline_course_id = instance.__dict__.get('course_id')
+
+
+@receiver(post_init, sender=Lesson)
+def remember_lesson_module(sender, instance, **kwargs):
+    instance._outline_module_id = instance.__dict__.get('module_id')
+
+
+@receiver([post_save, post_delete], sender=Module)
+def invalidate_outline_on_module_change(sender, instance, **kwargs):
+    invalidate_course_outline(instance.course_id)
+    previous = getattr(instance, '_outline_course_id', None)
+    if previous and previous != instance.course_id:
+        invalidate_course_outline(previous)
+    instance._outline_course_id = instance.course_id
+
+
+@receiver([post_save, post_delete], sender=Lesson)
+def invalidate_outline_on_lesson_change(sender, instance, **kwargs):
+    module_ids = {instance.module_id, getattr(instance, '_outline_module_id', None)} - {None}
+    if Lesson.module.is_cached(instance) and instance.module.pk == instance.module_id:
+        invalidate_course_outline(instance.module.course_id)
+        module_ids.discard(instance.module_id)
+    for module_id in module_ids:
+        # During a cascading module delete the module row is already gone; the
+        # module's own post_delete handler invalidates the outline in that case.
+        invalidate_course_outline(_course_id_for_module(module_id))
+    instance._outline_module_id = instance.module_id
+
+
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_catalog_on_change(sender, instance, **kwargs):
+    invalidate_catalog()
+
+
+# Catalog and course responses embed the instructor's full name
+INSTRUCTOR_NAME_FIELDS = ('first_name', 'last_name')
+
+
+@receiver(post_init, sender=User)
+def remember_instructor_name(sender, instance, **kwargs):
+    instance._catalog_name = tuple(instance.__dict__.get(field) for field in INSTRUCTOR_NAME_FIELDS)
+
+
+@receiver(post_save, sender=User)
+def invalidate_catalog_on_instructor_rename(sender, instance, created, **kwargs):
+    current = tuple(instance.__dict__.get(field) for field in INSTRUCTOR_NAME_FIELDS)
+    renamed = any(
+        before != after
+        for before, after in zip(instance._catalog_name, current)
+        if before is not None and after is not None  # deferred on either side
+    )
+    instance._catalog_name = current
+    if not created and renamed and Course.objects.filter(instructor_id=instance.pk).exists():
+        invalidate_catalog()
+
+
+@receiver(post_init, sender=Course)
+def remember_thumbnail(sender, instance, **kwargs):
+    instance._thumbnail_name = instance.__dict__.get('thumbnail') or ''
+
+
+@receiver(post_save, sender=Course)
+def queue_thumbnail_derivatives(sender, instance, **kwargs):
+    if 'thumbnail' not in instance.__dict__:
+        return  # deferred and never assigned
+    name = instance.thumbnail.name or ''
+    if name != instance._thumbnail_name:
+        image_derivatives_job.enqueue(model='courses.Course', pk=instance.pk)
+        instance._thumbnail_name = name
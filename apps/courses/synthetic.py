@@ -0,0 +1,489 @@
+"""
+Synthetic data for performance work (`manage.py seed_data --students N`)
+Generates a deterministic dataset: users and profiles, categories, courses with
+modules, lessons, quizzes (questions and options), assignments, live sessions
+and announcements, then per student enrollments, lesson progress, quiz attempts,
+submissions and attendance.
+
+- Every value comes from RNGs seeded with (seed, table, chunk), and students
+  are generated in fixed-size chunks, so the same options always produce the
+  same rows whatever the number of worker processes.
+- Rows that others point at get explicit primary keys (offset past the current
+  maximum), so chunks can be generated independently in a process pool.
+- The parent process writes: COPY FROM STDIN on PostgreSQL, batched
+  bulk_create elsewhere. Password hashes are computed once per role.
+
+Model signals do not run, so callers recompute the derived counters afterwards
+(lesson totals, enrollment progress, overview counters).
+
+Worker functions are unpickled by spawned children before Django is set up:
+this module must not import models at import time.
+"""
+import io
+import json
+import multiprocessing
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from apps.assessments.answers import encode_answers
+
+STUDENT_CHUNK = 1000
+CATEGORY_COUNT = 12
+MODULES_PER_COURSE = 4
+LESSONS_PER_MODULE = 6
+QUIZZES_PER_COURSE = 2
+QUESTIONS_PER_QUIZ = 10
+OPTIONS_PER_QUESTION = 4
+ASSIGNMENTS_PER_COURSE = 3
+SESSIONS_PER_COURSE = 4
+ANNOUNCEMENTS_PER_COURSE = 3
+SYSTEM_ANNOUNCEMENTS = 5
+# Share of (enrollment, quiz / assignment / session) pairs with an attempt, submission or attendance row
+ATTEMPT_RATE = 0.6
+SUBMISSION_RATE = 0.4
+ATTENDANCE_RATE = 0.7
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+YEAR_SECONDS = 365 * 24 * 3600
+
+# Tables whose rows are referenced by other generated rows, and so get explicit ids
+KEYED_MODELS = (
+    'users.User', 'courses.Category', 'courses.Course', 'courses.Module', 'courses.Lesson',
+    'assessments.Quiz', 'assessments.Question', 'assessments.QuestionOption', 'assessments.Assignment',
+    'attendance.LiveSession', 'enrollments.Enrollment',
+)
+
+FIRST_NAMES = ('Emma', 'James', 'Olivia', 'Liam', 'Ava', 'Noah', 'Sophia', 'Aarav', 'Diya', 'Kabir', 'Meera', 'Rohan')
+LAST_NAMES = ('Davis', 'Brown', 'Miller', 'Wilson', 'Taylor', 'Sharma', 'Patel', 'Iyer', 'Khan', 'Singh', 'Das', 'Nair')
+SUBJECTS = ('Algebra', 'Biology', 'Chemistry', 'Physics', 'Python', 'Web Development', 'English', 'Geometry', 'History', 'Art')
+LEVELS = ('Beginner', 'Intermediate', 'Advanced')
+CONTENT_TYPES = ('VIDEO', 'VIDEO', 'PDF', 'TEXT', 'LINK')
+ATTENDANCE_STATUSES = ('PRESENT', 'PRESENT', 'PRESENT', 'LATE', 'ABSENT', 'EXCUSED')
+
+
+@dataclass
+class Scale:
+    """Size and identity of a synthetic dataset; picklable, handed to the worker processes."""
+
+    students: int
+    courses: int
+    instructors: int
+    enrollments_per_student: int = 5
+    progress_density: float = 0.4
+    seed: int = 0
+    student_password: str = ''
+    instructor_password: str = ''
+    admin_password: str = ''
+    # {model label: largest primary key before loading}
+    bases: dict = field(default_factory=dict)
+
+    @property
+    def prefix(self):
+        return f"load{self.seed}"
+
+    def rng(self, table, chunk=0):
+        return random.Random(f"{self.seed}:{table}:{chunk}")
+
+    # Primary keys of the keyed rows
+
+    def user_id(self, index):
+        """Instructors take indexes [0, instructors), students follow."""
+        return self.bases['users.User'] + 1 + index
+
+    def student_user_id(self, student):
+        return self.user_id(self.instructors + student)
+
+    def admin_user_id(self):
+        """One admin after the students, so admin-only endpoints have a user too."""
+        return self.user_id(self.instructors + self.students)
+
+    def course_id(self, course):
+        return self.bases['courses.Course'] + 1 + course
+
+    def lesson_ids(self, course):
+        first = self.bases['courses.Lesson'] + 1 + course * MODULES_PER_COURSE * LESSONS_PER_MODULE
+        return range(first, first + MODULES_PER_COURSE * LESSONS_PER_MODULE)
+
+    def quiz_id(self, course, quiz):
+        return self.bases['assessments.Quiz'] + 1 + course * QUIZZES_PER_COURSE + quiz
+
+    def option_id(self, course, quiz, question, option):
+        """Attempt answers store option ids, so the options get explicit ids too."""
+        question_index = (course * QUIZZES_PER_COURSE + quiz) * QUESTIONS_PER_QUIZ + question
+        return self.bases['assessments.QuestionOption'] + 1 + question_index * OPTIONS_PER_QUESTION + option
+
+    def assignment_id(self, course, assignment):
+        return self.bases['assessments.Assignment'] + 1 + course * ASSIGNMENTS_PER_COURSE + assignment
+
+    def session_id(self, course, session):
+        return self.bases['attendance.LiveSession'] + 1 + course * SESSIONS_PER_COURSE + session
+
+    def enrollment_id(self, student, slot):
+        return self.bases['enrollments.Enrollment'] + 1 + student * self.enrollments_per_student + slot
+
+    def correct_option(self, course, quiz, question):
+        """Position of the correct option; derived, so attempts can be scored without the option rows."""
+        return (course * 7 + quiz * 5 + question * 3 + self.seed) % OPTIONS_PER_QUESTION
+
+    def course_opened_at(self, course):
+        return BASE_TIME + timedelta(seconds=course * YEAR_SECONDS // (4 * max(self.courses, 1)))
+
+
+def _at(offset_seconds):
+    return BASE_TIME + timedelta(seconds=int(offset_seconds))
+
+
+# Row generation (pure Python; runs in the worker processes)
+
+def instructor_rows(scale):
+    """Instructors are generated with the courses, students per chunk."""
+    rows = []
+    for index in range(scale.instructors):
+        joined = _at(index * 60)
+        rows.append((
+            scale.user_id(index), scale.instructor_password, f"{scale.prefix}_instructor{index}",
+            FIRST_NAMES[index % len(FIRST_NAMES)], 'Instructor', f"{scale.prefix}.instructor{index}@example.com",
+            'INSTRUCTOR', True, joined, joined, joined,
+        ))
+    return rows
+
+
+def admin_rows(scale):
+    return [(
+        scale.admin_user_id(), scale.admin_password, f"{scale.prefix}_admin", 'Admin', 'User',
+        f"{scale.prefix}.admin@example.com", 'ADMIN', True, BASE_TIME, BASE_TIME, BASE_TIME, True, True,
+    )]
+
+
+USER_FIELDS = (
+    'id', 'password', 'username', 'first_name', 'last_name', 'email', 'role', 'is_verified',
+    'date_joined', 'created_at', 'updated_at',
+)
+ADMIN_FIELDS = USER_FIELDS + ('is_staff', 'is_superuser')
+PROFILE_FIELDS = ('user_id', 'organization', 'created_at', 'updated_at')
+
+
+def course_tables(scale):
+    """[(model label, fields, rows)] for users (instructors, the admin), categories, everything under the courses and announcements."""
+    rng = scale.rng('courses')
+    instructors = instructor_rows(scale)
+    admins = admin_rows(scale)
+    tables = [
+        ('users.User', USER_FIELDS, instructors),
+        ('users.User', ADMIN_FIELDS, admins),
+        ('users.UserProfile', PROFILE_FIELDS, [(row[0], 'Learnova', row[9], row[10]) for row in instructors + admins]),
+    ]
+
+    category_base = scale.bases['courses.Category'] + 1
+    categories = [
+        (category_base + i, f"{SUBJECTS[i % len(SUBJECTS)]} {i}", f"{scale.prefix}-category-{i}", '', 'All levels', BASE_TIME, BASE_TIME)
+        for i in range(CATEGORY_COUNT)
+    ]
+    tables.append(('courses.Category', ('id', 'name', 'slug', 'description', 'class_range', 'created_at', 'updated_at'), categories))
+
+    courses, modules, lessons = [], [], []
+    quizzes, questions, options = [], [], []
+    assignments, sessions, announcements = [], [], []
+    module_id = scale.bases['courses.Module'] + 1
+    question_id = scale.bases['assessments.Question'] + 1
+    for course in range(scale.courses):
+        course_id = scale.course_id(course)
+        opened = scale.course_opened_at(course)
+        subject = SUBJECTS[course % len(SUBJECTS)]
+        courses.append((
+            course_id, f"{subject} {course}", f"{scale.prefix}-course-{course}", f"Synthetic {subject} course {course}.",
+            category_base + course % CATEGORY_COUNT, scale.user_id(course % scale.instructors),
+            'PUBLISHED' if rng.random() < 0.9 else rng.choice(('DRAFT', 'PENDING', 'ARCHIVED')),
+            'KIDS' if rng.random() < 0.2 else 'STUDENT', rng.randint(10, 120), rng.choice(LEVELS), opened, opened,
+        ))
+        lesson_ids = iter(scale.lesson_ids(course))
+        for m in range(MODULES_PER_COURSE):
+            modules.append((module_id, course_id, f"Module {m + 1}", m, opened, opened))
+            for position in range(LESSONS_PER_MODULE):
+                content_type = rng.choice(CONTENT_TYPES)
+                url = f"https://example.com/{scale.prefix}/{course}/{m}/{position}" if content_type in ('VIDEO', 'LINK') else ''
+                lessons.append((
+                    next(lesson_ids), module_id, f"Lesson {m + 1}.{position + 1}", content_type, url,
+                    rng.randint(5, 45), position, opened, opened,
+                ))
+            module_id += 1
+        for q in range(QUIZZES_PER_COURSE):
+            quizzes.append((
+                scale.quiz_id(course, q), course_id, f"{subject} quiz {q + 1}", '', rng.choice((None, 15, 30)),
+                Decimal('60.00'), 3, True, opened, opened,
+            ))
+            for n in range(QUESTIONS_PER_QUIZ):
+                questions.append((question_id, scale.quiz_id(course, q), f"Question {n + 1}", 'MULTIPLE_CHOICE', 1, n))
+                correct = scale.correct_option(course, q, n)
+                options.extend(
+                    (scale.option_id(course, q, n, o), question_id, f"Option {chr(65 + o)}", o == correct, o)
+                    for o in range(OPTIONS_PER_QUESTION)
+                )
+                question_id += 1
+        for a in range(ASSIGNMENTS_PER_COURSE):
+            due = opened + timedelta(days=14 * (a + 1))
+            assignments.append((scale.assignment_id(course, a), course_id, f"{subject} assignment {a + 1}", 'Submit your work.', due, 100, opened, opened))
+        for s in range(SESSIONS_PER_COURSE):
+            start = opened + timedelta(days=7 * (s + 1), hours=rng.randint(8, 18))
+            sessions.append((scale.session_id(course, s), course_id, f"{subject} live class {s + 1}", start, 60, f"https://meet.example.com/{scale.prefix}-{course}-{s}", opened, opened))
+        for n in range(ANNOUNCEMENTS_PER_COURSE):
+            posted = opened + timedelta(days=10 * n, hours=rng.randint(8, 18))
+            announcements.append((course_id, scale.user_id(course % scale.instructors), f"{subject} update {n + 1}", 'Course news.', 'COURSE', n == 0, posted, posted))
+    announcements += [
+        (None, scale.admin_user_id(), f"Platform update {n + 1}", 'System news.', 'SYSTEM', False, _at(n * YEAR_SECONDS // SYSTEM_ANNOUNCEMENTS), _at(n * YEAR_SECONDS // SYSTEM_ANNOUNCEMENTS))
+        for n in range(SYSTEM_ANNOUNCEMENTS)
+    ]
+
+    tables += [
+        ('courses.Course', ('id', 'title', 'slug', 'description', 'category_id', 'instructor_id', 'status', 'audience',
+                            'duration_hours', 'level', 'created_at', 'updated_at'), courses),
+        ('courses.Module', ('id', 'course_id', 'title', 'order', 'created_at', 'updated_at'), modules),
+        ('courses.Lesson', ('id', 'module_id', 'title', 'content_type', 'content_url', 'duration_minutes', 'order',
+                            'created_at', 'updated_at'), lessons),
+        ('assessments.Quiz', ('id', 'course_id', 'title', 'description', 'time_limit_minutes', 'passing_score',
+                              'max_attempts', 'is_published', 'created_at', 'updated_at'), quizzes),
+        ('assessments.Question', ('id', 'quiz_id', 'question_text', 'question_type', 'points', 'order'), questions),
+        ('assessments.QuestionOption', ('id', 'question_id', 'option_text', 'is_correct', 'order'), options),
+        ('assessments.Assignment', ('id', 'course_id', 'title', 'description', 'due_date', 'max_points',
+                                    'created_at', 'updated_at'), assignments),
+        ('attendance.LiveSession', ('id', 'course_id', 'title', 'session_date', 'duration_minutes', 'meeting_url',
+                                    'created_at', 'updated_at'), sessions),
+        ('communications.Announcement', ('course_id', 'author_id', 'title', 'content', 'scope', 'is_pinned',
+                                         'created_at', 'updated_at'), announcements),
+    ]
+    return tables
+
+
+def pick_courses(rng, scale):
+    """Distinct course indexes for one student, skewed towards the low (popular) indexes."""
+    wanted = min(scale.enrollments_per_student, scale.courses)
+    chosen = []
+    while len(chosen) < wanted:
+        course = int(scale.courses * rng.random() ** 2)
+        if course not in chosen:
+            chosen.append(course)
+    return chosen
+
+
+def student_tables(scale, chunk):
+    """[(model label, fields, rows)] for the students of one chunk and everything they did."""
+    rng = scale.rng('students', chunk)
+    users, profiles, enrollments, progress = [], [], [], []
+    attempts, submissions, attendance = [], [], []
+    first = chunk * STUDENT_CHUNK
+    for student in range(first, min(first + STUDENT_CHUNK, scale.students)):
+        user_id = scale.student_user_id(student)
+        joined = _at(rng.randrange(YEAR_SECONDS // 2))
+        users.append((
+            user_id, scale.student_password, f"{scale.prefix}_student{student}",
+            rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), f"{scale.prefix}.student{student}@example.com",
+            'STUDENT', rng.random() < 0.7, joined, joined, joined,
+        ))
+        profiles.append((user_id, '', joined, joined))
+
+        for slot, course in enumerate(pick_courses(rng, scale)):
+            enrollment_id = scale.enrollment_id(student, slot)
+            enrolled = max(joined, scale.course_opened_at(course)) + timedelta(seconds=rng.randrange(30 * 24 * 3600))
+            status = 'DROPPED' if rng.random() < 0.05 else 'ACTIVE'
+            enrollments.append((enrollment_id, user_id, scale.course_id(course), status, enrolled))
+
+            for lesson_id in scale.lesson_ids(course):
+                if rng.random() < scale.progress_density:
+                    done = rng.random() < 0.9
+                    at = enrolled + timedelta(seconds=rng.randrange(90 * 24 * 3600))
+                    progress.append((enrollment_id, lesson_id, done, at if done else None))
+
+            for q in range(QUIZZES_PER_COURSE):
+                if rng.random() >= ATTEMPT_RATE:
+                    continue
+                chosen = []
+                correct = 0
+                for n in range(QUESTIONS_PER_QUIZ):
+                    right = scale.correct_option(course, q, n)
+                    position = right if rng.random() < 0.7 else rng.randrange(OPTIONS_PER_QUESTION)
+                    chosen.append(scale.option_id(course, q, n, position))
+                    correct += position == right
+                score = Decimal(correct * 100) / QUESTIONS_PER_QUIZ
+                started = enrolled + timedelta(seconds=rng.randrange(60 * 24 * 3600))
+                attempts.append((
+                    user_id, scale.quiz_id(course, q), score.quantize(Decimal('0.01')), score >= 60,
+                    encode_answers(chosen), started, started + timedelta(minutes=rng.randint(3, 30)),
+                ))
+
+            for a in range(ASSIGNMENTS_PER_COURSE):
+                if rng.random() >= SUBMISSION_RATE:
+                    continue
+                submitted = enrolled + timedelta(days=rng.randint(1, 40))
+                graded = rng.random() < 0.6
+                submissions.append((
+                    scale.assignment_id(course, a), user_id, 'Synthetic submission.',
+                    Decimal(rng.randint(40, 100)) if graded else None, 'Good work.' if graded else '',
+                    submitted, submitted + timedelta(days=2) if graded else None,
+                ))
+
+            for s in range(SESSIONS_PER_COURSE):
+                if rng.random() < ATTENDANCE_RATE:
+                    attendance.append((scale.session_id(course, s), user_id, rng.choice(ATTENDANCE_STATUSES)))
+
+    return [
+        ('users.User', USER_FIELDS, users),
+        ('users.UserProfile', PROFILE_FIELDS, profiles),
+        ('enrollments.Enrollment', ('id', 'student_id', 'course_id', 'status', 'enrolled_at'), enrollments),
+        ('enrollments.LessonProgress', ('enrollment_id', 'lesson_id', 'completed', 'completed_at'), progress),
+        ('assessments.QuizAttempt', ('student_id', 'quiz_id', 'score', 'passed', 'answers', 'started_at', 'submitted_at'), attempts),
+        ('assessments.AssignmentSubmission', ('assignment_id', 'student_id', 'text_submission', 'grade', 'feedback',
+                                              'submitted_at', 'graded_at'), submissions),
+        ('attendance.Attendance', ('session_id', 'student_id', 'status'), attendance),
+    ]
+
+
+# Writing (parent process)
+
+def _copy_value(value):
+    """One value in PostgreSQL's COPY text format."""
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return '\\\\x' + bytes(value).hex()
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+@contextmanager
+def explicit_timestamps(model):
+    """Let bulk_create keep the generated created_at / updated_at instead of stamping the load time."""
+    fields = [f for f in model._meta.concrete_fields if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    try:
+        for f in fields:
+            f.auto_now = f.auto_now_add = False
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+class TableWriter:
+    """Appends generated rows to their tables: COPY on PostgreSQL, batched bulk_create elsewhere."""
+
+    def __init__(self, batch_size=5000, using='default'):
+        from django.db import connections
+
+        self.batch_size = batch_size
+        self.connection = connections[using]
+        self.use_copy = self.connection.vendor == 'postgresql'
+        self.counts = {}
+
+    def write(self, label, fields, rows):
+        from django.apps import apps
+
+        if not rows:
+            return
+        model = apps.get_model(label)
+        if self.use_copy:
+            self._copy(model, fields, rows)
+        else:
+            with explicit_timestamps(model):
+                for start in range(0, len(rows), self.batch_size):
+                    batch = rows[start:start + self.batch_size]
+                    model._base_manager.bulk_create([model(**dict(zip(fields, row))) for row in batch], batch_size=self.batch_size)
+        self.counts[label] = self.counts.get(label, 0) + len(rows)
+
+    def _copy(self, model, fields, rows):
+        meta = model._meta
+        given = set(fields)
+        # Columns the generator leaves out get their model default; an omitted id is assigned by the database.
+        defaults = [
+            (f, f.get_default()) for f in meta.concrete_fields
+            if f.attname not in given and not f.primary_key
+        ]
+        columns = [meta.get_field(name).column for name in fields] + [f.column for f, _ in defaults]
+        tail = ''.join('\t' + _copy_value(value) for _, value in defaults)
+        quote = self.connection.ops.quote_name
+        sql = f"COPY {quote(meta.db_table)} ({', '.join(quote(c) for c in columns)}) FROM STDIN"
+        with self.connection.cursor() as cursor:
+            raw = cursor.cursor
+            for start in range(0, len(rows), self.batch_size):
+                text = ''.join(
+                    '\t'.join(map(_copy_value, row)) + tail + '\n' for row in rows[start:start + self.batch_size]
+                )
+                if hasattr(raw, 'copy_expert'):  # psycopg2
+                    raw.copy_expert(sql, io.StringIO(text))
+                else:  # psycopg 3
+                    with raw.copy(sql) as copy:
+                        copy.write(text)
+
+    def reset_sequences(self):
+        """Move PostgreSQL id sequences past the explicitly numbered rows."""
+        from django.apps import apps
+        from django.core.management.color import no_style
+
+        statements = self.connection.ops.sequence_reset_sql(no_style(), [apps.get_model(label) for label in KEYED_MODELS])
+        with self.connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+
+def primary_key_bases():
+    from django.apps import apps
+    from django.db.models import Max
+
+    return {
+        label: apps.get_model(label)._base_manager.aggregate(top=Max('pk'))['top'] or 0
+        for label in KEYED_MODELS
+    }
+
+
+def generate(scale, workers=1, batch_size=5000, log=None):
+    """
+    Load the dataset described by `scale` (whose `bases` must be set) and return
+    {model label: rows written}. Student chunks are generated by `workers` processes
+    while this process writes, with a bounded number of chunks in flight.
+    """
+    writer = TableWriter(batch_size)
+    for table in course_tables(scale):
+        writer.write(*table)
+
+    chunks = range((scale.students + STUDENT_CHUNK - 1) // STUDENT_CHUNK)
+    executor = None
+    if workers > 1 and len(chunks) > 1:
+        executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        if executor is None:
+            results = (student_tables(scale, chunk) for chunk in chunks)
+        else:
+            results = _ordered(executor, scale, chunks, window=workers * 2)
+        for done, tables in enumerate(results, 1):
+            for table in tables:
+                writer.write(*table)
+            if log and (done % 10 == 0 or done == len(chunks)):
+                log(f"  students: {min(done * STUDENT_CHUNK, scale.students)}/{scale.students}")
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    if writer.use_copy:
+        writer.reset_sequences()
+    return writer.counts
+
+
+def _ordered(executor, scale, chunks, window):
+    """Results of student_tables for each chunk, in chunk order, keeping at most `window` pending."""
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(student_tables, scale, chunk))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
@@ -4,9 +4,10 @@ from .views import CategoryViewSet, CourseViewSet, ModuleViewSet, LessonViewSet
 
 router = DefaultRouter()
 router.register('categories', CategoryViewSet)
-router.register('', CourseViewSet, basename='course')
 router.register('modules', ModuleViewSet, basename='module')
 router.register('lessons', LessonViewSet, basename='lesson')
+# Last: the course detail route (<pk>/) would otherwise capture modules/ and lessons/
+router.register('', CourseViewSet, basename='course')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,12 +1,23 @@
-from rest_framework import viewsets
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.text import slugify
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.core.cache import get_version
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.media import download_name, serve_file
+from apps.core.membership import get_membership
 from apps.core.permissions import IsInstructorOrAdmin, CanEditCourse, IsAdminUser
 from .models import Category, Course, Module, Lesson
 from .serializers import CategorySerializer, CourseSerializer, CourseListSerializer, ModuleSerializer, LessonSerializer
+from .catalog import CATALOG_NAMESPACE, is_catalog_request, catalog_cache_key
+from .outline import OUTLINE_NAMESPACE
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
@@ -16,7 +27,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
         return [AllowAny()]
 
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
     filter_backends = [DjangoFilterBackend]
@@ -30,7 +41,7 @@ class CourseViewSet(viewsets.ModelViewSet):
         return [IsAuthenticated(), IsInstructorOrAdmin(), CanEditCourse()]
 
     def get_queryset(self):
-        qs = Course.objects.all()
+        qs = Course.objects.select_related('category', 'instructor')
         # Unauthenticated users and students see only published courses
         if not self.request.user.is_authenticated:
             return qs.filter(status=Course.Status.PUBLISHED)
@@ -38,6 +49,28 @@ class CourseViewSet(viewsets.ModelViewSet):
             return qs.filter(status=Course.Status.PUBLISHED)
         return qs
 
+    def get_etag_versions(self, obj=None):
+        # Every Course / Category write bumps the catalog version; the outline version covers modules and lessons.
+        if obj is None:
+            return (get_version(CATALOG_NAMESPACE),)
+        return (get_version(CATALOG_NAMESPACE), get_version(OUTLINE_NAMESPACE, scope=obj.pk))
+
+    def get_list_fingerprint(self):
+        return ()  # the catalog version already changes with every course
+
+    def build_list_response(self, request, *args, **kwargs):
+        """Public catalog: cached per filter/page until a course or category changes."""
+        if not is_catalog_request(request):
+            return super().build_list_response(request, *args, **kwargs)
+        key = catalog_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().build_list_response(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        return response
+
     def get_serializer_class(self):
         if self.action == 'list':
             return CourseListSerializer
@@ -52,13 +85,31 @@ class CourseViewSet(viewsets.ModelViewSet):
             serializer.save(instructor=instructor)
 
 
-class ModuleViewSet(viewsets.ModelViewSet):
+class ModuleViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Module.objects.all()
     serializer_class = ModuleSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    etag_related = ('lessons',)
 
 
-class LessonViewSet(viewsets.ModelViewSet):
+class LessonViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Lesson.objects.all()
     serializer_class = LessonSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def content(self, request, pk=None):
+        """Stream the lesson file (Range requests supported) to enrolled students and the course staff."""
+        lesson = self.get_object()
+        if not lesson.content_file:
+            return Response({'error': 'Lesson has no file'}, status=status.HTTP_404_NOT_FOUND)
+        user = request.user
+        course = Course.objects.only('instructor_id').get(modules__lessons=lesson)
+        allowed = (
+            user.is_admin
+            or course.instructor_id == user.pk
+            or get_membership(request).is_enrolled(course.pk, active_only=True)
+        )
+        if not allowed:
+            return Response({'error': 'Not enrolled in this course'}, status=status.HTTP_403_FORBIDDEN)
+        return serve_file(request, lesson.content_file.name, download_name(lesson.content_file.name, slugify(lesson.title)))
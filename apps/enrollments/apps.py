@@ -5,3 +5,6 @@ class EnrollmentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.enrollments'
     verbose_name = 'Enrollments'
+
+    def ready(self):
+        from . import signals  # noqa: F401
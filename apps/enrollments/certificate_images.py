@@ -0,0 +1,102 @@
+"""
+Certificate image rendering for Learnova LMS
+Draws a certificate onto the background template with Pillow and stores it
+as a PNG. The template and fonts are loaded once per process (init_renderer),
+so a process pool renders thousands of certificates without reopening them.
+
+This module is imported by spawned pool processes before Django is set up:
+it must not import models at import time.
+
+Settings:
+    CERTIFICATE_TEMPLATE  path to a background image (a plain bordered page if unset)
+    CERTIFICATE_FONT      path to a TrueType font (Pillow's default font if unset)
+"""
+from io import BytesIO
+
+CANVAS_SIZE = (1600, 1131)
+BORDER_COLOR = (32, 64, 128)
+TEXT_COLOR = (33, 33, 33)
+FONT_SIZES = {'heading': 72, 'name': 64, 'body': 32, 'course': 48, 'small': 24}
+
+_template = None
+_fonts = None
+
+
+def _load_font(path, size):
+    from PIL import ImageFont
+
+    if path:
+        return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size=size)
+
+
+def load_assets(template_path=None, font_path=None):
+    """Load (or reload) the background template and fonts used by render_certificate."""
+    global _template, _fonts
+    from PIL import Image, ImageDraw
+
+    if template_path:
+        with Image.open(template_path) as image:
+            _template = image.convert('RGB')
+    else:
+        _template = Image.new('RGB', CANVAS_SIZE, 'white')
+        draw = ImageDraw.Draw(_template)
+        width, height = CANVAS_SIZE
+        draw.rectangle((30, 30, width - 31, height - 31), outline=BORDER_COLOR, width=12)
+        draw.rectangle((60, 60, width - 61, height - 61), outline=BORDER_COLOR, width=3)
+    _fonts = {name: _load_font(font_path, size) for name, size in FONT_SIZES.items()}
+
+
+def load_configured_assets():
+    from django.conf import settings
+
+    load_assets(getattr(settings, 'CERTIFICATE_TEMPLATE', None), getattr(settings, 'CERTIFICATE_FONT', None))
+
+
+def init_renderer():
+    """Process pool initializer: set Django up (for storage) and load the assets once."""
+    import django
+
+    django.setup()
+    load_configured_assets()
+
+
+def render_png(student_name, course_title, issued_on, certificate_id):
+    """PNG bytes of one certificate."""
+    from PIL import ImageDraw
+
+    if _template is None:
+        load_configured_assets()
+    image = _template.copy()
+    draw = ImageDraw.Draw(image)
+    # Text positions are fractions of the page, so custom templates may have any size.
+    center = image.width // 2
+    lines = (
+        (0.22, 'heading', "Certificate of Completion"),
+        (0.36, 'body', "This certifies that"),
+        (0.46, 'name', student_name),
+        (0.56, 'body', "has successfully completed"),
+        (0.65, 'course', course_title),
+        (0.80, 'small', f"Issued {issued_on}"),
+        (0.85, 'small', f"Certificate ID {certificate_id}"),
+    )
+    for position, font, text in lines:
+        draw.text((center, int(image.height * position)), text, fill=TEXT_COLOR, font=_fonts[font], anchor='mm')
+    out = BytesIO()
+    image.save(out, format='PNG', compress_level=3)
+    return out.getvalue()
+
+
+def render_certificate(payload):
+    """
+    Render one certificate and save it to the default storage.
+    payload: (certificate pk, certificate_id, student name, course title, issued date ISO string)
+    Returns (certificate pk, stored file name).
+    """
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import default_storage
+
+    pk, certificate_id, student_name, course_title, issued_on = payload
+    png = render_png(student_name, course_title, issued_on, certificate_id)
+    name = default_storage.save(f"certificates/{certificate_id}.png", ContentFile(png))
+    return pk, name
@@ -0,0 +1,134 @@
+"""
+Bulk certificate issuance for Learnova LMS
+Finds COMPLETED enrollments without a certificate in primary-key batches,
+allocates the batch's certificate ids from one random buffer and inserts the
+rows with a single bulk_create. The certificate images are then rendered
+across a process pool (see certificate_images) and attached with bulk_update.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db.models import CharField, Value
+from django.db.models.functions import Concat
+from .certificate_images import init_renderer, render_certificate
+from .models import Certificate, Enrollment
+
+DEFAULT_BATCH_SIZE = 1000
+CERTIFICATE_ID_PREFIX = 'CERT-'
+# 6 random bytes -> 12 hex characters, the format used since the first certificates.
+CERTIFICATE_ID_BYTES = 6
+
+
+def allocate_certificate_ids(count):
+    """`count` new certificate ids (CERT- + 12 uppercase hex chars) from one urandom call."""
+    raw = os.urandom(CERTIFICATE_ID_BYTES * count).hex().upper()
+    width = CERTIFICATE_ID_BYTES * 2
+    return [f"{CERTIFICATE_ID_PREFIX}{raw[i:i + width]}" for i in range(0, len(raw), width)]
+
+
+def pending_enrollments(course_ids=None):
+    qs = Enrollment.objects.filter(status=Enrollment.Status.COMPLETED, certificate__isnull=True)
+    if course_ids:
+        qs = qs.filter(course_id__in=course_ids)
+    return qs.order_by('pk')
+
+
+def render_payloads(certificates):
+    """(pk, certificate_id, student name, course title, issued date) for each certificate queryset row."""
+    rows = certificates.annotate(
+        student_name=Concat(
+            'enrollment__student__first_name', Value(' '), 'enrollment__student__last_name',
+            output_field=CharField(),
+        ),
+    ).values_list('pk', 'certificate_id', 'student_name', 'enrollment__student__email', 'enrollment__course__title', 'issued_at')
+    return [
+        (pk, certificate_id, name.strip() or email, title, issued_at.date().isoformat())
+        for pk, certificate_id, name, email, title, issued_at in rows
+    ]
+
+
+class CertificateRenderer:
+    """Renders payloads in a process pool (workers > 1) or in-process, and stores the image names."""
+
+    def __init__(self, workers=None):
+        self.workers = workers or getattr(settings, 'CERTIFICATE_RENDER_WORKERS', None) or os.cpu_count() or 1
+        self.executor = None
+        if self.workers > 1:
+            self.executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context('spawn'), initializer=init_renderer,
+            )
+
+    def render(self, payloads):
+        if self.executor is None:
+            results = map(render_certificate, payloads)
+        else:
+            results = self.executor.map(render_certificate, payloads, chunksize=max(1, len(payloads) // (self.workers * 4)))
+        updates = [Certificate(pk=pk, image=name) for pk, name in results]
+        Certificate.objects.bulk_update(updates, ['image'], batch_size=DEFAULT_BATCH_SIZE)
+        return len(updates)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def issue_certificates(course_ids=None, batch_size=DEFAULT_BATCH_SIZE, render=True, workers=None, progress=None):
+    """
+    Issue certificates for every COMPLETED enrollment that has none.
+    `progress(issued, rendered)` is called after each batch. Returns (issued, rendered).
+    Safe to run concurrently with itself: rows another run inserted first are skipped.
+    """
+    issued = rendered = 0
+    renderer = CertificateRenderer(workers) if render else None
+    last_pk = 0
+    try:
+        while True:
+            enrollment_ids = list(
+                pending_enrollments(course_ids).filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size]
+            )
+            if not enrollment_ids:
+                break
+            last_pk = enrollment_ids[-1]
+            certificate_ids = allocate_certificate_ids(len(enrollment_ids))
+            Certificate.objects.bulk_create(
+                [
+                    Certificate(enrollment_id=enrollment_id, certificate_id=certificate_id)
+                    for enrollment_id, certificate_id in zip(enrollment_ids, certificate_ids)
+                ],
+                ignore_conflicts=True,
+            )
+            # ignore_conflicts leaves pks unset; read back the rows this batch actually inserted.
+            created = Certificate.objects.filter(certificate_id__in=certificate_ids)
+            issued += created.count()
+            if renderer is not None:
+                rendered += renderer.render(render_payloads(created))
+            if progress:
+                progress(issued, rendered)
+    finally:
+        if renderer is not None:
+            renderer.close()
+    return issued, rendered
+
+
+def render_missing_images(workers=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Render images for certificates issued without one (e.g. before images existed)."""
+    rendered = 0
+    last_pk = 0
+    with CertificateRenderer(workers) as renderer:
+        while True:
+            ids = list(
+                Certificate.objects.filter(image='', pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_pk = ids[-1]
+            rendered += renderer.render(render_payloads(Certificate.objects.filter(pk__in=ids)))
+    return rendered
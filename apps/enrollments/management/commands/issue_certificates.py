@@ -0,0 +1,32 @@
+"""
+Management command to issue certificates for all completed enrollments that have none.
+Usage: python manage.py issue_certificates [--course ID ...] [--batch-size 1000] [--workers N] [--no-render] [--render-missing]
+"""
+from django.core.management.base import BaseCommand
+from apps.enrollments.certificates import DEFAULT_BATCH_SIZE, issue_certificates, render_missing_images
+
+
+class Command(BaseCommand):
+    help = "Bulk-issue certificates for COMPLETED enrollments and render their images"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, action='append', dest='courses', help="Limit to a course id (repeatable)")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--workers', type=int, help="Render processes (default: CERTIFICATE_RENDER_WORKERS or CPU count)")
+        parser.add_argument('--no-render', action='store_true', help="Issue certificates without rendering images")
+        parser.add_argument('--render-missing', action='store_true', help="Also render images of earlier certificates without one")
+
+    def handle(self, *args, **options):
+        def report(issued, rendered):
+            self.stdout.write(f"  {issued} issued, {rendered} rendered")
+
+        issued, rendered = issue_certificates(
+            course_ids=options['courses'],
+            batch_size=options['batch_size'],
+            render=not options['no_render'],
+            workers=options['workers'],
+            progress=report,
+        )
+        if options['render_missing']:
+            rendered += render_missing_images(workers=options['workers'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Issued {issued} certificate(s), rendered {rendered} image(s)."))
@@ -0,0 +1,31 @@
+"""
+Management command to rebuild lesson totals and enrollment progress from scratch.
+Usage: python manage.py recompute_progress [--course 1 --course 2]
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+from apps.enrollments.progress import recompute_lesson_totals, recompute_progress
+
+
+class Command(BaseCommand):
+    help = "Recount Course.lesson_count and Enrollment progress with set-based SQL (fixes counter drift)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, action='append', dest='courses', help="Limit to a course id (repeatable)")
+
+    def handle(self, *args, **options):
+        courses = Course.objects.all()
+        enrollments = Enrollment.objects.all()
+        if options['courses']:
+            courses = courses.filter(pk__in=options['courses'])
+            enrollments = enrollments.filter(course_id__in=options['courses'])
+
+        with transaction.atomic():
+            course_count = recompute_lesson_totals(courses)
+            enrollment_count = recompute_progress(enrollments)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Recomputed lesson totals for {course_count} course(s) and progress for {enrollment_count} enrollment(s)."
+        ))
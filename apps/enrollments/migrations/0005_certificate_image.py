@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollments', '0004_enrollment_completed_lessons'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='image',
+            field=models.ImageField(blank=True, editable=False, upload_to='certificates/'),
+        ),
+    ]
@@ -17,6 +17,7 @@ class Enrollment(models.Model):
     course = models.ForeignKey('courses.Course', on_delete=models.CASCADE, related_name='enrollments')
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.ACTIVE)
     progress_percent = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    completed_lessons = models.PositiveIntegerField(default=0, editable=False)
     enrolled_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
@@ -24,6 +25,12 @@ class Enrollment(models.Model):
         db_table = 'enrollments'
         unique_together = ['student', 'course']
         ordering = ['-enrolled_at']
+        indexes = [
+            models.Index(fields=['-enrolled_at'], name='enrollment_recent_idx'),
+            models.Index(fields=['student', 'status'], name='enrollment_student_status_idx'),
+            models.Index(fields=['student', '-enrolled_at'], name='enrollment_student_recent_idx'),
+            models.Index(fields=['course', 'status'], name='enrollment_course_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.email} - {self.course.title}"
@@ -48,12 +55,14 @@ class Certificate(models.Model):
     enrollment = models.OneToOneField(Enrollment, on_delete=models.CASCADE, related_name='certificate')
     issued_at = models.DateTimeField(auto_now_add=True)
     certificate_id = models.CharField(max_length=50, unique=True, editable=False)
+    # Pre-rendered certificate, see apps.enrollments.certificates
+    image = models.ImageField(upload_to='certificates/', blank=True, editable=False)
 
     class Meta:
         db_table = 'certificates'
 
     def save(self, *args, **kwargs):
         if not self.certificate_id:
-            import uuid
-            self.certificate_id = f"CERT-{uuid.uuid4().hex[:12].upper()}"
+            from .certificates import allocate_certificate_ids
+            self.certificate_id = allocate_certificate_ids(1)[0]
         super().save(*args, **kwargs)
@@ -0,0 +1,116 @@
+"""
+Enrollment progress engine for Learnova LMS
+Keeps Enrollment.completed_lessons / Course.lesson_count current with O(1)
+counter updates and derives progress_percent (and completion) from them.
+All writes are single UPDATE statements, so concurrent progress writes never
+lose increments. Rescaling a course's enrollments after its lesson count
+changed is deferred to the commit and done once per course, however many
+lessons the transaction added or removed.
+"""
+import threading
+
+from django.db import transaction
+from django.db.models import (
+    Case, Count, DecimalField, F, FloatField, OuterRef, Q, Subquery, Value, When,
+)
+from django.db.models.functions import Cast, Coalesce, Least, Now
+from django.db.models.lookups import GreaterThan, GreaterThanOrEqual
+from .models import Enrollment, LessonProgress
+
+PERCENT_FIELD = DecimalField(max_digits=5, decimal_places=2)
+
+# Course ids whose enrollments wait for a rescale, per thread (see adjust_lesson_total)
+_pending = threading.local()
+
+
+def _course_lesson_total():
+    from apps.courses.models import Course
+    return Subquery(Course.objects.filter(pk=OuterRef('course_id')).values('lesson_count')[:1])
+
+
+def _percent(completed, total):
+    """SQL expression: completed / total as a 0-100 percentage (0 for empty courses)."""
+    return Case(
+        When(
+            GreaterThan(total, 0),
+            then=Cast(Least(Value(100.0), Cast(completed, FloatField()) * 100.0 / total), PERCENT_FIELD),
+        ),
+        default=Value(0, output_field=PERCENT_FIELD),
+        output_field=PERCENT_FIELD,
+    )
+
+
+def _completion_updates(completed, total):
+    """UPDATE assignments that move an ACTIVE enrollment to COMPLETED once every lesson is done."""
+    done = dict(condition=Q(GreaterThan(total, 0), GreaterThanOrEqual(completed, total), status=Enrollment.Status.ACTIVE))
+    return {
+        'status': Case(When(**done, then=Value(Enrollment.Status.COMPLETED)), default=F('status')),
+        'completed_at': Case(When(**done, then=Now()), default=F('completed_at')),
+    }
+
+
+def adjust_completed_lessons(enrollment_id, delta):
+    """Apply a +/- change in completed lessons to one enrollment (one UPDATE)."""
+    if not delta:
+        return
+    completed = F('completed_lessons') + delta
+    total = _course_lesson_total()
+    Enrollment.objects.filter(pk=enrollment_id).update(
+        completed_lessons=completed,
+        progress_percent=_percent(completed, total),
+        **_completion_updates(completed, total),
+    )
+
+
+def adjust_lesson_total(course_id, delta):
+    """
+    Apply a +/- change in a course's lesson count now, and rescale its enrollments'
+    progress once the transaction commits.
+    """
+    from apps.courses.models import Course
+    if not delta or course_id is None:
+        return
+    Course.objects.filter(pk=course_id).update(lesson_count=F('lesson_count') + delta)
+    if not hasattr(_pending, 'course_ids'):
+        _pending.course_ids = set()
+    _pending.course_ids.add(course_id)
+    # One callback per call; the first to run refreshes every pending course, the rest find none.
+    # Ids left behind by a rolled-back transaction are refreshed after the next commit, harmlessly.
+    transaction.on_commit(_refresh_pending_courses)
+
+
+def _refresh_pending_courses():
+    course_ids = getattr(_pending, 'course_ids', None)
+    if course_ids:
+        _pending.course_ids = set()
+        refresh_progress(Enrollment.objects.filter(course_id__in=course_ids))
+
+
+def refresh_progress(enrollments):
+    """Re-derive progress_percent/status from the stored counters for a queryset of enrollments."""
+    completed = F('completed_lessons')
+    total = _course_lesson_total()
+    return enrollments.update(
+        progress_percent=_percent(completed, total),
+        **_completion_updates(completed, total),
+    )
+
+
+def recompute_lesson_totals(courses):
+    """Set-based recount of Course.lesson_count for a queryset of courses."""
+    from apps.courses.models import Lesson
+    lessons = (
+        Lesson.objects.filter(module__course=OuterRef('pk'))
+        .order_by().values('module__course').annotate(n=Count('pk')).values('n')
+    )
+    return courses.update(lesson_count=Coalesce(Subquery(lessons), 0))
+
+
+def recompute_progress(enrollments):
+    """Set-based recount of completed lessons (and derived progress) for a queryset of enrollments."""
+    done = (
+        LessonProgress.objects.filter(enrollment=OuterRef('pk'), completed=True)
+        .order_by().values('enrollment').annotate(n=Count('pk')).values('n')
+    )
+    enrollments.update(completed_lessons=Coalesce(Subquery(done), 0))
+    return refresh_progress(enrollments)
@@ -12,6 +12,14 @@ class LessonProgressSerializer(BaseModelSerializer):
         fields = ['id', 'lesson', 'completed', 'completed_at']
 
 
+class LessonProgressSyncItemSerializer(serializers.Serializer):
+    """One offline progress record in a bulk sync payload."""
+
+    lesson = serializers.IntegerField(min_value=1)
+    completed = serializers.BooleanField()
+    completed_at = serializers.DateTimeField(required=False, allow_null=True)
+
+
 class EnrollmentSerializer(BaseModelSerializer):
     course_title = serializers.CharField(source='course.title', read_only=True)
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
@@ -28,4 +36,4 @@ class CertificateSerializer(BaseModelSerializer):
 
     class Meta:
         model = Certificate
-        fields = ['id', 'certificate_id', 'enrollment', 'course_title', 'student_name', 'issued_at']
+        fields = ['id', 'certificate_id', 'enrollment', 'course_title', 'student_name', 'image', 'issued_at']
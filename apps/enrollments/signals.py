@@ -0,0 +1,75 @@
+"""
+Enrollment signal handlers for Learnova LMS
+Feed lesson-progress and lesson writes into the progress engine, and keep the
+cached enrollment membership in sync.
+"""
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from apps.core.membership import invalidate_membership
+from apps.courses.models import Module, Lesson
+from .models import Enrollment, LessonProgress
+from .progress import adjust_completed_lessons, adjust_lesson_total
+
+
+@receiver(post_init, sender=LessonProgress)
+def remember_progress_state(sender, instance, **kwargs):
+    # Snapshot what the row looked like when loaded; used to compute the counter delta.
+    instance._progress_state = (instance.__dict__.get('enrollment_id'), bool(instance.__dict__.get('completed')))
+
+
+@receiver(post_save, sender=LessonProgress)
+def count_progress_on_save(sender, instance, created, **kwargs):
+    old_enrollment, was_completed = (None, False) if created else instance._progress_state
+    if old_enrollment is not None and old_enrollment != instance.enrollment_id:
+        if was_completed:
+            adjust_completed_lessons(old_enrollment, -1)
+        was_completed = False
+    adjust_completed_lessons(instance.enrollment_id, int(instance.completed) - int(was_completed))
+    instance._progress_state = (instance.enrollment_id, bool(instance.completed))
+
+
+@receiver(post_delete, sender=LessonProgress)
+def count_progress_on_delete(sender, instance, **kwargs):
+    enrollment_id, was_completed = instance._progress_state
+    if was_completed:
+        adjust_completed_lessons(enrollment_id, -1)
+
+
+def _course_id_for_module(module_id):
+    return Module.objects.filter(pk=module_id).values_list('course_id', flat=True).first()
+
+
+@receiver(post_init, sender=Lesson)
+def remember_lesson_course_module(sender, instance, **kwargs):
+    instance._progress_module_id = instance.__dict__.get('module_id')
+
+
+@receiver(post_save, sender=Lesson)
+def count_lessons_on_save(sender, instance, created, **kwargs):
+    previous = None if created else instance._progress_module_id
+    if previous != instance.module_id:
+        course_id = _course_id_for_module(instance.module_id)
+        previous_course_id = _course_id_for_module(previous) if previous else None
+        if course_id != previous_course_id:
+            adjust_lesson_total(previous_course_id, -1)
+            adjust_lesson_total(course_id, 1)
+    instance._progress_module_id = instance.module_id
+
+
+@receiver(post_delete, sender=Lesson)
+def count_lessons_on_delete(sender, instance, **kwargs):
+    adjust_lesson_total(_course_id_for_module(instance._progress_module_id), -1)
+
+
+@receiver(post_init, sender=Enrollment)
+def remember_enrollment_student(sender, instance, **kwargs):
+    instance._membership_student_id = instance.__dict__.get('student_id')
+
+
+@receiver([post_save, post_delete], sender=Enrollment)
+def invalidate_membership_on_enrollment_change(sender, instance, **kwargs):
+    invalidate_membership(instance.student_id)
+    previous = getattr(instance, '_membership_student_id', None)
+    if previous and previous != instance.student_id:
+        invalidate_membership(previous)
+    instance._membership_student_id = instance.student_id
@@ -0,0 +1,12 @@
+"""
+Background jobs of the enrollments app (see apps.core.jobs)
+"""
+from apps.core.jobs import task
+
+
+@task('enrollments.issue_certificates', queue='certificates')
+def issue_certificates_job(course_ids=None):
+    from .certificates import issue_certificates
+
+    issued, rendered = issue_certificates(course_ids=course_ids)
+    return {'issued': issued, 'rendered': rendered}
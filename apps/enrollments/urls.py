@@ -3,9 +3,10 @@ from rest_framework.routers import DefaultRouter
 from .views import EnrollmentViewSet, LessonProgressViewSet, CertificateViewSet
 
 router = DefaultRouter()
-router.register('', EnrollmentViewSet, basename='enrollment')
 router.register('lesson-progress', LessonProgressViewSet, basename='lesson-progress')
 router.register('certificates', CertificateViewSet, basename='certificate')
+# Last: the enrollment detail route (<pk>/) would otherwise capture lesson-progress/ and certificates/
+router.register('', EnrollmentViewSet, basename='enrollment')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,14 +1,35 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from apps.core.export import ExportMixin
+from apps.core.pagination import KeysetPagination
 from .models import Enrollment, LessonProgress, Certificate
-from .serializers import EnrollmentSerializer, LessonProgressSerializer, CertificateSerializer
+from .serializers import EnrollmentSerializer, LessonProgressSerializer, LessonProgressSyncItemSerializer, CertificateSerializer
+from .progress import recompute_progress
 
 
-class EnrollmentViewSet(viewsets.ModelViewSet):
+class EnrollmentViewSet(ExportMixin, viewsets.ModelViewSet):
     serializer_class = EnrollmentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = '-enrolled_at'
+    export_filename = 'enrollments'
+    export_course_lookup = 'course_id'
+    export_fields = (
+        ('id', 'id'),
+        ('student_id', 'student_id'),
+        ('student_email', 'student__email'),
+        ('course_id', 'course_id'),
+        ('course_title', 'course__title'),
+        ('status', 'status'),
+        ('progress_percent', 'progress_percent'),
+        ('completed_lessons', 'completed_lessons'),
+        ('enrolled_at', 'enrolled_at'),
+        ('completed_at', 'completed_at'),
+    )
 
     def get_queryset(self):
         user = self.request.user
@@ -60,6 +81,9 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
 class LessonProgressViewSet(viewsets.ModelViewSet):
     serializer_class = LessonProgressSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = '-id'
+    SYNC_MAX_ITEMS = 500
 
     def get_queryset(self):
         user = self.request.user
@@ -67,6 +91,89 @@ class LessonProgressViewSet(viewsets.ModelViewSet):
             return LessonProgress.objects.filter(enrollment__student=user)
         return LessonProgress.objects.all()
 
+    @action(detail=False, methods=['post'], url_path='sync')
+    def sync(self, request):
+        """
+        Bulk offline sync. POST { "items": [{ "lesson": 1, "completed": true, "completed_at": "..." }, ...] }
+        Ownership is checked in one query and all rows are upserted in one statement; a lesson
+        that is already completed keeps its original completed_at.
+        Returns one result per item, in request order.
+        """
+        from apps.courses.models import Lesson
+        if not request.user.is_student:
+            return Response({'error': 'Students only'}, status=status.HTTP_403_FORBIDDEN)
+        items = request.data.get('items') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'items must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.SYNC_MAX_ITEMS:
+            return Response(
+                {'error': f'At most {self.SYNC_MAX_ITEMS} items per sync'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = [None] * len(items)
+        latest = {}  # lesson id -> (index, validated data); the last record for a lesson wins
+        for index, item in enumerate(items):
+            serializer = LessonProgressSyncItemSerializer(data=item)
+            if not serializer.is_valid():
+                results[index] = {'index': index, 'status': 'error', 'errors': serializer.errors}
+                continue
+            lesson_id = serializer.validated_data['lesson']
+            if lesson_id in latest:
+                results[latest[lesson_id][0]] = {'index': latest[lesson_id][0], 'lesson': lesson_id, 'status': 'superseded'}
+            latest[lesson_id] = (index, serializer.validated_data)
+
+        enrollment_by_lesson = dict(
+            Lesson.objects.filter(
+                pk__in=latest.keys(),
+                module__course__enrollments__student=request.user,
+                module__course__enrollments__status__in=[Enrollment.Status.ACTIVE, Enrollment.Status.COMPLETED],
+            ).values_list('pk', 'module__course__enrollments__pk')
+        )
+
+        # Lessons already completed keep their original completion time.
+        completed_at_by_lesson = dict(
+            LessonProgress.objects.filter(
+                enrollment_id__in=set(enrollment_by_lesson.values()),
+                lesson_id__in=enrollment_by_lesson.keys(),
+                completed=True,
+            ).values_list('lesson_id', 'completed_at')
+        )
+
+        now = timezone.now()
+        rows = []
+        for lesson_id, (index, data) in latest.items():
+            enrollment_id = enrollment_by_lesson.get(lesson_id)
+            if enrollment_id is None:
+                results[index] = {'index': index, 'lesson': lesson_id, 'status': 'error', 'errors': "Not enrolled in this lesson's course"}
+                continue
+            completed_at = completed_at_by_lesson.get(lesson_id) or data.get('completed_at') or now
+            rows.append(LessonProgress(
+                enrollment_id=enrollment_id,
+                lesson_id=lesson_id,
+                completed=data['completed'],
+                completed_at=completed_at if data['completed'] else None,
+            ))
+            results[index] = {'index': index, 'lesson': lesson_id, 'status': 'ok'}
+
+        if rows:
+            with transaction.atomic():
+                LessonProgress.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=['enrollment', 'lesson'],
+                    update_fields=['completed', 'completed_at'],
+                )
+                # bulk_create skips the per-row progress signals; recount the touched enrollments instead.
+                recompute_progress(Enrollment.objects.filter(pk__in={row.enrollment_id for row in rows}))
+
+        synced = sum(1 for r in results if r['status'] == 'ok')
+        return Response({
+            'synced': synced,
+            'failed': sum(1 for r in results if r['status'] == 'error'),
+            'results': results,
+        })
+
 
 class CertificateViewSet(viewsets.ReadOnlyModelViewSet):
     """Certificates - Student sees their own, Instructor/Admin see all."""
@@ -0,0 +1,141 @@
+"""
+Learnova LMS - Claims-based JWT Authentication
+Access tokens carry the user's role, verification and staff flags and a
+token version (see LearnovaTokenObtainPairSerializer). ClaimsJWTAuthentication
+builds the request user from those claims instead of loading the users row:
+
+- the token version is checked against the current one, kept in a short-lived
+  in-process cache in front of the shared cache (one indexed query on a miss);
+  changing a claim or deactivating the account bumps it, so older tokens fail
+- any other field (email, names, ...) is loaded on first access from the same
+  two-level cache of the user row, so only views that need it pay for it
+
+Tokens issued before the claims existed fall back to the regular database lookup.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .models import ClaimsUser, User
+
+# token claim -> User field
+CLAIM_FIELDS = {
+    'role': 'role',
+    'is_verified': 'is_verified',
+    'is_staff': 'is_staff',
+    'is_superuser': 'is_superuser',
+    'ver': 'token_version',
+}
+# Not cached: only needed by the rare code paths that check or change the password
+UNCACHED_FIELDS = {'password'}
+USER_CACHE_TIMEOUT = 60 * 5
+VERSION_CACHE_TIMEOUT = 60 * 60 * 24
+
+_local = {}
+_local_lock = threading.Lock()
+
+
+def _version_key(user_id):
+    return f"learnova:auth:version:{user_id}"
+
+
+def _user_key(user_id):
+    return f"learnova:auth:user:{user_id}"
+
+
+def _local_get(key):
+    entry = _local.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _local_set(key, value):
+    with _local_lock:
+        _local[key] = (time.monotonic() + settings.AUTH_LOCAL_CACHE_TTL, value)
+        if len(_local) > 10000:
+            now = time.monotonic()
+            for stale in [k for k, (expires, _) in _local.items() if expires <= now]:
+                del _local[stale]
+
+
+def _two_level(key, timeout, load):
+    value = _local_get(key)
+    if value is None:
+        value = cache.get(key)
+        if value is None:
+            value = load()
+            if value is None:
+                return None
+            cache.set(key, value, timeout)
+        _local_set(key, value)
+    return value
+
+
+def get_token_version(user_id):
+    """Current token version of an active user, or None if the user is missing or inactive."""
+    def load():
+        row = User.objects.filter(pk=user_id).values_list('token_version', 'is_active').first()
+        # -1 never matches a token, and is cached like a version
+        return -1 if row is None or not row[1] else row[0]
+
+    version = _two_level(_version_key(user_id), VERSION_CACHE_TIMEOUT, load)
+    return None if version == -1 else version
+
+
+def get_cached_user_fields(user_id):
+    """{attname: value} of a user's row (without the password hash), or None if it does not exist."""
+    attnames = [f.attname for f in User._meta.concrete_fields if f.attname not in UNCACHED_FIELDS]
+    return _two_level(
+        _user_key(user_id), USER_CACHE_TIMEOUT, lambda: User.objects.filter(pk=user_id).values(*attnames).first(),
+    )
+
+
+def forget_user(user_id):
+    """Drop a user's cached row and version (after a save or delete), once the transaction commits."""
+    def clear():
+        cache.delete_many([_version_key(user_id), _user_key(user_id)])
+        with _local_lock:
+            _local.pop(_version_key(user_id), None)
+            _local.pop(_user_key(user_id), None)
+
+    transaction.on_commit(clear)
+
+
+def token_claims(user):
+    return {claim: getattr(user, field) for claim, field in CLAIM_FIELDS.items()}
+
+
+def user_from_claims(token):
+    """A ClaimsUser with the claim fields loaded and every other field deferred."""
+    values = {field: token[claim] for claim, field in CLAIM_FIELDS.items()}
+    # simplejwt stores the user id as a string; ownership checks compare it with integer foreign keys
+    user_id = ClaimsUser._meta.pk.to_python(token[api_settings.USER_ID_CLAIM])
+    values.update({'id': user_id, 'is_active': True})
+    # from_db expects the loaded values in field order
+    names = [f.attname for f in ClaimsUser._meta.concrete_fields if f.attname in values]
+    return ClaimsUser.from_db('default', names, [values[name] for name in names])
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication without the per-request users query; see the module docstring."""
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in CLAIM_FIELDS):
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        current = get_token_version(user_id)
+        if current is None:
+            raise AuthenticationFailed(_("User not found or inactive"), code='user_inactive')
+        if validated_token['ver'] != current:
+            raise AuthenticationFailed(_("Token is no longer valid; please sign in again"), code='token_stale')
+        return user_from_claims(validated_token)
@@ -18,8 +18,13 @@ class User(AbstractUser):
     role = models.CharField(max_length=20, choices=Role.choices, default=Role.STUDENT)
     phone = models.CharField(max_length=20, blank=True, validators=[validate_phone_format])
     avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)
+    # Resized variants of the avatar, see apps.core.images
+    avatar_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     bio = models.TextField(blank=True)
     is_verified = models.BooleanField(default=False)
+    # Embedded in access tokens; bumped when a claim changes (role, verification,
+    # staff flags) or the account is deactivated, which invalidates older tokens.
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -29,6 +34,9 @@ class User(AbstractUser):
         db_table = 'users'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            models.Index(fields=['role', 'is_active'], name='user_role_idx'),
+        ]
 
     def __str__(self):
         return self.email
@@ -46,6 +54,26 @@ class User(AbstractUser):
         return self.role == self.Role.STUDENT
 
 
+class ClaimsUser(User):
+    """
+    A User built from access-token claims without a query (apps.users.authentication).
+    Fields missing from the claims are deferred and filled from the cached user row
+    on first access.
+    """
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        from .authentication import get_cached_user_fields
+
+        values = get_cached_user_fields(self.pk)
+        if values is None or from_queryset is not None or any(name not in values for name in fields or ()):
+            return super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        for name, value in values.items():
+            self.__dict__.setdefault(name, value)
+
+
 class UserProfile(models.Model):
     """Extended profile for students/instructors."""
 
@@ -2,8 +2,11 @@
 User serializers for Learnova LMS
 """
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth.password_validation import validate_password
-from apps.core.serializers import BaseModelSerializer
+from apps.core.serializers import BaseModelSerializer, ImageDerivativesField
 from apps.core.validators import validate_email_format, validate_username_format
 from .models import User, UserProfile
 
@@ -17,12 +20,13 @@ class UserProfileSerializer(BaseModelSerializer):
 
 class UserSerializer(BaseModelSerializer):
     profile = UserProfileSerializer(read_only=True)
+    avatar_variants = ImageDerivativesField(source='avatar_derivatives')
 
     class Meta:
         model = User
         fields = [
             'id', 'username', 'email', 'first_name', 'last_name',
-            'role', 'phone', 'avatar', 'bio', 'is_verified',
+            'role', 'phone', 'avatar', 'avatar_variants', 'bio', 'is_verified',
             'profile', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'role', 'is_verified', 'created_at', 'updated_at']
@@ -64,3 +68,29 @@ class UserCreateSerializer(serializers.ModelSerializer):
 class UserLoginSerializer(serializers.Serializer):
     username = serializers.CharField()
     password = serializers.CharField(write_only=True)
+
+
+class LearnovaTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Adds the claims ClaimsJWTAuthentication builds the request user from."""
+
+    @classmethod
+    def get_token(cls, user):
+        from .authentication import token_claims
+
+        token = super().get_token(user)
+        for claim, value in token_claims(user).items():
+            token[claim] = value
+        return token
+
+
+class LearnovaTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuses refresh tokens whose claims are older than the user's current token version."""
+
+    def validate(self, attrs):
+        from .authentication import get_token_version
+
+        refresh = self.token_class(attrs['refresh'])
+        version = refresh.payload.get('ver')
+        if version is not None and version != get_token_version(refresh.payload.get(api_settings.USER_ID_CLAIM)):
+            raise InvalidToken("Token is no longer valid; please sign in again")
+        return super().validate(attrs)
@@ -0,0 +1,57 @@
+"""
+User signal handlers for Learnova LMS
+Queue avatar derivatives when a new avatar is uploaded, and keep the cached
+user rows and token versions used by ClaimsJWTAuthentication in sync.
+"""
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from apps.core.tasks import image_derivatives_job
+from .authentication import CLAIM_FIELDS, forget_user
+from .models import ClaimsUser, User
+
+# A change to any of these makes tokens issued earlier stale
+TOKEN_FIELDS = tuple(field for field in CLAIM_FIELDS.values() if field != 'token_version') + ('is_active',)
+
+
+@receiver(post_init, sender=User)
+def remember_avatar(sender, instance, **kwargs):
+    instance._avatar_name = instance.__dict__.get('avatar') or ''
+
+
+@receiver(post_save, sender=User)
+def queue_avatar_derivatives(sender, instance, **kwargs):
+    if 'avatar' not in instance.__dict__:
+        return  # deferred and never assigned
+    name = instance.avatar.name or ''
+    if name != instance._avatar_name:
+        image_derivatives_job.enqueue(model='users.User', pk=instance.pk)
+        instance._avatar_name = name
+
+
+@receiver(post_init, sender=User)
+@receiver(post_init, sender=ClaimsUser)
+def remember_token_fields(sender, instance, **kwargs):
+    instance._token_fields = tuple(instance.__dict__.get(field) for field in TOKEN_FIELDS)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=ClaimsUser)
+def bump_token_version(sender, instance, created, **kwargs):
+    if not created:
+        current = tuple(instance.__dict__.get(field) for field in TOKEN_FIELDS)
+        changed = [
+            before != after
+            for before, after in zip(instance._token_fields, current)
+            if before is not None and after is not None  # deferred on either side
+        ]
+        if any(changed):
+            User.objects.filter(pk=instance.pk).update(token_version=F('token_version') + 1)
+            instance.token_version = User.objects.filter(pk=instance.pk).values_list('token_version', flat=True).get()
+        instance._token_fields = current
+    forget_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
@@ -47,7 +47,8 @@ class UserViewSet(viewsets.ModelViewSet):
         if request.method == 'GET':
             serializer = UserSerializer(user)
             return Response(serializer.data)
-        serializer = UserSerializer(user, data=request.data, partial=request.method == 'PATCH')
+        # request.user is built from token claims; write through a full row so User signals fire
+        serializer = UserSerializer(User.objects.get(pk=user.pk), data=request.data, partial=request.method == 'PATCH')
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(serializer.data)
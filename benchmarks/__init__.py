@@ -0,0 +1,5 @@
+"""
+Learnova LMS - API Benchmarks
+In-process latency, query-count and memory benchmarks of the REST API; run with
+`python manage.py benchmark_api` (see runner.py).
+"""
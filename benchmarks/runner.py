@@ -0,0 +1,261 @@
+"""
+Learnova LMS - API Benchmark Runner
+Runs the scenarios in-process through DRF's APIClient against a throwaway test
+database seeded by `seed_data` in scale mode, and records per scenario:
+
+- p50 / p95 / p99 and mean latency of the timed iterations (after warm-up, so
+  caches are warm as they are in production); regressions are judged on p50,
+  the tail is too noisy on a shared machine to gate on
+- queries and repeated statements of one warm request (QueryRecorder, the same
+  counter the query instrumentation middleware uses)
+- peak Python memory allocated by a request, traced in separate requests so
+  tracemalloc does not slow down the timed ones
+
+The cache is swapped for a private local-memory one and the query sampling
+middleware is switched off, so runs neither touch a shared cache nor log.
+"""
+import gc
+import io
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import django
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from rest_framework.test import APIClient
+
+from apps.core.middleware import QueryRecorder
+from .scenarios import SCENARIOS, build_fixture, route_name, uncovered_routes
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+BENCHMARK_SETTINGS = {
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'learnova-benchmark'}},
+    'QUERY_SAMPLE_RATE': 0,
+}
+PERCENTILES = (50, 95, 99)
+# Differences below these are noise, whatever the relative change
+LATENCY_NOISE_MS = 1.0
+MEMORY_NOISE_KIB = 64
+# Traced requests per scenario; the smallest peak is kept
+MEMORY_SAMPLES = 3
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a sorted list."""
+    rank = max(1, -(-len(samples) * pct // 100))
+    return samples[rank - 1]
+
+
+@contextmanager
+def benchmark_environment():
+    """A fresh test database and benchmark settings for the duration of the run."""
+    setup_test_environment(debug=False)
+    try:
+        with override_settings(**BENCHMARK_SETTINGS):
+            old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'}, serialized_aliases=set())
+            try:
+                yield
+            finally:
+                teardown_databases(old_config, verbosity=0)
+    finally:
+        teardown_test_environment()
+
+
+@contextmanager
+def rolled_back(enabled):
+    if not enabled:
+        yield
+        return
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def api_clients(fixture):
+    """{role: APIClient}, authenticated with a real access token so authentication is measured too."""
+    from apps.users.serializers import LearnovaTokenObtainPairSerializer
+
+    clients = {'anonymous': APIClient()}
+    for role in ('student', 'instructor', 'admin'):
+        client = APIClient()
+        token = LearnovaTokenObtainPairSerializer.get_token(getattr(fixture, role)).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        clients[role] = client
+    return clients
+
+
+def send(client, scenario, fixture, recorder=None):
+    """(elapsed seconds, path, response) of one request; the body of streaming responses is read in full."""
+    with rolled_back(scenario.writes):
+        path, data = scenario.request_args(fixture)
+        with _recording(recorder):
+            start = time.perf_counter()
+            response = getattr(client, scenario.method)(path, data, format='json' if scenario.writes else None)
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+            elapsed = time.perf_counter() - start
+    return elapsed, path, response
+
+
+@contextmanager
+def _recording(recorder):
+    if recorder is None:
+        yield
+        return
+    with connections['default'].execute_wrapper(recorder):
+        yield
+
+
+def check_scenario(client, scenario, fixture, warmup):
+    """Warm the scenario up; an error message if it does not answer with the expected status."""
+    for _ in range(warmup):
+        _, _, response = send(client, scenario, fixture)
+        if response.status_code != scenario.status:
+            detail = getattr(response, 'data', None) or response.status_code
+            return f"expected {scenario.status}, got {response.status_code}: {detail}"
+    return ''
+
+
+def measure_scenario(client, scenario, fixture, timings):
+    """Result of one scenario from its sorted `timings` (ms), plus its queries and peak memory."""
+    recorder = QueryRecorder(threshold=1)
+    _, path, _ = send(client, scenario, fixture, recorder)
+    shapes = recorder.shapes()
+
+    peaks = []
+    for _ in range(MEMORY_SAMPLES):
+        tracemalloc.start()
+        try:
+            send(client, scenario, fixture)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+    result = {'route': route_name(path), 'method': scenario.method.upper(), 'iterations': len(timings)}
+    for pct in PERCENTILES:
+        result[f'p{pct}_ms'] = round(percentile(timings, pct), 3)
+    result.update({
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'queries': recorder.count,
+        'duplicate_queries': sum(count - 1 for count in shapes.values() if count > 1),
+        'peak_kib': round(min(peaks) / 1024, 1),
+    })
+    return result
+
+
+def run_benchmarks(scale, iterations=30, warmup=3, workers=1, only=None, log=None):
+    """
+    Seed a test database with `scale` ({'students', 'courses', 'seed'}), run every
+    scenario whose label contains `only`, and return the results document.
+
+    The timed requests go in rounds of one request per scenario, so a burst of load
+    on the machine spreads over all scenarios instead of skewing one of them.
+    """
+    log = log or (lambda message: None)
+    scenarios = [s for s in SCENARIOS if not only or only.lower() in label(s).lower()]
+    with benchmark_environment():
+        log(f"Seeding {scale['students']} students and {scale['courses']} courses (seed {scale['seed']})...")
+        call_command(
+            'seed_data', students=scale['students'], courses=scale['courses'], seed=scale['seed'],
+            workers=workers, stdout=io.StringIO(),
+        )
+        fixture = build_fixture(f"load{scale['seed']}")
+        clients = api_clients(fixture)
+
+        errors = {}
+        for scenario in scenarios:
+            error = check_scenario(clients[scenario.role], scenario, fixture, min(warmup, scenario.max_iterations or warmup))
+            if error:
+                errors[label(scenario)] = {'route': route_name(scenario.request_args(fixture)[0]), 'error': error}
+        timed = [s for s in scenarios if label(s) not in errors]
+
+        log(f"Timing {len(timed)} scenarios, {iterations} rounds...")
+        timings = {label(s): [] for s in timed}
+        gc.collect()
+        for round_number in range(iterations):
+            for scenario in timed:
+                if scenario.max_iterations and round_number >= scenario.max_iterations:
+                    continue
+                elapsed, _, _ = send(clients[scenario.role], scenario, fixture)
+                timings[label(scenario)].append(elapsed * 1000)
+
+        results = {}
+        for scenario in scenarios:
+            name = label(scenario)
+            if name in errors:
+                results[name] = errors[name]
+            else:
+                results[name] = measure_scenario(clients[scenario.role], scenario, fixture, sorted(timings[name]))
+            log(format_result(name, results[name]))
+        vendor = connection.vendor
+
+    return {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'machine': f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+            'database': vendor,
+            'scale': scale,
+            'iterations': iterations,
+            'warmup': warmup,
+        },
+        'scenarios': results,
+        'uncovered_routes': [] if only else uncovered_routes({r['route'] for r in results.values()}),
+    }
+
+
+def label(scenario):
+    return f"{scenario.name} [{scenario.role}]"
+
+
+def format_result(name, result):
+    if 'error' in result:
+        return f"  {name:<48} ERROR {result['error']}"
+    return (
+        f"  {name:<48} p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f}  p99 {result['p99_ms']:>8.2f} ms"
+        f"  {result['queries']:>3} queries  {result['peak_kib']:>8.1f} KiB"
+    )
+
+
+def baseline_mismatch(results, baseline):
+    """Why the two runs cannot be compared, or '' if they can."""
+    for key in ('scale', 'database'):
+        if results['meta'][key] != baseline['meta'][key]:
+            return f"baseline {key} {baseline['meta'][key]} differs from this run's {results['meta'][key]}"
+    return ''
+
+
+def compare(results, baseline, threshold):
+    """
+    (regressions, improvements) against `baseline`, as messages. Query counts are
+    deterministic and must not grow at all; p50 latency and peak memory may vary by
+    `threshold` (a fraction) before they count.
+    """
+    regressions, improvements = [], []
+    for name, current in results['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if before is None or 'error' in before or 'error' in current:
+            continue
+        if current['queries'] > before['queries']:
+            regressions.append(f"{name}: {before['queries']} -> {current['queries']} queries")
+        elif current['queries'] < before['queries']:
+            improvements.append(f"{name}: {before['queries']} -> {current['queries']} queries")
+        for metric, unit, noise in (('p50_ms', 'ms p50', LATENCY_NOISE_MS), ('peak_kib', 'KiB peak', MEMORY_NOISE_KIB)):
+            old, new = before[metric], current[metric]
+            if new > old * (1 + threshold) and new - old > noise:
+                regressions.append(f"{name}: {old} -> {new} {unit} (+{(new - old) / old:.0%})")
+            elif new < old * (1 - threshold) and old - new > noise:
+                improvements.append(f"{name}: {old} -> {new} {unit} ({(new - old) / old:.0%})")
+    for name, current in results['scenarios'].items():
+        if 'error' in current:
+            regressions.append(f"{name}: {current['error']}")
+    return regressions, improvements
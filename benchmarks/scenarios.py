@@ -0,0 +1,337 @@
+"""
+Learnova LMS - API Benchmark Scenarios
+One Scenario per endpoint and role. Paths and bodies may be callables of the
+Fixture, the ids of the seeded rows each request works on. Requests other than
+GET run inside a transaction that is rolled back afterwards, so every iteration
+of enroll / start attempt / submit sees the same database.
+
+Every named route under /api/ should have a scenario or an entry in
+NOT_BENCHMARKED; the runner reports the ones that have neither.
+"""
+from dataclasses import dataclass
+
+from django.urls import URLPattern, URLResolver, get_resolver, resolve
+
+AUTH = '/api/v1/auth'
+COURSES = '/api/v1/courses'
+ENROLLMENTS = '/api/v1/enrollments'
+ASSESSMENTS = '/api/v1/assessments'
+ATTENDANCE = '/api/v1/attendance'
+COMMUNICATIONS = '/api/v1/communications'
+ANALYTICS = '/api/v1/analytics'
+CORE = '/api/v1'
+
+ADMIN_USERNAME = 'bench_admin'
+# seed_data's password for generated students
+STUDENT_PASSWORD = 'student123'
+
+# route name -> why it has no scenario
+NOT_BENCHMARKED = {
+    'lesson-content': "streams a stored file; measures the storage backend, not the API",
+    'assignment-submission-file': "streams a stored file; measures the storage backend, not the API",
+    'upload-finalize': "needs the chunks of a real upload on disk",
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    role: str  # anonymous, student, instructor or admin
+    path: object  # str, or callable(fixture) -> str
+    method: str = 'get'
+    data: object = None  # dict, or callable(fixture) -> dict
+    status: int = 200
+    # Cap for deliberately slow endpoints (password hashing)
+    max_iterations: int = None
+
+    @property
+    def writes(self):
+        return self.method != 'get'
+
+    def request_args(self, fixture):
+        path = self.path(fixture) if callable(self.path) else self.path
+        data = self.data(fixture) if callable(self.data) else self.data
+        return path, data
+
+
+@dataclass
+class Fixture:
+    """Users and row ids the scenarios request; see build_fixture."""
+
+    student: object
+    instructor: object
+    admin: object
+    category_id: int
+    course_id: int
+    module_id: int
+    lesson_id: int
+    enroll_course_id: int
+    enrollment_id: int
+    progress_id: int
+    progress_lesson_ids: list
+    certificate_id: int
+    quiz_id: int
+    open_quiz_id: int
+    attempt_id: int
+    assignment_id: int
+    submission_id: int
+    session_id: int
+    attendance_id: int
+    announcement_id: int
+    report_id: int
+    job_id: int
+    upload_id: object
+
+    def start_attempt(self):
+        """A fresh open attempt on open_quiz_id (rolled back with the request)."""
+        from apps.assessments.models import QuizAttempt
+
+        return QuizAttempt.objects.create(student=self.student, quiz_id=self.open_quiz_id)
+
+    def correct_option_ids(self):
+        from apps.assessments.models import QuestionOption
+
+        return list(
+            QuestionOption.objects.filter(question__quiz_id=self.open_quiz_id, is_correct=True).values_list('pk', flat=True)
+        )
+
+
+def pick_student(prefix):
+    """
+    The first generated student whose data reaches every student endpoint: an active
+    enrollment with progress, a submitted quiz attempt and a quiz left to attempt,
+    a submission and attendance.
+    """
+    from apps.assessments.models import AssignmentSubmission, Quiz, QuizAttempt
+    from apps.attendance.models import Attendance
+    from apps.courses.models import Course
+    from apps.enrollments.models import Enrollment, LessonProgress
+    from apps.users.models import User
+
+    students = User.objects.filter(
+        username__startswith=f"{prefix}_student", role=User.Role.STUDENT, is_active=True,
+    ).order_by('pk')
+    for student in students[:500]:
+        enrollments = Enrollment.objects.filter(
+            student=student, status=Enrollment.Status.ACTIVE, course__status=Course.Status.PUBLISHED,
+        ).order_by('pk')
+        for enrollment in enrollments:
+            attempted = QuizAttempt.objects.filter(student=student, quiz__course_id=enrollment.course_id)
+            open_quiz = (
+                Quiz.objects.filter(course_id=enrollment.course_id, is_published=True)
+                .exclude(pk__in=attempted.values('quiz_id')).order_by('pk').first()
+            )
+            if (
+                open_quiz is not None
+                and attempted.filter(submitted_at__isnull=False).exists()
+                and LessonProgress.objects.filter(enrollment=enrollment).exists()
+                and AssignmentSubmission.objects.filter(student=student, assignment__course_id=enrollment.course_id).exists()
+                and Attendance.objects.filter(student=student, session__course_id=enrollment.course_id).exists()
+            ):
+                return student, enrollment, open_quiz
+    raise LookupError(f"No generated student of {prefix} has data for every scenario; seed more students.")
+
+
+def build_fixture(prefix):
+    """
+    Pick the rows the scenarios use from the data seeded under `prefix` and add what
+    seed_data does not generate: an admin, a certificate, announcements, a generated
+    report with its job, and an upload.
+    """
+    from apps.analytics.models import Report
+    from apps.analytics.reports import generate_report
+    from apps.analytics.tasks import generate_report_job
+    from apps.assessments.models import AssignmentSubmission, QuizAttempt
+    from apps.attendance.models import Attendance
+    from apps.communications.models import Announcement
+    from apps.courses.models import Course, Lesson
+    from apps.core.models import Upload
+    from apps.enrollments.models import Certificate, LessonProgress
+    from apps.users.models import User, UserProfile
+
+    student, enrollment, open_quiz = pick_student(prefix)
+    course = enrollment.course
+    instructor = course.instructor
+    admin = User.objects.create_user(
+        username=ADMIN_USERNAME, email='bench-admin@example.com', password=None,
+        role=User.Role.ADMIN, is_staff=True, is_superuser=True,
+    )
+    UserProfile.objects.create(user=admin)
+
+    lesson = Lesson.objects.filter(module__course=course).order_by('module__order', 'order').first()
+    progress = LessonProgress.objects.filter(enrollment=enrollment).order_by('pk')
+    attempt = QuizAttempt.objects.filter(
+        student=student, quiz__course=course, submitted_at__isnull=False,
+    ).order_by('pk').first()
+    submission = AssignmentSubmission.objects.filter(student=student, assignment__course=course).order_by('pk').first()
+    attendance = Attendance.objects.filter(student=student, session__course=course).order_by('pk').first()
+    enrolled_ids = student.enrollments.values('course_id')
+    enroll_course = (
+        Course.objects.filter(status=Course.Status.PUBLISHED).exclude(pk__in=enrolled_ids).order_by('pk').first()
+    )
+
+    certificate = Certificate.objects.create(enrollment=enrollment)
+    announcements = [
+        Announcement(course=course if i % 4 else None, author=instructor if i % 4 else admin,
+                     title=f"Benchmark announcement {i}", content="Synthetic announcement.",
+                     scope=Announcement.Scope.COURSE if i % 4 else Announcement.Scope.SYSTEM)
+        for i in range(40)
+    ]
+    Announcement.objects.bulk_create(announcements)
+    report = Report.objects.create(report_type=Report.ReportType.ENROLLMENT, title="Benchmark enrollments")
+    generate_report(report)
+    job = generate_report_job.enqueue(user=admin, report_id=report.pk)
+    upload = Upload.objects.create(owner=student, purpose=Upload.Purpose.SUBMISSION, filename='essay.pdf', size=1024)
+
+    return Fixture(
+        student=student,
+        instructor=instructor,
+        admin=admin,
+        category_id=course.category_id,
+        course_id=course.pk,
+        module_id=lesson.module_id,
+        lesson_id=lesson.pk,
+        enroll_course_id=enroll_course.pk,
+        enrollment_id=enrollment.pk,
+        progress_id=progress[0].pk,
+        progress_lesson_ids=list(progress.values_list('lesson_id', flat=True)[:20]),
+        certificate_id=certificate.pk,
+        quiz_id=attempt.quiz_id,
+        open_quiz_id=open_quiz.pk,
+        attempt_id=attempt.pk,
+        assignment_id=submission.assignment_id,
+        submission_id=submission.pk,
+        session_id=attendance.session_id,
+        attendance_id=attendance.pk,
+        announcement_id=Announcement.objects.filter(course=course).order_by('pk').values_list('pk', flat=True).first(),
+        report_id=report.pk,
+        job_id=job.pk,
+        upload_id=upload.pk,
+    )
+
+
+def _login(fx):
+    return {'username': fx.student.username, 'password': STUDENT_PASSWORD}
+
+
+def _refresh(fx):
+    from apps.users.serializers import LearnovaTokenObtainPairSerializer
+
+    return {'refresh': str(LearnovaTokenObtainPairSerializer.get_token(fx.student))}
+
+
+def _sync(fx):
+    return {'items': [{'lesson': lesson_id, 'completed': True} for lesson_id in fx.progress_lesson_ids]}
+
+
+SCENARIOS = [
+    # Auth and users
+    Scenario('auth: obtain token', 'anonymous', f'{AUTH}/token/', method='post', data=_login, max_iterations=5),
+    Scenario('auth: refresh token', 'anonymous', f'{AUTH}/token/refresh/', method='post', data=_refresh),
+    Scenario('users: me', 'student', f'{AUTH}/users/me/'),
+    Scenario('users: list', 'admin', f'{AUTH}/users/'),
+    Scenario('users: detail', 'admin', lambda fx: f'{AUTH}/users/{fx.student.pk}/'),
+
+    # Catalog
+    Scenario('courses: list', 'anonymous', f'{COURSES}/'),
+    Scenario('courses: list', 'student', f'{COURSES}/'),
+    Scenario('courses: list', 'instructor', f'{COURSES}/'),
+    Scenario('courses: detail', 'anonymous', lambda fx: f'{COURSES}/{fx.course_id}/'),
+    Scenario('courses: detail', 'student', lambda fx: f'{COURSES}/{fx.course_id}/'),
+    Scenario('categories: list', 'anonymous', f'{COURSES}/categories/'),
+    Scenario('categories: detail', 'anonymous', lambda fx: f'{COURSES}/categories/{fx.category_id}/'),
+    Scenario('modules: list', 'student', lambda fx: f'{COURSES}/modules/?course={fx.course_id}'),
+    Scenario('modules: detail', 'student', lambda fx: f'{COURSES}/modules/{fx.module_id}/'),
+    Scenario('lessons: list', 'student', lambda fx: f'{COURSES}/lessons/?module={fx.module_id}'),
+    Scenario('lessons: detail', 'student', lambda fx: f'{COURSES}/lessons/{fx.lesson_id}/'),
+
+    # Enrollments and progress
+    Scenario('enrollments: enroll', 'student', f'{ENROLLMENTS}/enroll/', method='post',
+             data=lambda fx: {'course_id': fx.enroll_course_id}, status=201),
+    Scenario('enrollments: my-courses', 'student', f'{ENROLLMENTS}/my-courses/'),
+    Scenario('enrollments: list', 'student', f'{ENROLLMENTS}/'),
+    Scenario('enrollments: list', 'instructor', f'{ENROLLMENTS}/'),
+    Scenario('enrollments: detail', 'student', lambda fx: f'{ENROLLMENTS}/{fx.enrollment_id}/'),
+    Scenario('enrollments: export', 'instructor', f'{ENROLLMENTS}/export/'),
+    Scenario('lesson-progress: list', 'student', f'{ENROLLMENTS}/lesson-progress/'),
+    Scenario('lesson-progress: detail', 'student', lambda fx: f'{ENROLLMENTS}/lesson-progress/{fx.progress_id}/'),
+    Scenario('lesson-progress: sync', 'student', f'{ENROLLMENTS}/lesson-progress/sync/', method='post', data=_sync),
+    Scenario('certificates: list', 'student', f'{ENROLLMENTS}/certificates/'),
+    Scenario('certificates: detail', 'student', lambda fx: f'{ENROLLMENTS}/certificates/{fx.certificate_id}/'),
+
+    # Quizzes and assignments
+    Scenario('quizzes: list', 'student', f'{ASSESSMENTS}/quizzes/'),
+    Scenario('quizzes: detail', 'student', lambda fx: f'{ASSESSMENTS}/quizzes/{fx.quiz_id}/'),
+    Scenario('quizzes: regrade', 'instructor', lambda fx: f'{ASSESSMENTS}/quizzes/{fx.quiz_id}/regrade/',
+             method='post', status=202),
+    Scenario('quiz-attempts: start', 'student', f'{ASSESSMENTS}/quiz-attempts/', method='post',
+             data=lambda fx: {'quiz': fx.open_quiz_id}, status=201),
+    Scenario('quiz-attempts: submit', 'student',
+             lambda fx: f'{ASSESSMENTS}/quiz-attempts/{fx.start_attempt().pk}/submit/', method='post',
+             data=lambda fx: {'option_ids': fx.correct_option_ids()}),
+    Scenario('quiz-attempts: list', 'student', f'{ASSESSMENTS}/quiz-attempts/'),
+    Scenario('quiz-attempts: list', 'instructor', f'{ASSESSMENTS}/quiz-attempts/'),
+    Scenario('quiz-attempts: detail', 'student', lambda fx: f'{ASSESSMENTS}/quiz-attempts/{fx.attempt_id}/'),
+    Scenario('quiz-attempts: review', 'student', lambda fx: f'{ASSESSMENTS}/quiz-attempts/{fx.attempt_id}/review/'),
+    Scenario('quiz-attempts: export', 'instructor', f'{ASSESSMENTS}/quiz-attempts/export/'),
+    Scenario('assignments: list', 'student', f'{ASSESSMENTS}/assignments/'),
+    Scenario('assignments: detail', 'student', lambda fx: f'{ASSESSMENTS}/assignments/{fx.assignment_id}/'),
+    Scenario('submissions: list', 'student', f'{ASSESSMENTS}/submissions/'),
+    Scenario('submissions: list', 'instructor', f'{ASSESSMENTS}/submissions/'),
+    Scenario('submissions: detail', 'student', lambda fx: f'{ASSESSMENTS}/submissions/{fx.submission_id}/'),
+    Scenario('submissions: export', 'instructor', f'{ASSESSMENTS}/submissions/export/'),
+
+    # Attendance
+    Scenario('sessions: list', 'student', f'{ATTENDANCE}/sessions/'),
+    Scenario('sessions: detail', 'student', lambda fx: f'{ATTENDANCE}/sessions/{fx.session_id}/'),
+    Scenario('attendance: list', 'student', f'{ATTENDANCE}/'),
+    Scenario('attendance: list', 'instructor', f'{ATTENDANCE}/'),
+    Scenario('attendance: detail', 'student', lambda fx: f'{ATTENDANCE}/{fx.attendance_id}/'),
+    Scenario('attendance: export', 'instructor', f'{ATTENDANCE}/export/'),
+
+    # Announcements
+    Scenario('announcements: list', 'student', f'{COMMUNICATIONS}/announcements/'),
+    Scenario('announcements: list', 'instructor', f'{COMMUNICATIONS}/announcements/'),
+    Scenario('announcements: detail', 'student', lambda fx: f'{COMMUNICATIONS}/announcements/{fx.announcement_id}/'),
+
+    # Dashboards and reports
+    Scenario('dashboard: overview', 'admin', f'{ANALYTICS}/dashboard/overview/'),
+    Scenario('dashboard: instructor students', 'instructor', f'{ANALYTICS}/dashboard/instructor/students/'),
+    Scenario('reports: list', 'admin', f'{ANALYTICS}/reports/'),
+    Scenario('reports: detail', 'admin', lambda fx: f'{ANALYTICS}/reports/{fx.report_id}/'),
+    Scenario('reports: generate', 'admin', lambda fx: f'{ANALYTICS}/reports/{fx.report_id}/generate/', method='post'),
+    Scenario('reports: result', 'admin', lambda fx: f'{ANALYTICS}/reports/{fx.report_id}/result/'),
+    Scenario('reports: export', 'admin', lambda fx: f'{ANALYTICS}/reports/{fx.report_id}/export/'),
+
+    # Jobs and uploads
+    Scenario('jobs: list', 'admin', f'{CORE}/jobs/'),
+    Scenario('jobs: detail', 'admin', lambda fx: f'{CORE}/jobs/{fx.job_id}/'),
+    Scenario('jobs: cancel', 'admin', lambda fx: f'{CORE}/jobs/{fx.job_id}/cancel/', method='post'),
+    Scenario('uploads: list', 'student', f'{CORE}/uploads/'),
+    Scenario('uploads: detail', 'student', lambda fx: f'{CORE}/uploads/{fx.upload_id}/'),
+]
+
+
+def route_names():
+    """Names of the routes under /api/, without format-suffix duplicates and API roots."""
+    names = []
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns, prefix + str(pattern.pattern))
+            elif isinstance(pattern, URLPattern) and prefix.startswith('api/'):
+                if pattern.name and pattern.name != 'api-root' and pattern.name not in names:
+                    names.append(pattern.name)
+
+    walk(get_resolver().url_patterns, '')
+    return names
+
+
+def uncovered_routes(covered):
+    """Route names that are neither in `covered` nor in NOT_BENCHMARKED."""
+    return [name for name in route_names() if name not in covered and name not in NOT_BENCHMARKED]
+
+
+def route_name(path):
+    return resolve(path.split('?')[0]).url_name
@@ -47,6 +47,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.middleware.QueryInstrumentationMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -103,15 +104,103 @@ else:
         }
     }
 
+# Cache - local memory by default; point CACHE_BACKEND at a shared cache when
+# running more than one process so invalidations are seen by every worker.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+if CACHE_BACKEND == 'redis':
+    _cache = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION') or 'redis://127.0.0.1:6379/1',
+    }
+elif CACHE_BACKEND == 'memcached':
+    _cache = {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION') or '127.0.0.1:11211',
+    }
+elif CACHE_BACKEND == 'database':
+    _cache = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION') or 'learnova_cache',
+    }
+else:
+    _cache = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'learnova-default',
+    }
+CACHES = {
+    'default': {
+        **_cache,
+        'KEY_PREFIX': os.environ.get('CACHE_KEY_PREFIX', 'learnova'),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', '300')),
+    }
+}
+
+# Public course catalog response cache (seconds)
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CACHE_TIMEOUT', '300'))
+
+# Report snapshots younger than this (seconds) are reused for identical params
+REPORT_SNAPSHOT_MAX_AGE = int(os.environ.get('REPORT_SNAPSHOT_MAX_AGE', '3600'))
+
+# Background jobs (python manage.py run_worker)
+# Max jobs of a queue running at once across all workers; queues not listed are unlimited.
+JOB_QUEUES = {
+    'default': 4,
+    'reports': 2,
+    'regrade': 1,
+    'certificates': 1,
+    'images': 2,
+}
+# Periodic jobs: {name: {'task': registered name, 'interval': seconds, 'kwargs': {...}}}
+JOB_SCHEDULES = {
+    'rebuild-counters': {'task': 'analytics.rebuild_counters', 'interval': 60 * 60 * 24},
+    'issue-certificates': {'task': 'enrollments.issue_certificates', 'interval': 60 * 60},
+    'purge-stale-uploads': {'task': 'core.purge_stale_uploads', 'interval': 60 * 60 * 24},
+}
+JOB_RETRY_DELAY = int(os.environ.get('JOB_RETRY_DELAY', '30'))
+JOB_RETRY_MAX_DELAY = int(os.environ.get('JOB_RETRY_MAX_DELAY', '3600'))
+JOB_LEASE_TIMEOUT = int(os.environ.get('JOB_LEASE_TIMEOUT', '300'))
+
+# Certificate images: optional background template and TrueType font paths,
+# and the number of render processes (defaults to the CPU count)
+CERTIFICATE_TEMPLATE = os.environ.get('CERTIFICATE_TEMPLATE') or None
+CERTIFICATE_FONT = os.environ.get('CERTIFICATE_FONT') or None
+CERTIFICATE_RENDER_WORKERS = int(os.environ.get('CERTIFICATE_RENDER_WORKERS', '0')) or None
+
+# Chunked uploads (/api/v1/uploads/): partial files are assembled in UPLOAD_TEMP_DIR,
+# which should be on the same filesystem as MEDIA_ROOT so finalizing is a rename.
+UPLOAD_TEMP_DIR = os.environ.get('UPLOAD_TEMP_DIR') or None
+UPLOAD_MAX_SIZE = int(os.environ.get('UPLOAD_MAX_SIZE', str(5 * 1024 ** 3)))
+UPLOAD_CHUNK_MAX_SIZE = int(os.environ.get('UPLOAD_CHUNK_MAX_SIZE', str(16 * 1024 ** 2)))
+# Unfinished uploads idle this long (seconds) are purged
+UPLOAD_EXPIRY = int(os.environ.get('UPLOAD_EXPIRY', str(60 * 60 * 24)))
+
+# Query instrumentation (apps/core/middleware.py): share of requests whose SQL is counted and
+# timed (Server-Timing header + log line), and how often one statement may repeat in a request
+# before it is logged as an N+1
+QUERY_SAMPLE_RATE = float(os.environ.get('QUERY_SAMPLE_RATE', '1' if DEBUG else '0.01'))
+QUERY_NPLUSONE_THRESHOLD = int(os.environ.get('QUERY_NPLUSONE_THRESHOLD', '10'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'apps': {'handlers': ['console'], 'level': os.environ.get('LOG_LEVEL', 'INFO'), 'propagate': False},
+    },
+}
+
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
 # REST Framework
 REST_FRAMEWORK = {
+    # Access tokens carry the user's claims, so authenticated requests skip the users table
+    # (apps/users/authentication.py). Session auth is only for the browsable API while debugging.
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.SessionAuthentication',
-    ),
+        'apps.users.authentication.ClaimsJWTAuthentication',
+    ) + (('rest_framework.authentication.SessionAuthentication',) if DEBUG else ()),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
@@ -126,7 +215,12 @@ REST_FRAMEWORK = {
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.users.serializers.LearnovaTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.serializers.LearnovaTokenRefreshSerializer',
 }
+# How long each process trusts its own copy of a user's token version / row (seconds);
+# a role change or deactivation reaches every process within this delay.
+AUTH_LOCAL_CACHE_TTL = int(os.environ.get('AUTH_LOCAL_CACHE_TTL', '30'))
 
 # Internationalization
 LANGUAGE_CODE = 'en-us'
@@ -140,6 +234,28 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Media backend: 'filesystem' or 'cas' (content-addressed: each distinct file stored once,
+# see apps/core/storage.py; run `manage.py migrate_media_to_store` after switching)
+MEDIA_STORAGE = os.environ.get('MEDIA_STORAGE', 'filesystem')
+STORAGES = {
+    'default': {
+        'BACKEND': {
+            'filesystem': 'django.core.files.storage.FileSystemStorage',
+            'cas': 'apps.core.storage.ContentAddressedStorage',
+        }[MEDIA_STORAGE],
+    },
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+# Protected media (lesson files, submissions) hand-off to the front proxy after the access check:
+# '' (stream from Django), 'nginx' (X-Accel-Redirect to MEDIA_ACCEL_PREFIX + name, mapped by an
+# `internal` location onto MEDIA_ROOT) or 'sendfile' (X-Sendfile, Apache mod_xsendfile / lighttpd)
+MEDIA_ACCEL_REDIRECT = os.environ.get('MEDIA_ACCEL_REDIRECT', '')
+MEDIA_ACCEL_PREFIX = os.environ.get('MEDIA_ACCEL_PREFIX', '/protected-media/')
+# Unreferenced blobs younger than this (seconds) survive garbage collection
+MEDIA_GC_GRACE = int(os.environ.get('MEDIA_GC_GRACE', str(60 * 60 * 24)))
+if MEDIA_STORAGE == 'cas':
+    JOB_SCHEDULES['collect-media-garbage'] = {'task': 'core.collect_media_garbage', 'interval': 60 * 60 * 24}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -2,9 +2,11 @@
 Learnova LMS - Main URL Configuration
 """
 from django.contrib import admin
-from django.urls import path, include
+import re
+
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+from django.views.static import serve
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -15,7 +17,17 @@ urlpatterns = [
     path('api/v1/attendance/', include('apps.attendance.urls')),
     path('api/v1/communications/', include('apps.communications.urls')),
     path('api/v1/analytics/', include('apps.analytics.urls')),
+    path('api/v1/', include('apps.core.urls')),
 ]
 
+# Lesson files, submissions and partial uploads are only served through the views that check access
+PROTECTED_MEDIA_DIRS = ('lessons/', 'submissions/', 'uploads-tmp/')
+
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    protected = '|'.join(re.escape(directory) for directory in PROTECTED_MEDIA_DIRS)
+    urlpatterns += [
+        re_path(
+            rf'^{re.escape(settings.MEDIA_URL.lstrip("/"))}(?!{protected})(?P<path>.*)$',
+            serve, {'document_root': settings.MEDIA_ROOT},
+        ),
+    ]